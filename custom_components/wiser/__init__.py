@@ -11,17 +11,28 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
+from homeassistant.helpers.storage import Store
 
 from .coordinator import WiserUpdateCoordinator
 from .frontend import WiserCardRegistration
-from .helpers import get_device_name, get_identifier, get_instance_count
+from .helpers import (
+    get_device_name,
+    get_entity_resolver,
+    get_hub_registry,
+    get_identifier,
+    get_instance_count,
+)
 from .services import async_setup_services
 from .websockets import async_register_websockets
 
 from .const import (
     DATA,
     DOMAIN,
+    HUB_DATA_STORE,
+    HUB_DATA_STORE_VERSION,
     MANUFACTURER,
+    RUNTIME_STORE,
+    RUNTIME_STORE_VERSION,
     UPDATE_LISTENER,
     WISER_PLATFORMS,
     WISER_SERVICES,
@@ -35,8 +46,15 @@ async def async_setup_entry(hass: HomeAssistant, config_entry):
     hass.data.setdefault(DOMAIN, {})
 
     coordinator = WiserUpdateCoordinator(hass, config_entry)
+    await coordinator.runtime.async_load()
 
-    await coordinator.async_config_entry_first_refresh()
+    # Use hub data read by config flow or before a reload if available, or
+    # stored hub data so entities do not wait for the hub
+    if (
+        not await coordinator.async_load_handoff_hub_data()
+        and not await coordinator.async_load_stored_hub_data()
+    ):
+        await coordinator.async_config_entry_first_refresh()
 
     if not coordinator.wiserhub.system:
         raise ConfigEntryNotReady
@@ -48,6 +66,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry):
         DATA: coordinator,
         UPDATE_LISTENER: update_listener,
     }
+    get_hub_registry(hass).async_add(config_entry, coordinator)
 
     # Setup platforms
     for platform in WISER_PLATFORMS:
@@ -93,9 +112,25 @@ async def async_update_device_registry(hass: HomeAssistant, config_entry):
 
 async def _async_update_listener(hass: HomeAssistant, config_entry):
     """Handle options update."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][DATA]
+    get_hub_registry(hass).async_add(config_entry, coordinator)
+    if coordinator.async_update_options(config_entry):
+        return
+
+    coordinator.async_set_handoff_hub_data()
     await hass.config_entries.async_reload(config_entry.entry_id)
 
 
+async def async_remove_entry(hass: HomeAssistant, config_entry):
+    """Remove stored hub data when config entry is removed."""
+    await Store(
+        hass, HUB_DATA_STORE_VERSION, f"{HUB_DATA_STORE}_{config_entry.entry_id}"
+    ).async_remove()
+    await Store(
+        hass, RUNTIME_STORE_VERSION, f"{RUNTIME_STORE}_{config_entry.entry_id}"
+    ).async_remove()
+
+
 async def async_remove_config_entry_device(
     hass: HomeAssistant, config_entry, device_entry
 ) -> bool:
@@ -139,5 +174,7 @@ async def async_unload_entry(hass: HomeAssistant, config_entry):
     _LOGGER.debug("Unload integration")
     if unload_ok:
         hass.data[DOMAIN].pop(config_entry.entry_id)
+        get_hub_registry(hass).async_remove(config_entry.entry_id)
+        get_entity_resolver(hass).async_clear()
 
     return unload_ok
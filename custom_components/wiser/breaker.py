@@ -0,0 +1,119 @@
+from datetime import datetime
+import logging
+import random
+import time
+
+from aioWiserHeatAPI.wiserhub import WiserHubConnectionError
+
+_LOGGER = logging.getLogger(__name__)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class WiserCircuitBreaker:
+    """Stop sending requests to a hub that is not responding.
+
+    After a number of consecutive connection failures the circuit opens and
+    requests fail straight away instead of waiting for the hub to time out.
+    Once the back-off delay has passed a single probe request is allowed
+    through.  If it succeeds the circuit closes, otherwise it opens again
+    with a longer delay.  Delays double up to a maximum and are jittered so
+    several hubs do not retry in step.
+    """
+
+    def __init__(
+        self, failure_threshold: int, initial_delay: float, max_delay: float
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self.last_failure = None
+        self.last_change = None
+        self._backoffs = 0
+        self._retry_at = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if requests are not being sent to the hub."""
+        return self.state != CIRCUIT_CLOSED
+
+    @property
+    def retry_in(self) -> float:
+        """Return seconds until a probe request is allowed."""
+        if self.state != CIRCUIT_OPEN:
+            return 0
+        return max(self._retry_at - time.monotonic(), 0)
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        self.last_change = datetime.now()
+
+    def before_request(self) -> None:
+        """Raise if circuit is open or a probe request is already being sent."""
+        if self.state == CIRCUIT_CLOSED:
+            return
+        if self.state == CIRCUIT_OPEN and time.monotonic() >= self._retry_at:
+            # This request is the probe
+            self._set_state(CIRCUIT_HALF_OPEN)
+            _LOGGER.debug("Probing hub connection")
+            return
+
+        self.rejected += 1
+        raise WiserHubConnectionError(
+            f"Wiser Hub is not responding. Next connection attempt in {round(self.retry_in)}s"
+        )
+
+    def record_success(self) -> None:
+        """Close circuit after a successful request."""
+        if self.state != CIRCUIT_CLOSED:
+            _LOGGER.info("Wiser Hub connection restored")
+            self._set_state(CIRCUIT_CLOSED)
+        self.consecutive_failures = 0
+        self._backoffs = 0
+
+    def abort_probe(self) -> None:
+        """Allow another probe if probe request ended without a hub response."""
+        if self.state == CIRCUIT_HALF_OPEN:
+            self._retry_at = time.monotonic()
+            self._set_state(CIRCUIT_OPEN)
+
+    def record_failure(self) -> None:
+        """Count a connection failure and open circuit if needed."""
+        self.consecutive_failures += 1
+        self.last_failure = datetime.now()
+        if (
+            self.state == CIRCUIT_HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            delay = min(self.initial_delay * 2**self._backoffs, self.max_delay)
+            delay = random.uniform(delay / 2, delay)
+            self._backoffs += 1
+            self._retry_at = time.monotonic() + delay
+            if self.state == CIRCUIT_CLOSED:
+                self.trips += 1
+                _LOGGER.warning(
+                    f"Wiser Hub not responding after {self.consecutive_failures} attempts. "
+                    f"Pausing requests for {round(delay)}s"
+                )
+            else:
+                _LOGGER.debug(f"Hub probe failed. Pausing requests for {round(delay)}s")
+            self._set_state(CIRCUIT_OPEN)
+
+    @property
+    def stats(self) -> dict:
+        """Return circuit breaker statistics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+            "rejected_requests": self.rejected,
+            "retry_in": round(self.retry_in),
+            "last_failure": self.last_failure,
+            "last_change": self.last_change,
+        }
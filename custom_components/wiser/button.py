@@ -62,7 +62,7 @@ class WiserButton(CoordinatorEntity, ButtonEntity):
             self.__last_pressed = (  # pylint: disable=unused-private-member
                 dt_util.parse_datetime(state.state)
             )
-        await self._data.async_refresh()
+        await self._data.async_request_hub_refresh()
 
     @property
     def unique_id(self):
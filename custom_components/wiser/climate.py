@@ -33,6 +33,7 @@ from .helpers import (
     get_device_name,
     get_identifier,
     hub_error_handler,
+    WiserCachedAttributesEntity,
 )
 from .schedules import WiserScheduleEntity
 
@@ -152,7 +153,7 @@ class WiserTempProbe(CoordinatorEntity, ClimateEntity):
 
     def __init__(self, hass: HomeAssistant, coordinator, actuator_id) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, ("device", actuator_id))
         self._hass = hass
         self._data = coordinator
         self._actuator_id = actuator_id
@@ -164,7 +165,7 @@ class WiserTempProbe(CoordinatorEntity, ClimateEntity):
 
     async def async_force_update(self):
         _LOGGER.debug(f"Hub update initiated by {self.name}")
-        await self._data.async_refresh()
+        await self._data.async_request_hub_refresh()
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -223,19 +224,41 @@ class WiserTempProbe(CoordinatorEntity, ClimateEntity):
             kwargs.get("target_temp_low", None)
             != self._actuator.floor_temperature_sensor.minimum_temperature
         ):
-            await self._actuator.floor_temperature_sensor.set_minimum_temperature(
-                kwargs.get("target_temp_low")
-            )
-            await self.async_force_update()
+            if await self._data.optimistic.async_write(
+                self,
+                self.coordinator_context,
+                "target_temp_low",
+                kwargs.get("target_temp_low"),
+                lambda: self._data.index.get_device(
+                    self._actuator_id
+                ).floor_temperature_sensor.minimum_temperature,
+                self._data.writes.async_write(
+                    (self.coordinator_context, "target_temp_low"),
+                    kwargs.get("target_temp_low"),
+                    self._actuator.floor_temperature_sensor.set_minimum_temperature,
+                ),
+            ):
+                await self.async_force_update()
 
         if (
             kwargs.get("target_temp_high", None)
             != self._actuator.floor_temperature_sensor.maximum_temperature
         ):
-            await self._actuator.floor_temperature_sensor.set_maximum_temperature(
-                kwargs.get("target_temp_high")
-            )
-            await self.async_force_update()
+            if await self._data.optimistic.async_write(
+                self,
+                self.coordinator_context,
+                "target_temp_high",
+                kwargs.get("target_temp_high"),
+                lambda: self._data.index.get_device(
+                    self._actuator_id
+                ).floor_temperature_sensor.maximum_temperature,
+                self._data.writes.async_write(
+                    (self.coordinator_context, "target_temp_high"),
+                    kwargs.get("target_temp_high"),
+                    self._actuator.floor_temperature_sensor.set_maximum_temperature,
+                ),
+            ):
+                await self.async_force_update()
 
     @property
     def supported_features(self):
@@ -252,14 +275,24 @@ class WiserTempProbe(CoordinatorEntity, ClimateEntity):
         """Return the highbound target temperature we try to reach.
         Requires ClimateEntityFeature.TARGET_TEMPERATURE_RANGE.
         """
-        return self._actuator.floor_temperature_sensor.maximum_temperature
+        return self._data.optimistic.get(
+            self.coordinator_context,
+            self.unique_id,
+            "target_temp_high",
+            self._actuator.floor_temperature_sensor.maximum_temperature,
+        )
 
     @property
     def target_temperature_low(self) -> float | None:
         """Return the lowbound target temperature we try to reach.
         Requires ClimateEntityFeature.TARGET_TEMPERATURE_RANGE.
         """
-        return self._actuator.floor_temperature_sensor.minimum_temperature
+        return self._data.optimistic.get(
+            self.coordinator_context,
+            self.unique_id,
+            "target_temp_low",
+            self._actuator.floor_temperature_sensor.minimum_temperature,
+        )
 
     @property
     def temperature_unit(self):
@@ -272,18 +305,37 @@ class WiserTempProbe(CoordinatorEntity, ClimateEntity):
         return f"{self._data.wiserhub.system.name}-WiserHeatingActuatorTempSensor-{self._actuator_id}"
 
 
-class WiserRoom(CoordinatorEntity, ClimateEntity, WiserScheduleEntity):
+class WiserRoom(
+    CoordinatorEntity, ClimateEntity, WiserScheduleEntity, WiserCachedAttributesEntity
+):
     """WiserRoom ClientEntity Object."""
 
     _enable_turn_on_off_backwards_compatibility = False
+    # Capabilities do not change so are not stored in the recorder
+    _unrecorded_attributes = frozenset(
+        {
+            "heating_supported",
+            "cooling_supported",
+            "minimum_heat_set_point",
+            "maximum_heat_set_point",
+            "minimum_cool_set_point",
+            "maximum_cool_set_point",
+            "setpoint_step",
+            "ambient_temperature",
+            "temperature_control",
+            "open_window_detection",
+            "hydronic_channel_selection",
+            "on_off_supported",
+        }
+    )
 
     def __init__(self, hass: HomeAssistant, coordinator, room_id) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, ("room", room_id))
         self._hass = hass
         self._data = coordinator
         self._room_id = room_id
-        self._room = self._data.wiserhub.rooms.get_by_id(self._room_id)
+        self._room = self._data.index.get_room(self._room_id)
         self._hvac_modes_list = [modes for modes in HVAC_MODE_HASS_TO_WISER.keys()]
         self._is_heating = self._room.is_heating
         self._schedule = self._room.schedule
@@ -295,13 +347,13 @@ class WiserRoom(CoordinatorEntity, ClimateEntity, WiserScheduleEntity):
 
     async def async_force_update(self):
         _LOGGER.debug(f"Hub update initiated by {self.name}")
-        await self._data.async_refresh()
+        await self._data.async_request_hub_refresh()
 
     @callback
     def _handle_coordinator_update(self) -> None:
         _LOGGER.debug(f"{self.name} updating")
         previous_room_values = self._room
-        self._room = self._data.wiserhub.rooms.get_by_id(self._room_id)
+        self._room = self._data.index.get_room(self._room_id)
         self._schedule = self._room.schedule
 
         self.passive_temperature_increment = self._data.passive_temperature_increment
@@ -358,7 +410,12 @@ class WiserRoom(CoordinatorEntity, ClimateEntity, WiserScheduleEntity):
 
     @property
     def hvac_mode(self):
-        return HVAC_MODE_WISER_TO_HASS[self._room.mode]
+        return self._data.optimistic.get(
+            self.coordinator_context,
+            self.unique_id,
+            "hvac_mode",
+            HVAC_MODE_WISER_TO_HASS[self._room.mode],
+        )
 
     @property
     def hvac_modes(self):
@@ -371,6 +428,16 @@ class WiserRoom(CoordinatorEntity, ClimateEntity, WiserScheduleEntity):
         _LOGGER.debug(f"Setting HVAC mode to {hvac_mode} for {self._room.name}")
         try:
             await self._room.set_mode(HVAC_MODE_HASS_TO_WISER[hvac_mode])
+            self._data.optimistic.async_set(
+                self.coordinator_context,
+                self.unique_id,
+                "hvac_mode",
+                hvac_mode,
+                lambda: HVAC_MODE_WISER_TO_HASS[
+                    self._data.index.get_room(self._room_id).mode
+                ],
+            )
+            self.async_write_ha_state()
             await self.async_force_update()
             return True
         except KeyError:
@@ -431,7 +498,28 @@ class WiserRoom(CoordinatorEntity, ClimateEntity, WiserScheduleEntity):
     @property
     def state(self):
         """Return state"""
-        return HVAC_MODE_WISER_TO_HASS[self._room.mode]
+        return self.hvac_mode
+
+    def _build_capability_attributes(self) -> dict:
+        """Return room climate capability attributes."""
+        attrs = {}
+        capabilities = self._room.capabilities
+        if capabilities:
+            attrs["heating_supported"] = capabilities.heating_supported
+            attrs["cooling_supported"] = capabilities.cooling_supported
+            attrs["minimum_heat_set_point"] = capabilities.minimum_heat_set_point
+            attrs["maximum_heat_set_point"] = capabilities.maximum_heat_set_point
+            attrs["minimum_cool_set_point"] = capabilities.minimum_cool_set_point
+            attrs["maximum_cool_set_point"] = capabilities.maximum_cool_set_point
+            attrs["setpoint_step"] = capabilities.setpoint_step
+            attrs["ambient_temperature"] = capabilities.ambient_temperature
+            attrs["temperature_control"] = capabilities.temperature_control
+            attrs["open_window_detection"] = capabilities.open_window_detection
+            attrs[
+                "hydronic_channel_selection"
+            ] = capabilities.hydronic_channel_selection
+            attrs["on_off_supported"] = capabilities.on_off_supported
+        return attrs
 
     @property
     def extra_state_attributes(self):
@@ -468,31 +556,13 @@ class WiserRoom(CoordinatorEntity, ClimateEntity, WiserScheduleEntity):
 
         # Added by LGO
         # Climate capabilities only with Hub Vé
-        if self._room.capabilities:
-            attrs["heating_supported"] = self._room.capabilities.heating_supported
-            attrs["cooling_supported"] = self._room.capabilities.cooling_supported
-            attrs[
-                "minimum_heat_set_point"
-            ] = self._room.capabilities.minimum_heat_set_point
-            attrs[
-                "maximum_heat_set_point"
-            ] = self._room.capabilities.maximum_heat_set_point
-            attrs[
-                "minimum_cool_set_point"
-            ] = self._room.capabilities.minimum_cool_set_point
-            attrs[
-                "maximum_cool_set_point"
-            ] = self._room.capabilities.maximum_cool_set_point
-            attrs["setpoint_step"] = self._room.capabilities.setpoint_step
-            attrs["ambient_temperature"] = self._room.capabilities.ambient_temperature
-            attrs["temperature_control"] = self._room.capabilities.temperature_control
-            attrs[
-                "open_window_detection"
-            ] = self._room.capabilities.open_window_detection
-            attrs[
-                "hydronic_channel_selection"
-            ] = self._room.capabilities.hydronic_channel_selection
-            attrs["on_off_supported"] = self._room.capabilities.on_off_supported
+        attrs.update(
+            self._get_cached_attributes(
+                "capabilities",
+                self._build_capability_attributes,
+                (self.coordinator_context,),
+            )
+        )
 
         # Summer comfort
 
@@ -536,16 +606,19 @@ class WiserRoom(CoordinatorEntity, ClimateEntity, WiserScheduleEntity):
     @property
     def target_temperature(self):
         """Return target temp."""
-        if (
-            self._room.mode == "Off"
-            or self._room.current_target_temperature == TEMP_OFF
-        ):
+        target_temperature = self._data.optimistic.get(
+            self.coordinator_context,
+            self.unique_id,
+            "target_temperature",
+            self._room.current_target_temperature,
+        )
+        if self.hvac_mode == HVACMode.OFF or target_temperature == TEMP_OFF:
             return None
 
         # if self._is_passive_mode and not self._room.is_boosted:
         #    return None
 
-        return self._room.current_target_temperature
+        return target_temperature
 
     @property
     def target_temperature_step(self) -> float | None:
@@ -557,27 +630,66 @@ class WiserRoom(CoordinatorEntity, ClimateEntity, WiserScheduleEntity):
         """Return the highbound target temperature we try to reach.
         Requires ClimateEntityFeature.TARGET_TEMPERATURE_RANGE.
         """
-        return self._room.passive_mode_upper_temp
+        return self._data.optimistic.get(
+            self.coordinator_context,
+            self.unique_id,
+            "target_temp_high",
+            self._room.passive_mode_upper_temp,
+        )
 
     @property
     def target_temperature_low(self) -> float | None:
         """Return the lowbound target temperature we try to reach.
         Requires ClimateEntityFeature.TARGET_TEMPERATURE_RANGE.
         """
-        return self._room.passive_mode_lower_temp
+        return self._data.optimistic.get(
+            self.coordinator_context,
+            self.unique_id,
+            "target_temp_low",
+            self._room.passive_mode_lower_temp,
+        )
 
     @hub_error_handler
     async def async_set_temperature(self, **kwargs):
-        """Set new target temperatures."""
+        """Set new target temperatures.
+
+        Writes are coalesced so only the last of a burst of changes is sent
+        to the hub.
+        """
         if self._room.is_passive_mode and not self._room.is_boosted:
+            sent = False
             if kwargs.get("target_temp_low", None):
-                await self._room.set_passive_mode_lower_temp(
-                    kwargs.get("target_temp_low")
+                sent |= await self._data.optimistic.async_write(
+                    self,
+                    self.coordinator_context,
+                    "target_temp_low",
+                    kwargs.get("target_temp_low"),
+                    lambda: self._data.index.get_room(
+                        self._room_id
+                    ).passive_mode_lower_temp,
+                    self._data.writes.async_write(
+                        (self.coordinator_context, "target_temp_low"),
+                        kwargs.get("target_temp_low"),
+                        self._room.set_passive_mode_lower_temp,
+                    ),
                 )
             if kwargs.get("target_temp_high", None) and self.hvac_mode == HVACMode.HEAT:
-                await self._room.set_passive_mode_upper_temp(
-                    kwargs.get("target_temp_high")
+                sent |= await self._data.optimistic.async_write(
+                    self,
+                    self.coordinator_context,
+                    "target_temp_high",
+                    kwargs.get("target_temp_high"),
+                    lambda: self._data.index.get_room(
+                        self._room_id
+                    ).passive_mode_upper_temp,
+                    self._data.writes.async_write(
+                        (self.coordinator_context, "target_temp_high"),
+                        kwargs.get("target_temp_high"),
+                        self._room.set_passive_mode_upper_temp,
+                    ),
                 )
+            if not sent:
+                return False
         else:
             target_temperature = kwargs.get(ATTR_TEMPERATURE)
             if target_temperature is None:
@@ -587,17 +699,38 @@ class WiserRoom(CoordinatorEntity, ClimateEntity, WiserScheduleEntity):
                 self._data.setpoint_mode == WISER_SETPOINT_MODES["BoostAuto"]
                 and self.state == HVACMode.AUTO
             ):
-                _LOGGER.debug(
-                    f"Setting temperature for {self.name} to {target_temperature} using boost"
-                )
-                await self._room.set_target_temperature_for_duration(
-                    target_temperature, self._data.boost_time
-                )
+
+                async def async_write_temperature(temperature):
+                    _LOGGER.debug(
+                        f"Setting temperature for {self.name} to {temperature} using boost"
+                    )
+                    await self._room.set_target_temperature_for_duration(
+                        temperature, self._data.boost_time
+                    )
+
             else:
-                _LOGGER.debug(
-                    f"Setting temperature for {self.name} to {target_temperature}"
-                )
-                await self._room.set_target_temperature(target_temperature)
+
+                async def async_write_temperature(temperature):
+                    _LOGGER.debug(
+                        f"Setting temperature for {self.name} to {temperature}"
+                    )
+                    await self._room.set_target_temperature(temperature)
+
+            if not await self._data.optimistic.async_write(
+                self,
+                self.coordinator_context,
+                "target_temperature",
+                target_temperature,
+                lambda: self._data.index.get_room(
+                    self._room_id
+                ).current_target_temperature,
+                self._data.writes.async_write(
+                    (self.coordinator_context, "target_temperature"),
+                    target_temperature,
+                    async_write_temperature,
+                ),
+            ):
+                return False
         await self.async_force_update()
         return True
 
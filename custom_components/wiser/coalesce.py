@@ -0,0 +1,63 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WiserWriteCoalescer:
+    """Send only the last of a burst of writes to the same setting.
+
+    Dragging a thermostat or slider in the UI sends a value for every step.
+    Each write waits for a quiet period and is only sent to the hub if no
+    newer value for the same setting arrived in that time.  Entities show
+    the new value straight away so only the hub write is delayed.
+    """
+
+    def __init__(self, quiet_period: float) -> None:
+        self.quiet_period = quiet_period
+        self._versions = {}
+        self._locks = {}
+        self.requested = 0
+        self.sent = 0
+        self.dropped = 0
+
+    async def async_write(
+        self,
+        key: tuple,
+        value: Any,
+        write: Callable[[Any], Awaitable],
+    ) -> bool:
+        """Write value after quiet period unless a newer value is written.
+
+        Returns True if value was sent to the hub or False if it was
+        replaced by a newer value.
+        """
+        self.requested += 1
+        version = self._versions.get(key, 0) + 1
+        self._versions[key] = version
+        await asyncio.sleep(self.quiet_period)
+
+        if self._versions.get(key) != version:
+            self.dropped += 1
+            _LOGGER.debug(f"Dropped write of {value} to {key} for newer value")
+            return False
+        del self._versions[key]
+
+        # Send writes to a setting in order
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            await write(value)
+        self.sent += 1
+        return True
+
+    @property
+    def stats(self) -> dict:
+        """Return write coalescing statistics."""
+        return {
+            "requested": self.requested,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "pending": len(self._versions),
+        }
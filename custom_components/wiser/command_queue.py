@@ -0,0 +1,169 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+import heapq
+import itertools
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+PRIORITY_NAMES = {PRIORITY_COMMAND: "command", PRIORITY_POLL: "poll"}
+
+# Priority of hub requests made in the current task
+hub_request_priority: ContextVar[int] = ContextVar(
+    "wiser_hub_request_priority", default=PRIORITY_COMMAND
+)
+
+
+class WiserCommandQueue:
+    """Queue of requests waiting to be sent to a hub.
+
+    Requests wait here until one of the in flight slots is free and a token
+    is available in the rate limit bucket.  Waiting requests are released in
+    priority order so commands from users and automations are sent before
+    background polls.
+    """
+
+    def __init__(self, max_in_flight: int, rate: float, burst: int) -> None:
+        self.max_in_flight = max_in_flight
+        self.rate = rate
+        self.burst = burst
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._wake_handle: asyncio.TimerHandle | None = None
+
+        self.requests = 0
+        self.queued = 0
+        self.rate_limited = 0
+        self.max_depth = 0
+        self.last_peak_depth = 0
+        self._peak_depth = 0
+        self._waits = {priority: deque(maxlen=50) for priority in PRIORITY_NAMES}
+
+    @property
+    def depth(self) -> int:
+        """Return number of requests waiting."""
+        return len(self._waiting)
+
+    def _refill(self) -> None:
+        """Add tokens for time passed since last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._last_refill) * self.rate
+        )
+        self._last_refill = now
+
+    def _try_take(self) -> bool:
+        """Take an in flight slot and a token if both are available."""
+        if self._in_flight >= self.max_in_flight:
+            return False
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self._in_flight += 1
+        return True
+
+    def _dispatch(self) -> None:
+        """Release waiting requests while slots and tokens are available."""
+        self._wake_handle = None
+        while self._waiting:
+            if self._waiting[0][2].done():
+                # Waiting request was cancelled
+                heapq.heappop(self._waiting)
+                continue
+            if not self._try_take():
+                break
+            heapq.heappop(self._waiting)[2].set_result(None)
+
+        if self._waiting and self._in_flight < self.max_in_flight:
+            # Waiting on rate limit so wake when next token is due
+            self._wake_handle = asyncio.get_running_loop().call_later(
+                (1 - self._tokens) / self.rate, self._dispatch
+            )
+
+    async def _async_acquire(self, priority: int) -> None:
+        """Wait for an in flight slot and token."""
+        self.requests += 1
+        start = time.monotonic()
+        if not self._waiting and self._try_take():
+            self._waits[priority].append(0)
+            return
+
+        if self._in_flight < self.max_in_flight:
+            self.rate_limited += 1
+        self.queued += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._sequence), future))
+        self._peak_depth = max(self._peak_depth, self.depth)
+        self.max_depth = max(self.max_depth, self.depth)
+        if self._wake_handle is None:
+            self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was given to this request as it was cancelled
+                self._release()
+            raise
+        self._waits[priority].append(time.monotonic() - start)
+
+    def _release(self) -> None:
+        """Free an in flight slot and release next waiting request."""
+        self._in_flight -= 1
+        if self._wake_handle:
+            self._wake_handle.cancel()
+        self._dispatch()
+
+    @asynccontextmanager
+    async def async_slot(self, priority: int | None = None):
+        """Hold an in flight slot while a request is sent to the hub."""
+        if priority is None:
+            priority = hub_request_priority.get()
+        await self._async_acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def end_interval(self) -> None:
+        """Record peak queue depth since last interval and start a new one."""
+        self.last_peak_depth = self._peak_depth
+        self._peak_depth = self.depth
+
+    def average_wait(self, priority: int | None = None) -> float:
+        """Return average wait in ms of recent requests."""
+        waits = [
+            wait
+            for waits_priority, waits in self._waits.items()
+            if priority is None or waits_priority == priority
+            for wait in waits
+        ]
+        return round(sum(waits) / len(waits) * 1000, 1) if waits else 0
+
+    @property
+    def stats(self) -> dict:
+        """Return queue statistics."""
+        return {
+            "depth": self.depth,
+            "in_flight": self._in_flight,
+            "max_depth": self.max_depth,
+            "requests": self.requests,
+            "queued": self.queued,
+            "rate_limited": self.rate_limited,
+            "average_wait": {
+                name: self.average_wait(priority)
+                for priority, name in PRIORITY_NAMES.items()
+            },
+            "max_in_flight": self.max_in_flight,
+            "rate_limit": self.rate,
+            "burst": self.burst,
+        }
@@ -23,23 +23,42 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.selector import selector, SelectSelectorMode
 
 from .const import (
+    CONF_ADAPTIVE_BACKOFF,
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    CONF_ADAPTIVE_MIN_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
     CONF_AUTOMATIONS_PASSIVE,
     CONF_AUTOMATIONS_PASSIVE_TEMP_INCREMENT,
     CONF_HEATING_BOOST_TEMP,
     CONF_HEATING_BOOST_TIME,
+    CONF_NETWORK_INTERVAL,
+    CONF_REFRESH_WINDOW,
     CONF_RESTORE_MANUAL_TEMP_OPTION,
+    CONF_SCHEDULES_INTERVAL,
+    CONF_SERVICE_CONCURRENCY,
+    CONF_HISTORY_WINDOW,
     CONF_SETPOINT_MODE,
     CONF_HW_BOOST_TIME,
     CONF_HOSTNAME,
     CUSTOM_DATA_STORE,
+    DEFAULT_ADAPTIVE_BACKOFF,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_ADAPTIVE_MIN_INTERVAL,
     DEFAULT_BOOST_TEMP,
     DEFAULT_BOOST_TEMP_TIME,
+    DEFAULT_NETWORK_INTERVAL,
     DEFAULT_PASSIVE_TEMP_INCREMENT,
+    DEFAULT_REFRESH_WINDOW,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SCHEDULES_INTERVAL,
+    DEFAULT_SERVICE_CONCURRENCY,
+    DEFAULT_HISTORY_WINDOW,
     DOMAIN,
+    ENTITY_FAMILY_OPTIONS,
     WISER_RESTORE_TEMP_DEFAULT_OPTIONS,
     WISER_SETPOINT_MODES,
 )
+from .sections import async_set_handoff_data, get_section_data
 
 import logging
 
@@ -64,6 +83,11 @@ async def validate_input(hass: HomeAssistant, data):
     )
 
     await wiserhub.read_hub_data()
+
+    # Hold hub data so setup does not need to read it again
+    async_set_handoff_data(
+        hass, data[CONF_HOST], get_section_data(wiserhub.raw_hub_data)
+    )
     wiser_id = wiserhub.system.name
     return {"title": wiser_id, "unique_id": get_unique_id(wiser_id)}
 
@@ -244,6 +268,22 @@ class WiserOptionsFlowHandler(config_entries.OptionsFlow):
             step_id="automation_params", data_schema=vol.Schema(data_schema)
         )
 
+    async def async_step_entity_params(self, user_input=None):
+        """Handle entity options."""
+        if user_input is not None:
+            options = self.config_entry.options | user_input
+            return self.async_create_entry(title="", data=options)
+
+        data_schema = {
+            vol.Optional(
+                option, default=self.config_entry.options.get(option, True)
+            ): bool
+            for option in ENTITY_FAMILY_OPTIONS
+        }
+        return self.async_show_form(
+            step_id="entity_params", data_schema=vol.Schema(data_schema)
+        )
+
     async def async_step_main_params(self, user_input=None):
         """Handle options flow."""
         if user_input is not None:
@@ -318,10 +358,158 @@ class WiserOptionsFlowHandler(config_entries.OptionsFlow):
             step_id="main_params", data_schema=vol.Schema(data_schema)
         )
 
+    async def async_step_performance_params(self, user_input=None):
+        """Handle hub polling and refresh options."""
+        if user_input is not None:
+            options = self.config_entry.options | user_input
+            return self.async_create_entry(title="", data=options)
+
+        data_schema = {
+            vol.Optional(
+                CONF_REFRESH_WINDOW,
+                default=self.config_entry.options.get(
+                    CONF_REFRESH_WINDOW, DEFAULT_REFRESH_WINDOW
+                ),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "max": 10,
+                        "step": 0.5,
+                        "unit_of_measurement": "s",
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Optional(
+                CONF_ADAPTIVE_POLLING,
+                default=self.config_entry.options.get(CONF_ADAPTIVE_POLLING, False),
+            ): bool,
+            vol.Optional(
+                CONF_ADAPTIVE_MIN_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_ADAPTIVE_MIN_INTERVAL, DEFAULT_ADAPTIVE_MIN_INTERVAL
+                ),
+            ): selector(
+                {
+                    "number": {
+                        "min": 5,
+                        "max": 300,
+                        "step": 5,
+                        "unit_of_measurement": "s",
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Optional(
+                CONF_ADAPTIVE_MAX_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_ADAPTIVE_MAX_INTERVAL, DEFAULT_ADAPTIVE_MAX_INTERVAL
+                ),
+            ): selector(
+                {
+                    "number": {
+                        "min": 30,
+                        "max": 3600,
+                        "step": 30,
+                        "unit_of_measurement": "s",
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Optional(
+                CONF_ADAPTIVE_BACKOFF,
+                default=self.config_entry.options.get(
+                    CONF_ADAPTIVE_BACKOFF, DEFAULT_ADAPTIVE_BACKOFF
+                ),
+            ): selector(
+                {
+                    "number": {
+                        "min": 1,
+                        "max": 4,
+                        "step": 0.1,
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Optional(
+                CONF_SCHEDULES_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_SCHEDULES_INTERVAL, DEFAULT_SCHEDULES_INTERVAL
+                ),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "max": 3600,
+                        "step": 30,
+                        "unit_of_measurement": "s",
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Optional(
+                CONF_NETWORK_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_NETWORK_INTERVAL, DEFAULT_NETWORK_INTERVAL
+                ),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "max": 3600,
+                        "step": 30,
+                        "unit_of_measurement": "s",
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Optional(
+                CONF_SERVICE_CONCURRENCY,
+                default=self.config_entry.options.get(
+                    CONF_SERVICE_CONCURRENCY, DEFAULT_SERVICE_CONCURRENCY
+                ),
+            ): selector(
+                {
+                    "number": {
+                        "min": 1,
+                        "max": 5,
+                        "step": 1,
+                        "mode": "box",
+                    }
+                }
+            ),
+            vol.Optional(
+                CONF_HISTORY_WINDOW,
+                default=self.config_entry.options.get(
+                    CONF_HISTORY_WINDOW, DEFAULT_HISTORY_WINDOW
+                ),
+            ): selector(
+                {
+                    "number": {
+                        "min": 0,
+                        "max": 48,
+                        "step": 1,
+                        "unit_of_measurement": "h",
+                        "mode": "box",
+                    }
+                }
+            ),
+        }
+        return self.async_show_form(
+            step_id="performance_params", data_schema=vol.Schema(data_schema)
+        )
+
     async def async_step_init(self, user_input=None):
         """Handle options flow."""
         return self.async_show_menu(
-            step_id="init", menu_options=["main_params", "automation_params"]
+            step_id="init",
+            menu_options=[
+                "main_params",
+                "automation_params",
+                "performance_params",
+                "entity_params",
+            ],
         )
 
 
@@ -37,7 +37,40 @@ DATA = "data"
 UPDATE_TRACK = "update_track"
 UPDATE_LISTENER = "update_listener"
 MIN_SCAN_INTERVAL = 30
+ADAPTIVE_FAST_POLL_WINDOW = 120
+SCHEDULE_CHANGE_OFFSET = 5
 CUSTOM_DATA_STORE = "/.storage/wiser_custom_data"
+HUB_DATA_STORE = "wiser_hub_data"
+HUB_DATA_STORE_VERSION = 1
+HUB_DATA_STORE_SAVE_DELAY = 60
+HUB_DATA_STORE_MAX_AGE = 3600
+RUNTIME_STORE = "wiser_runtime"
+RUNTIME_STORE_VERSION = 1
+RUNTIME_STORE_SAVE_DELAY = 300
+RUNTIME_DAYS = 8
+RUNTIME_MAX_GAP = 900
+HISTORY_SAMPLE_INTERVAL = 30
+HISTORY_MAX_POINTS = 1000
+HUB_DATA_HANDOFF = "wiser_hub_data_handoff"
+HUB_DATA_HANDOFF_MAX_AGE = 60
+HUB_REGISTRY = "wiser_hub_registry"
+POLL_SCHEDULER = "wiser_poll_scheduler"
+ENTITY_RESOLVER = "wiser_entity_resolver"
+HUB_CONNECTION_LIMIT = 2
+HUB_CONNECT_TIMEOUT = 5
+HUB_COMMAND_RATE = 4
+HUB_COMMAND_BURST = 8
+POLL_METRICS_SIZE = 100
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_INITIAL_DELAY = 10
+CIRCUIT_MAX_DELAY = 300
+POLL_CONCURRENCY_LIMIT = 2
+OPTIMISTIC_STATE_TIMEOUT = 10
+CONVERGENCE_INITIAL_DELAY = 0.5
+CONVERGENCE_MAX_DELAY = 5
+CONVERGENCE_BACKOFF = 2
+CONVERGENCE_TIMEOUT = 90
+WRITE_COALESCE_DELAY = 0.5
 
 # Hub
 MANUFACTURER = "Drayton Wiser"
@@ -55,6 +88,15 @@ DEFAULT_BOOST_TEMP_TIME = 60
 DEFAULT_SCAN_INTERVAL = 30
 DEFAULT_SETPOINT_MODE = "normal"
 DEFAULT_PASSIVE_TEMP_INCREMENT = 0.5
+DEFAULT_REFRESH_WINDOW = 1.0
+DEFAULT_ADAPTIVE_MIN_INTERVAL = 10
+DEFAULT_ADAPTIVE_MAX_INTERVAL = 300
+DEFAULT_ADAPTIVE_BACKOFF = 1.5
+DEFAULT_SCHEDULES_INTERVAL = 600
+DEFAULT_NETWORK_INTERVAL = 300
+DEFAULT_SERVICE_CONCURRENCY = 2
+DEFAULT_HISTORY_WINDOW = 24
+DEFAULT_HISTORY_POINTS = 200
 
 # Setpoint Modes
 SETPOINT_MODE_BOOST = "boost"
@@ -69,6 +111,33 @@ CONF_HW_BOOST_TIME = "hotwater_boost_time"
 CONF_SETPOINT_MODE = "setpoint_mode"
 CONF_HOSTNAME = "hostname"
 CONF_RESTORE_MANUAL_TEMP_OPTION = "restore_manual_temp_option"
+CONF_REFRESH_WINDOW = "refresh_coalesce_window"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_ADAPTIVE_MIN_INTERVAL = "adaptive_min_interval"
+CONF_ADAPTIVE_MAX_INTERVAL = "adaptive_max_interval"
+CONF_ADAPTIVE_BACKOFF = "adaptive_backoff_factor"
+CONF_SCHEDULES_INTERVAL = "schedules_refresh_interval"
+CONF_NETWORK_INTERVAL = "network_refresh_interval"
+CONF_SERVICE_CONCURRENCY = "service_concurrency_limit"
+CONF_HISTORY_WINDOW = "history_window"
+CONF_SIGNAL_SENSORS = "enable_signal_sensors"
+CONF_BATTERY_SENSORS = "enable_battery_sensors"
+CONF_LTS_SENSORS = "enable_lts_sensors"
+CONF_POWER_SENSORS = "enable_power_sensors"
+CONF_DEVICE_SWITCHES = "enable_device_switches"
+CONF_AWAY_ACTION_SWITCHES = "enable_away_action_switches"
+CONF_RUNTIME_SENSORS = "enable_runtime_sensors"
+
+# Entity families that can be turned off in options.  All are on by default.
+ENTITY_FAMILY_OPTIONS = [
+    CONF_SIGNAL_SENSORS,
+    CONF_BATTERY_SENSORS,
+    CONF_LTS_SENSORS,
+    CONF_POWER_SENSORS,
+    CONF_DEVICE_SWITCHES,
+    CONF_AWAY_ACTION_SWITCHES,
+    CONF_RUNTIME_SENSORS,
+]
 
 # Custom Attributes
 ATTR_OPENTHERM_ENDPOINT = "endpoint"
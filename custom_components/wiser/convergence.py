@@ -0,0 +1,171 @@
+import asyncio
+from collections.abc import Callable
+from datetime import datetime
+import logging
+import time
+
+from aioWiserHeatAPI.const import WISERHUBDOMAIN
+from aioWiserHeatAPI.wiserhub import WiserHubConnectionError, WiserHubRESTError
+
+from homeassistant.core import callback
+
+from .command_queue import PRIORITY_POLL, hub_request_priority
+from .const import (
+    CONVERGENCE_BACKOFF,
+    CONVERGENCE_INITIAL_DELAY,
+    CONVERGENCE_MAX_DELAY,
+    CONVERGENCE_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WiserConvergenceStats:
+    """Convergence counters and times for a device type."""
+
+    def __init__(self) -> None:
+        self.commands = 0
+        self.converged = 0
+        self.timed_out = 0
+        self.reads = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_time = None
+
+    def add_converged(self, elapsed: float) -> None:
+        """Record a device reaching its target."""
+        self.converged += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        self.last_time = elapsed
+
+    @property
+    def as_dict(self) -> dict:
+        """Return statistics as a dict."""
+        return {
+            "commands": self.commands,
+            "converged": self.converged,
+            "timed_out": self.timed_out,
+            "device_reads": self.reads,
+            "average_time": round(self.total_time / self.converged, 1)
+            if self.converged
+            else None,
+            "max_time": round(self.max_time, 1),
+            "last_time": round(self.last_time, 1) if self.last_time else None,
+        }
+
+
+class WiserConvergencePoller:
+    """Read single devices after a command until they reach their target.
+
+    Lights, smart plugs and shutters take time to reach the state set by a
+    command.  Rather than waiting a fixed time and then reading the whole
+    hub, only the commanded device is read on a backing off schedule until
+    it reports its target or the timeout expires.
+    """
+
+    def __init__(self, coordinator) -> None:
+        self._coordinator = coordinator
+        self._tasks = {}
+        self._stats = {}
+
+    @callback
+    def async_start(
+        self,
+        device_type: str,
+        device_id: int,
+        is_converged: Callable[..., bool],
+    ) -> None:
+        """Start reading device until is_converged returns True for it.
+
+        Any convergence already running for the device is replaced.
+        """
+        if task := self._tasks.pop(device_id, None):
+            task.cancel()
+        self._stats.setdefault(device_type, WiserConvergenceStats()).commands += 1
+        self._tasks[device_id] = self._coordinator.hass.async_create_background_task(
+            self._async_poll(device_type, device_id, is_converged),
+            f"wiser {device_type} {device_id} convergence",
+        )
+
+    async def _async_poll(
+        self,
+        device_type: str,
+        device_id: int,
+        is_converged: Callable[..., bool],
+    ) -> None:
+        """Read device on a backing off schedule until converged."""
+        # Device reads wait behind commands like polls do
+        hub_request_priority.set(PRIORITY_POLL)
+        stats = self._stats[device_type]
+        rest_controller = self._coordinator.wiserhub._wiser_rest_controller
+        start = time.monotonic()
+        delay = CONVERGENCE_INITIAL_DELAY
+        try:
+            while True:
+                await asyncio.sleep(delay)
+                device = self._coordinator.index.get_device(device_id)
+                if device is None:
+                    return
+
+                try:
+                    url = WISERHUBDOMAIN + device._endpoint.format(
+                        device._device_type_data.get("id", device_id)
+                    )
+                except AttributeError:
+                    # Api device internals are not public and may change
+                    _LOGGER.debug(
+                        f"Unable to read {device_type} {device_id} on its own. "
+                        "Reading hub instead"
+                    )
+                    break
+                read_time = datetime.now()
+                data = await rest_controller._get_hub_data(url)
+                stats.reads += 1
+                if data:
+                    # Same update the api makes from a command response
+                    device._device_type_data = data
+                self._coordinator.async_update_device_listeners(
+                    ("device", device_id), read_time
+                )
+
+                elapsed = time.monotonic() - start
+                if is_converged(device):
+                    stats.add_converged(elapsed)
+                    _LOGGER.debug(
+                        f"{device_type.title()} {device_id} reached target in {elapsed:.1f}s"
+                    )
+                    return
+
+                if elapsed >= CONVERGENCE_TIMEOUT:
+                    stats.timed_out += 1
+                    _LOGGER.warning(
+                        f"{device_type.title()} {device_id} did not reach target "
+                        f"within {CONVERGENCE_TIMEOUT}s"
+                    )
+                    break
+                delay = min(delay * CONVERGENCE_BACKOFF, CONVERGENCE_MAX_DELAY)
+        except (WiserHubConnectionError, WiserHubRESTError) as ex:
+            _LOGGER.warning(
+                f"Error reading {device_type} {device_id} after command. Error is {ex}"
+            )
+        finally:
+            if self._tasks.get(device_id) is asyncio.current_task():
+                del self._tasks[device_id]
+
+        # Not converged so read full hub to make sure state is current
+        await self._coordinator.async_request_hub_refresh()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel all running convergence."""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks = {}
+
+    @property
+    def stats(self) -> dict:
+        """Return convergence statistics for each device type."""
+        return {
+            device_type: stats.as_dict for device_type, stats in self._stats.items()
+        }
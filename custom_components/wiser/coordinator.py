@@ -1,7 +1,13 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
+import math
+import time
 
+from aioWiserHeatAPI.const import TEXT_ON
 from aioWiserHeatAPI.wiserhub import (
     TEMP_MAXIMUM,
     TEMP_MINIMUM,
@@ -13,30 +19,91 @@ from aioWiserHeatAPI.wiserhub import (
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_SCAN_INTERVAL
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_send
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import (
+    ADAPTIVE_FAST_POLL_WINDOW,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_INITIAL_DELAY,
+    CIRCUIT_MAX_DELAY,
+    CONF_ADAPTIVE_BACKOFF,
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    CONF_ADAPTIVE_MIN_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
     CONF_AUTOMATIONS_PASSIVE,
     CONF_AUTOMATIONS_PASSIVE_TEMP_INCREMENT,
     CONF_HEATING_BOOST_TEMP,
     CONF_HEATING_BOOST_TIME,
+    CONF_HISTORY_WINDOW,
     CONF_HW_BOOST_TIME,
+    CONF_NETWORK_INTERVAL,
+    CONF_REFRESH_WINDOW,
     CONF_RESTORE_MANUAL_TEMP_OPTION,
+    CONF_RUNTIME_SENSORS,
+    CONF_SCHEDULES_INTERVAL,
+    CONF_SERVICE_CONCURRENCY,
     CONF_SETPOINT_MODE,
     CUSTOM_DATA_STORE,
+    DEFAULT_ADAPTIVE_BACKOFF,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_ADAPTIVE_MIN_INTERVAL,
     DEFAULT_BOOST_TEMP,
     DEFAULT_BOOST_TEMP_TIME,
+    DEFAULT_HISTORY_WINDOW,
+    DEFAULT_NETWORK_INTERVAL,
     DEFAULT_PASSIVE_TEMP_INCREMENT,
+    DEFAULT_REFRESH_WINDOW,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SCHEDULES_INTERVAL,
+    DEFAULT_SERVICE_CONCURRENCY,
     DEFAULT_SETPOINT_MODE,
     DOMAIN,
+    ENTITY_FAMILY_OPTIONS,
+    HISTORY_SAMPLE_INTERVAL,
+    HUB_DATA_STORE,
+    HUB_DATA_STORE_MAX_AGE,
+    HUB_DATA_STORE_SAVE_DELAY,
+    HUB_DATA_STORE_VERSION,
+    HUB_COMMAND_BURST,
+    HUB_COMMAND_RATE,
+    HUB_CONNECTION_LIMIT,
     MIN_SCAN_INTERVAL,
+    POLL_METRICS_SIZE,
+    SCHEDULE_CHANGE_OFFSET,
+    WRITE_COALESCE_DELAY,
 )
+from .sections import (
+    WiserSectionCache,
+    async_pop_handoff_data,
+    async_set_handoff_data,
+    remove_volatile_keys,
+)
+from .breaker import WiserCircuitBreaker
+from .coalesce import WiserWriteCoalescer
+from .command_queue import PRIORITY_POLL, WiserCommandQueue, hub_request_priority
+from .convergence import WiserConvergencePoller
+from .helpers import WiserHubIndex, WiserNameIndex
+from .history import WiserHistory
+from .metrics import WiserPollMetrics
+from .optimistic import WiserOptimisticState
+from .runtime import WiserRuntimeTracker
+from .scheduler import get_poll_scheduler
+from .session import WiserHubSession
 
 _LOGGER = logging.getLogger(__name__)
 
+# Coordinators with hub refreshes deferred by a bulk service call
+deferred_refreshes: ContextVar[set | None] = ContextVar(
+    "wiser_deferred_refreshes", default=None
+)
+
+# Domain sections with id keyed records that are not devices
+NON_DEVICE_SECTIONS = ["HeatingChannel", "HotWater", "Moment"]
+
 
 @dataclass
 class WiserSettings:
@@ -57,24 +124,21 @@ class WiserData:
     data: dict
 
 
+def get_entity_options(options: dict) -> dict:
+    """Return which optional entity families are enabled."""
+    return {option: options.get(option, True) for option in ENTITY_FAMILY_OPTIONS}
+
+
 class WiserUpdateCoordinator(DataUpdateCoordinator):
     config_entry: ConfigEntry
 
     def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
         """Initialize data update coordinator."""
-        self.scan_interval = config_entry.options.get(
-            CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
-        )
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN} ({config_entry.unique_id})",
             update_method=self.async_update_data,
-            update_interval=timedelta(
-                seconds=self.scan_interval
-                if self.scan_interval > MIN_SCAN_INTERVAL
-                else MIN_SCAN_INTERVAL
-            ),
         )
 
         self.hub_version = 0
@@ -83,32 +147,43 @@ class WiserUpdateCoordinator(DataUpdateCoordinator):
         self.minimum_temp = TEMP_MINIMUM
         self.maximum_temp = TEMP_MAXIMUM
 
-        # Main option params
-        self.boost_temp = config_entry.options.get(
-            CONF_HEATING_BOOST_TEMP, DEFAULT_BOOST_TEMP
-        )
-        self.boost_time = config_entry.options.get(
-            CONF_HEATING_BOOST_TIME, DEFAULT_BOOST_TEMP_TIME
-        )
-        self.hw_boost_time = config_entry.options.get(
-            CONF_HW_BOOST_TIME, DEFAULT_BOOST_TEMP_TIME
-        )
-        self.setpoint_mode = config_entry.options.get(
-            CONF_SETPOINT_MODE, DEFAULT_SETPOINT_MODE
-        )
-        self.previous_target_temp_option = config_entry.options.get(
-            CONF_RESTORE_MANUAL_TEMP_OPTION, "Schedule"
-        )
-
-        # Automation option params
+        # Automation option params.  Changing these requires a reload.
         self.enable_automations_passive_mode = config_entry.options.get(
             CONF_AUTOMATIONS_PASSIVE, False
         )
+        self._entry_data = dict(config_entry.data)
 
-        self.passive_temperature_increment = config_entry.options.get(
-            CONF_AUTOMATIONS_PASSIVE_TEMP_INCREMENT, DEFAULT_PASSIVE_TEMP_INCREMENT
+        # Entity option params.  Changing these requires a reload.
+        self.entity_options = get_entity_options(config_entry.options)
+        self.entity_setup = {}
+        self.runtime = WiserRuntimeTracker(hass, config_entry.entry_id)
+        self.history = WiserHistory(
+            config_entry.options.get(CONF_HISTORY_WINDOW, DEFAULT_HISTORY_WINDOW),
+            HISTORY_SAMPLE_INTERVAL,
         )
 
+        # Refresh scheduler params
+        self.refresh_requests = 0
+        self.refresh_reads = 0
+        self._pending_refresh: asyncio.Future | None = None
+        self._unsub_pending_refresh = None
+
+        # Circuit breaker params
+        self._breaker_interval = False
+
+        # Adaptive polling params
+        self._activity_signature = None
+        self._fast_poll_until = None
+
+        # Snapshot diff params
+        self.changed_ids: set | None = None
+        self._snapshot: dict | None = None
+        self._schedule_snapshot = None
+        self._record_versions = {}
+        self._record_generation = 0
+        self.attribute_cache_hits = 0
+        self.attribute_cache_builds = 0
+
         self.wiserhub = WiserAPI(
             host=config_entry.data[CONF_HOST],
             secret=str(config_entry.data[CONF_PASSWORD]).strip(),
@@ -116,6 +191,103 @@ class WiserUpdateCoordinator(DataUpdateCoordinator):
             enable_automations=self.enable_automations_passive_mode,
         )
 
+        self.command_queue = WiserCommandQueue(
+            HUB_CONNECTION_LIMIT, HUB_COMMAND_RATE, HUB_COMMAND_BURST
+        )
+        self.metrics = WiserPollMetrics(POLL_METRICS_SIZE)
+        self.breaker = WiserCircuitBreaker(
+            CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_INITIAL_DELAY, CIRCUIT_MAX_DELAY
+        )
+        self.hub_session = WiserHubSession(
+            hass, self.wiserhub, self.command_queue, self.metrics, self.breaker
+        )
+        self.sections = WiserSectionCache(self.wiserhub)
+        self.poll_scheduler = get_poll_scheduler(hass)
+        self.poll_scheduler.async_add(self)
+        self._scheduled_poll_time = None
+        self._poll_due = None
+        self.optimistic = WiserOptimisticState()
+        self.convergence = WiserConvergencePoller(self)
+        self.writes = WiserWriteCoalescer(WRITE_COALESCE_DELAY)
+        self.skipped_rebuilds = 0
+        self.suppressed_writes = {}
+        self.index = WiserHubIndex(self)
+        self.names = WiserNameIndex(self)
+        self._force_rebuild = False
+
+        # Stored hub data params
+        self.stale = False
+        self._full_updates_pending = 0
+        self._store = Store(
+            hass, HUB_DATA_STORE_VERSION, f"{HUB_DATA_STORE}_{config_entry.entry_id}"
+        )
+
+        # Bulk service params
+        self.service_semaphore: asyncio.Semaphore | None = None
+        self.service_semaphore_limit = None
+        self.service_commands = 0
+
+        self._set_options(config_entry.options)
+
+    def _set_options(self, options: dict) -> None:
+        """Set coordinator and api parameters from config entry options."""
+        self.scan_interval = options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+
+        # Main option params
+        self.boost_temp = options.get(CONF_HEATING_BOOST_TEMP, DEFAULT_BOOST_TEMP)
+        self.boost_time = options.get(CONF_HEATING_BOOST_TIME, DEFAULT_BOOST_TEMP_TIME)
+        self.hw_boost_time = options.get(CONF_HW_BOOST_TIME, DEFAULT_BOOST_TEMP_TIME)
+        self.setpoint_mode = options.get(CONF_SETPOINT_MODE, DEFAULT_SETPOINT_MODE)
+        self.previous_target_temp_option = options.get(
+            CONF_RESTORE_MANUAL_TEMP_OPTION, "Schedule"
+        )
+        self.passive_temperature_increment = options.get(
+            CONF_AUTOMATIONS_PASSIVE_TEMP_INCREMENT, DEFAULT_PASSIVE_TEMP_INCREMENT
+        )
+
+        # Refresh scheduler params
+        self.refresh_window = options.get(CONF_REFRESH_WINDOW, DEFAULT_REFRESH_WINDOW)
+
+        # Bulk service params
+        self.service_concurrency = int(
+            options.get(CONF_SERVICE_CONCURRENCY, DEFAULT_SERVICE_CONCURRENCY)
+        )
+        self._update_service_semaphore()
+
+        # History params
+        self.history.set_window(
+            options.get(CONF_HISTORY_WINDOW, DEFAULT_HISTORY_WINDOW)
+        )
+
+        # Adaptive polling params
+        self.adaptive_polling = options.get(CONF_ADAPTIVE_POLLING, False)
+        self.adaptive_min_interval = options.get(
+            CONF_ADAPTIVE_MIN_INTERVAL, DEFAULT_ADAPTIVE_MIN_INTERVAL
+        )
+        self.adaptive_max_interval = max(
+            options.get(CONF_ADAPTIVE_MAX_INTERVAL, DEFAULT_ADAPTIVE_MAX_INTERVAL),
+            self.adaptive_min_interval,
+        )
+        self.adaptive_backoff = options.get(
+            CONF_ADAPTIVE_BACKOFF, DEFAULT_ADAPTIVE_BACKOFF
+        )
+
+        # Section refresh params
+        network_interval = options.get(CONF_NETWORK_INTERVAL, DEFAULT_NETWORK_INTERVAL)
+        self.sections.set_intervals(
+            {
+                "schedules": options.get(
+                    CONF_SCHEDULES_INTERVAL, DEFAULT_SCHEDULES_INTERVAL
+                ),
+                "network": network_interval,
+                "status": network_interval,
+            }
+        )
+
+        # Adaptive polling sets interval after each update
+        if not self.adaptive_polling or not self.update_interval:
+            self._reset_update_interval()
+
         # Initialise api parameters
         self.wiserhub.api_parameters.stored_manual_target_temperature_alt_source = (
             self.previous_target_temp_option
@@ -124,19 +296,606 @@ class WiserUpdateCoordinator(DataUpdateCoordinator):
             self.passive_temperature_increment
         )
 
+    @callback
+    def async_update_options(self, config_entry: ConfigEntry) -> bool:
+        """Apply changed config entry options without a reload.
+
+        Returns False if the change requires the config entry to be reloaded.
+        """
+        if (
+            config_entry.data != self._entry_data
+            or config_entry.options.get(CONF_AUTOMATIONS_PASSIVE, False)
+            != self.enable_automations_passive_mode
+            or get_entity_options(config_entry.options) != self.entity_options
+        ):
+            return False
+
+        self._set_options(config_entry.options)
+        _LOGGER.debug(f"Options updated for {self.wiserhub.system.name}")
+        return True
+
+    def _update_service_semaphore(self) -> None:
+        """Apply service concurrency limit if no service commands hold it.
+
+        Commands holding or waiting on the current semaphore would not be
+        counted by a new one, so a changed limit is applied once the last
+        of them ends.
+        """
+        if self.service_commands:
+            return
+        if self.service_semaphore_limit != self.service_concurrency:
+            self.service_semaphore = asyncio.Semaphore(self.service_concurrency)
+            self.service_semaphore_limit = self.service_concurrency
+
+    @asynccontextmanager
+    async def async_service_slot(self):
+        """Hold a service concurrency slot while a service command runs."""
+        self.service_commands += 1
+        try:
+            async with self.service_semaphore:
+                yield
+        finally:
+            self.service_commands -= 1
+            self._update_service_semaphore()
+
+    @callback
+    def async_record_entity_setup(
+        self, platform: str, entities: int, setup_start: float
+    ) -> None:
+        """Record number of entities created by a platform and its setup time."""
+        setup_time = round((time.monotonic() - setup_start) * 1000, 1)
+        self.entity_setup[platform] = {"entities": entities, "setup_time": setup_time}
+        _LOGGER.debug(
+            f"Created {entities} {platform} entities for {self.wiserhub.system.name} in {setup_time}ms"
+        )
+
+    @property
+    def entity_stats(self) -> dict:
+        """Return entity families, setup, listeners and attribute cache use."""
+        lookups = self.attribute_cache_hits + self.attribute_cache_builds
+        return {
+            "options": self.entity_options,
+            "setup": self.entity_setup,
+            "update_listeners": len(self._listeners),
+            "attribute_cache": {
+                "hits": self.attribute_cache_hits,
+                "builds": self.attribute_cache_builds,
+                "hit_rate": round(self.attribute_cache_hits / lookups * 100, 1)
+                if lookups
+                else 0,
+            },
+        }
+
+    async def async_request_hub_refresh(self) -> None:
+        """Request a hub read after a command has been sent.
+
+        Requests made within the refresh window are merged into a single
+        hub read and every caller awaits that shared read.
+        """
+        self.refresh_requests += 1
+        self._mark_activity()
+        if (deferred := deferred_refreshes.get()) is not None:
+            # Bulk service call will refresh once all its commands have run
+            deferred.add(self)
+            return
+        if self._pending_refresh is None:
+            self._pending_refresh = self.hass.loop.create_future()
+            self._unsub_pending_refresh = async_call_later(
+                self.hass, self.refresh_window, self._async_run_pending_refresh
+            )
+        await asyncio.shield(self._pending_refresh)
+
+    async def _async_run_pending_refresh(self, _now=None) -> None:
+        """Run the hub read shared by all pending refresh requests."""
+        pending_refresh = self._pending_refresh
+        self._pending_refresh = None
+        self._unsub_pending_refresh = None
+        self.refresh_reads += 1
+        self._force_rebuild = True
+        _LOGGER.debug(
+            f"Hub refresh running for {self.refresh_requests} requests "
+            f"({self.refresh_reads} hub reads)"
+        )
+        try:
+            await self.async_refresh()
+        finally:
+            if not pending_refresh.done():
+                pending_refresh.set_result(None)
+
+    @callback
+    def async_track_convergence(
+        self, device_type: str, device_id: int, is_converged
+    ) -> None:
+        """Read a device after a command until it reaches its target."""
+        self._mark_activity()
+        self.convergence.async_start(device_type, device_id, is_converged)
+
+    @callback
+    def async_update_device_listeners(self, context: tuple, read_time: datetime):
+        """Update entities of a device read on its own.
+
+        The changed ids are not stored on the coordinator as a poll may be
+        running and would use them for its own update.
+        """
+        self._async_update_changed_listeners(
+            {context} | self.optimistic.reconcile(read_time, {context})
+        )
+
+    async def async_shutdown(self) -> None:
+        """Cancel any pending refresh and shutdown coordinator."""
+        if self._unsub_pending_refresh:
+            self._unsub_pending_refresh()
+            self._unsub_pending_refresh = None
+        if self._pending_refresh and not self._pending_refresh.done():
+            self._pending_refresh.set_result(None)
+        self._pending_refresh = None
+        self.convergence.async_cancel()
+        self.poll_scheduler.async_remove(self)
+        try:
+            await self.runtime.async_save()
+            await super().async_shutdown()
+        finally:
+            await self.hub_session.async_close()
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule next poll in this hub's phase slot."""
+        super()._schedule_refresh()
+        if self._unsub_refresh is None:
+            # Polling is disabled
+            return
+
+        self._async_unsub_refresh()
+        loop = self.hass.loop
+        self._scheduled_poll_time = self.poll_scheduler.next_poll_time(
+            self, loop.time(), self.update_interval.total_seconds()
+        )
+        self._unsub_refresh = loop.call_at(
+            self._scheduled_poll_time, self.hass.async_run_hass_job, self._job
+        ).cancel
+
+    async def _handle_refresh_interval(self, _now: datetime | None = None) -> None:
+        """Record poll as due so its scheduling lag can be measured."""
+        self._poll_due = self._scheduled_poll_time
+        await super()._handle_refresh_interval(_now)
+
+    def _reset_update_interval(self) -> None:
+        """Set polling interval to the scan interval."""
+        self.update_interval = timedelta(
+            seconds=max(self.scan_interval, MIN_SCAN_INTERVAL)
+        )
+
+    @property
+    def effective_scan_interval(self) -> int:
+        """Return the current polling interval in seconds."""
+        return round(self.update_interval.total_seconds())
+
+    def _mark_activity(self) -> None:
+        """Start a fast polling window."""
+        if self.adaptive_polling:
+            self._fast_poll_until = datetime.now() + timedelta(
+                seconds=ADAPTIVE_FAST_POLL_WINDOW
+            )
+
+    def _get_activity_signature(self) -> tuple:
+        """Return a summary of hub state that indicates heating activity."""
+        signature = [
+            (
+                room.id,
+                room.is_heating,
+                room.is_boosted,
+                room.mode,
+                room.current_target_temperature,
+            )
+            for room in self.wiserhub.rooms.all
+        ]
+        if self.wiserhub.hotwater:
+            signature.append(
+                (
+                    self.wiserhub.hotwater.is_heating,
+                    self.wiserhub.hotwater.is_boosted,
+                    self.wiserhub.hotwater.mode,
+                )
+            )
+        signature.extend(
+            (channel.id, channel.heating_relay_status)
+            for channel in self.wiserhub.heating_channels.all
+        )
+        signature.append(self.wiserhub.system.is_away_mode_enabled)
+        return tuple(signature)
+
+    def _get_next_activity_time(self) -> datetime | None:
+        """Return the time of the next expected schedule or boost change."""
+        next_times = []
+        for item in [*self.wiserhub.rooms.all, self.wiserhub.hotwater]:
+            if not item:
+                continue
+            if item.is_boosted and item.boost_end_time:
+                next_times.append(item.boost_end_time)
+            if item.schedule and item.schedule.next:
+                next_times.append(item.schedule.next.datetime)
+        next_times = [
+            next_time
+            for next_time in next_times
+            if next_time and next_time > datetime.now()
+        ]
+        return min(next_times) if next_times else None
+
+    def _update_adaptive_interval(self) -> None:
+        """Set the next polling interval from recent hub activity.
+
+        Poll at the minimum interval for a short window after a command or a
+        detected change and then back off towards the maximum interval while
+        the hub reports no activity.  Polls are also brought forward to just
+        after the next schedule change or boost end.
+        """
+        try:
+            activity_signature = self._get_activity_signature()
+            next_activity_time = self._get_next_activity_time()
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.debug(f"Unable to determine hub activity. Error is {ex}")
+            return
+
+        if activity_signature != self._activity_signature:
+            if self._activity_signature is not None:
+                self._mark_activity()
+            self._activity_signature = activity_signature
+
+        if self._fast_poll_until and datetime.now() < self._fast_poll_until:
+            interval = self.adaptive_min_interval
+        else:
+            interval = min(
+                self.effective_scan_interval * self.adaptive_backoff,
+                self.adaptive_max_interval,
+            )
+
+        if next_activity_time:
+            interval = min(
+                interval,
+                (next_activity_time - datetime.now()).total_seconds()
+                + SCHEDULE_CHANGE_OFFSET,
+            )
+
+        interval = round(max(interval, self.adaptive_min_interval))
+        if interval != self.effective_scan_interval:
+            _LOGGER.debug(
+                f"Adaptive polling interval for {self.wiserhub.system.name} set to {interval}s"
+            )
+        self.update_interval = timedelta(seconds=interval)
+
+    def _get_snapshot(self) -> dict:
+        """Return domain records keyed by room or device id.
+
+        Heating channel records are added to the rooms on the channel.  Other
+        data not keyed by a room or device, such as the system record, is
+        keyed by None.
+        """
+        snapshot = {}
+        for section, records in self.wiserhub.raw_hub_data["Domain"].items():
+            if section == "HeatingChannel":
+                for record in records:
+                    for room_id in record.get("RoomIds", []):
+                        snapshot.setdefault(("room", room_id), []).append(record)
+                continue
+            if not isinstance(records, list) or section in NON_DEVICE_SECTIONS:
+                snapshot.setdefault(None, {})[section] = remove_volatile_keys(records)
+                continue
+            for record in records:
+                if isinstance(record, dict) and "id" in record:
+                    key = (
+                        "room" if section == "Room" else "device",
+                        record["id"],
+                    )
+                    snapshot.setdefault(key, []).append(record)
+
+        # Passive mode settings are not held on the hub
+        for room in self.wiserhub.rooms.all:
+            snapshot.setdefault(("room", room.id), []).append(
+                (
+                    room.passive_mode_enabled,
+                    room.passive_mode_lower_temp,
+                    room.passive_mode_upper_temp,
+                )
+            )
+        return snapshot
+
+    def _update_changed_ids(self, previous_update_success: bool) -> None:
+        """Set the ids of rooms and devices that changed in the last update.
+
+        A room is also marked changed if any of its devices changed and
+        devices are marked changed if their room record changed.  Boosted
+        rooms are always marked changed as their remaining boost time is
+        calculated from the current time.  changed_ids is set to None to
+        update all entities, which is also done if system or other data not
+        keyed by a room or device changed.
+        """
+        try:
+            snapshot = self._get_snapshot()
+            schedule_snapshot = self.wiserhub.raw_hub_data["Schedule"]
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.debug(f"Unable to compare hub data. Error is {ex}")
+            self._snapshot = None
+            self._record_generation += 1
+            return
+
+        if self._snapshot is None:
+            self._record_generation += 1
+        else:
+            for key in snapshot.keys() | self._snapshot.keys():
+                if snapshot.get(key) != self._snapshot.get(key):
+                    self._record_versions[key] = self._record_versions.get(key, 0) + 1
+
+        if (
+            self._snapshot is None
+            or self._full_updates_pending
+            or not previous_update_success
+            or schedule_snapshot != self._schedule_snapshot
+            or snapshot.get(None) != self._snapshot.get(None)
+        ):
+            self.changed_ids = None
+        else:
+            changed_ids = {
+                key
+                for key in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(key) != self._snapshot.get(key)
+            }
+            linked_ids = set()
+            for room in self.wiserhub.rooms.all:
+                device_ids = {("device", device.id) for device in room.devices}
+                if ("room", room.id) in changed_ids:
+                    linked_ids |= device_ids
+                if room.is_boosted or device_ids & changed_ids:
+                    linked_ids.add(("room", room.id))
+            self.changed_ids = changed_ids | linked_ids
+
+        self._snapshot = snapshot
+        self._schedule_snapshot = schedule_snapshot
+        self._full_updates_pending = max(self._full_updates_pending - 1, 0)
+        _LOGGER.debug(
+            f"Hub update for {self.wiserhub.system.name} changed "
+            f"{'all' if self.changed_ids is None else len(self.changed_ids)} rooms and devices"
+        )
+
+    def get_record_versions(self, keys: tuple) -> tuple:
+        """Return change versions of the hub records of rooms or devices.
+
+        keys are room or device contexts, or None for the system and other
+        data not keyed by a room or device.  Versions change when the record
+        changes or when api objects are built without a record comparison.
+        """
+        return (
+            self._record_generation,
+            *(self._record_versions.get(key, 0) for key in keys),
+        )
+
+    def _expire_schedules_at_next_change(self) -> None:
+        """Read schedules again after the next scheduled change."""
+        try:
+            next_times = [
+                schedule.next.datetime
+                for schedule in self.wiserhub.schedules.all
+                if schedule.next and schedule.next.datetime
+            ]
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.debug(f"Unable to determine next schedule change. Error is {ex}")
+            return
+
+        if next_times:
+            self.sections.expire_section(
+                "schedules",
+                min(next_times) + timedelta(seconds=SCHEDULE_CHANGE_OFFSET),
+            )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners of changed rooms and devices and all others."""
+        # End poll first so metric sensors show this poll
+        fan_out = self.metrics.awaiting_fan_out
+        if fan_out:
+            self.metrics.end_poll()
+        start = time.monotonic()
+        self._async_update_changed_listeners(self.changed_ids)
+        if fan_out:
+            self.metrics.add_fan_out(time.monotonic() - start)
+
+    @callback
+    def _async_update_changed_listeners(self, changed_ids: set | None) -> None:
+        """Update listeners of changed_ids and all others, or all if None."""
+        if changed_ids is None:
+            super().async_update_listeners()
+        else:
+            for update_callback, context in list(self._listeners.values()):
+                if context is None or context in changed_ids:
+                    update_callback()
+
+    async def _async_build_objects(self, section_data: dict) -> None:
+        """Build api objects from section data without reading from the hub."""
+        self.sections.load(section_data)
+        try:
+            # Build objects directly so passive mode automations are not run
+            # on data that is not from this update
+            await self.wiserhub._build_objects()
+            self.index.update()
+            self.names.update()
+        finally:
+            self.sections.clear()
+        self.hub_version = self.wiserhub.system.hardware_generation
+
+    async def async_load_handoff_hub_data(self) -> bool:
+        """Use a hub read made moments ago as the first update.
+
+        The config flow and options reloads hold the data they have just
+        read so setup does not need to read from the hub again.
+        """
+        section_data = async_pop_handoff_data(self.hass, self._entry_data[CONF_HOST])
+        if not section_data:
+            return False
+
+        try:
+            await self._async_build_objects(section_data)
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.debug(f"Unable to use hub data from setup. Error is {ex}")
+            return False
+
+        self.sections.update_sections(section_data)
+        self.last_update_time = datetime.now()
+        self.last_update_status = "Success"
+        self._store.async_delay_save(
+            self._get_stored_hub_data, HUB_DATA_STORE_SAVE_DELAY
+        )
+        _LOGGER.info(f"Using hub data from setup for {self.wiserhub.system.name}")
+        return True
+
+    @callback
+    def async_set_handoff_hub_data(self) -> None:
+        """Hold last hub data for the coordinator created by a reload."""
+        if self.last_update_status == "Success":
+            async_set_handoff_data(
+                self.hass,
+                self._entry_data[CONF_HOST],
+                self.sections.section_data,
+                self.last_update_time,
+            )
+
+    async def async_load_stored_hub_data(self) -> bool:
+        """Build api objects from hub data stored by a previous update.
+
+        Entities can then be set up without waiting for the hub.  Data is
+        marked as stale until the hub update started here succeeds.  Data
+        older than the maximum age is not used and if a hub update fails
+        while data is stale, entities are made unavailable rather than show
+        stored values as current.
+        """
+        stored_data = await self._store.async_load()
+        if not stored_data:
+            return False
+
+        last_update_time = datetime.fromisoformat(stored_data["last_update_time"])
+        if datetime.now() - last_update_time > timedelta(
+            seconds=HUB_DATA_STORE_MAX_AGE
+        ):
+            _LOGGER.debug(f"Stored hub data from {last_update_time} is too old to use")
+            return False
+
+        try:
+            await self._async_build_objects(stored_data["sections"])
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.warning(f"Unable to load stored hub data. Error is {ex}")
+            return False
+
+        self.last_update_time = last_update_time
+        self.last_update_status = "Stored"
+        self.stale = True
+        # Entities can be added while the first hub update is running, so
+        # update all entities on the first two hub updates
+        self._full_updates_pending = 2
+        _LOGGER.info(
+            f"Loaded stored hub data for {self.wiserhub.system.name} from {self.last_update_time}"
+        )
+        self.hass.async_create_task(self.async_refresh())
+        return True
+
+    def _get_heating_states(self) -> dict[str, bool]:
+        """Return heating state of rooms, heating channels and hot water."""
+        states = {
+            f"room_{room.id}": room.is_heating
+            for room in self.wiserhub.rooms.all
+            if room.devices
+        }
+        for heating_channel in self.wiserhub.heating_channels.all:
+            states[f"heating_channel_{heating_channel.id}"] = (
+                heating_channel.heating_relay_status == TEXT_ON
+            )
+        if self.wiserhub.hotwater:
+            states["hotwater"] = self.wiserhub.hotwater.is_heating
+        return states
+
+    def _get_stored_hub_data(self) -> dict:
+        """Return hub data to store."""
+        return {
+            "last_update_time": self.last_update_time.isoformat(),
+            "sections": self.sections.section_data,
+        }
+
     async def async_update_data(self) -> WiserData:
+        # Limit number of hubs being read at the same time
+        async with self.poll_scheduler.read_semaphore:
+            return await self._async_read_hub()
+
+    async def _async_read_hub(self) -> WiserData:
+        """Read hub and update api objects and changed entities."""
+        if self._poll_due is not None:
+            self.metrics.lag.add(
+                round((self.hass.loop.time() - self._poll_due) * 1000, 1)
+            )
+            self._poll_due = None
+
+        previous_update_success = self.last_update_success
+        self.changed_ids = None
+        read_time = datetime.now()
+        # Commands are sent ahead of poll requests waiting for the hub
+        priority_token = hub_request_priority.set(PRIORITY_POLL)
+        self.metrics.start_poll()
         try:
-            await self.wiserhub.read_hub_data()
+            changed_sections = await self.sections.async_read_sections(
+                self._force_rebuild
+            )
+
+            # Rebuild api objects if hub data changed or after a command.
+            # Passive mode automations are run by the api as part of the
+            # rebuild and only act on changed room or passive mode settings.
+            rebuild = changed_sections or self._force_rebuild
+            self._force_rebuild = False
+            if rebuild:
+                build_start = time.monotonic()
+                await self.wiserhub.read_hub_data()
+                self.index.update()
+                self.names.update()
+                # Sections are read ahead so this is mostly object building
+                self.metrics.add_build(time.monotonic() - build_start)
+                self.sections.clear()
+                self._expire_schedules_at_next_change()
+            else:
+                self.sections.clear()
+                self.skipped_rebuilds += 1
+
             self.hub_version = self.wiserhub.system.hardware_generation
             self.last_update_time = datetime.now()
             self.last_update_status = "Success"
+            self.stale = False
+            if rebuild:
+                self._store.async_delay_save(
+                    self._get_stored_hub_data, HUB_DATA_STORE_SAVE_DELAY
+                )
+            self._update_changed_ids(previous_update_success)
+
+            # Update entities whose expected values were confirmed or rolled back
+            reconciled = self.optimistic.reconcile(read_time)
+            if reconciled and self.changed_ids is not None:
+                self.changed_ids |= reconciled
+
+            if self._breaker_interval:
+                # Hub is responding again so return to normal polling
+                self._breaker_interval = False
+                self._reset_update_interval()
+                self._mark_activity()
+
+            if self.adaptive_polling:
+                self._update_adaptive_interval()
+
+            if self.entity_options[CONF_RUNTIME_SENSORS]:
+                self.runtime.async_update(self._get_heating_states())
+
+            self.history.update(self)
 
             _LOGGER.info(f"Hub update completed for {self.wiserhub.system.name}")
+            self.metrics.end_read()
 
             # Send event to websockets to notify hub update
-            async_dispatcher_send(
-                self.hass, "wiser_update_received", self.wiserhub.system.name
-            )
+            if rebuild:
+                async_dispatcher_send(
+                    self.hass, "wiser_update_received", self.wiserhub.system.name
+                )
             return True
         except (
             WiserHubConnectionError,
@@ -144,8 +903,26 @@ class WiserUpdateCoordinator(DataUpdateCoordinator):
             WiserHubRESTError,
         ) as ex:
             self.last_update_status = "Failed"
+            self.changed_ids = None
+            self.sections.reset()
             _LOGGER.warning(ex)
+            if self.breaker.is_open:
+                # Poll again when the next connection attempt is allowed
+                self.update_interval = timedelta(
+                    seconds=max(math.ceil(self.breaker.retry_in), 1)
+                )
+                self._breaker_interval = True
+            if self.stale:
+                # Stored data is not current so make entities unavailable
+                raise UpdateFailed(
+                    f"Unable to update stored hub data from {self.last_update_time}"
+                ) from ex
         except Exception as ex:
             self.last_update_status = "Failed"
+            self.changed_ids = None
+            self.sections.reset()
             _LOGGER.error(ex)
             raise ex
+        finally:
+            hub_request_priority.reset(priority_token)
+            self.command_queue.end_interval()
@@ -19,7 +19,12 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DATA, DOMAIN, MANUFACTURER_SCHNEIDER
-from .helpers import get_device_name, get_identifier, hub_error_handler
+from .helpers import (
+    get_device_name,
+    get_identifier,
+    hub_error_handler,
+    WiserCachedAttributesEntity,
+)
 from .schedules import WiserScheduleEntity
 
 MANUFACTURER = MANUFACTURER_SCHNEIDER
@@ -40,6 +45,9 @@ TILT_SUPPORT_FLAGS = (
     | CoverEntityFeature.STOP_TILT
 )
 
+# Shutter lift and tilt movement values while moving
+MOVING_STATES = ["Opening", "Closing"]
+
 
 async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entities):
     """Set up Wiser shutter device."""
@@ -54,15 +62,48 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
         async_add_entities(wiser_shutters, True)
 
 
-class WiserShutter(CoordinatorEntity, CoverEntity, WiserScheduleEntity):
+def _is_lift_converged(shutter) -> bool:
+    """Return True if shutter has stopped at its target lift."""
+    return _is_stopped(shutter) and shutter.current_lift == shutter.target_lift
+
+
+def _is_tilt_converged(shutter) -> bool:
+    """Return True if shutter has stopped at its target tilt."""
+    return _is_stopped(shutter) and shutter.current_tilt == shutter.target_tilt
+
+
+def _is_stopped(shutter) -> bool:
+    """Return True if shutter lift and tilt are not moving."""
+    return shutter.lift_movement not in MOVING_STATES and (
+        shutter.tilt_movement not in MOVING_STATES
+    )
+
+
+class WiserShutter(
+    CoordinatorEntity, CoverEntity, WiserScheduleEntity, WiserCachedAttributesEntity
+):
     """Wisershutter ClientEntity Object."""
 
+    # Identification does not change so is not stored in the recorder
+    _unrecorded_attributes = frozenset(
+        {
+            "model",
+            "product_type",
+            "product_identifier",
+            "product_model",
+            "serial_number",
+            "firmware",
+            "is_lift_position_supported",
+            "is_tilt_supported",
+        }
+    )
+
     def __init__(self, coordinator, shutter_id) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, ("device", shutter_id))
         self._data = coordinator
         self._device_id = shutter_id
-        self._device = self._data.wiserhub.devices.shutters.get_by_id(self._device_id)
+        self._device = self._data.index.get_device(self._device_id)
         self._schedule = self._device.schedule
         _LOGGER.debug(f"{self._data.wiserhub.system.name} {self.name} initialise")
 
@@ -70,12 +111,12 @@ class WiserShutter(CoordinatorEntity, CoverEntity, WiserScheduleEntity):
         _LOGGER.debug(f"Hub update initiated by {self.name}")
         if delay:
             asyncio.sleep(delay)
-        await self._data.async_refresh()
+        await self._data.async_request_hub_refresh()
 
     @callback
     def _handle_coordinator_update(self) -> None:
         _LOGGER.debug(f"{self.name} updating")
-        self._device = self._data.wiserhub.devices.shutters.get_by_id(self._device_id)
+        self._device = self._data.index.get_device(self._device_id)
         self._schedule = self._device.schedule
         self.async_write_ha_state()
 
@@ -93,9 +134,7 @@ class WiserShutter(CoordinatorEntity, CoverEntity, WiserScheduleEntity):
             "name": get_device_name(self._data, self._device_id),
             "identifiers": {(DOMAIN, get_identifier(self._data, self._device_id))},
             "manufacturer": MANUFACTURER,
-            "model": self._data.wiserhub.devices.get_by_id(
-                self._device_id
-            ).product_type,
+            "model": self._data.index.get_device(self._device_id).product_type,
             "via_device": (DOMAIN, self._data.wiserhub.system.name),
         }
 
@@ -138,33 +177,42 @@ class WiserShutter(CoordinatorEntity, CoverEntity, WiserScheduleEntity):
         """Return unique Id."""
         return f"{self._data.wiserhub.system.name}-Wisershutter-{self._device_id}-{self.name}"
 
+    def _build_identification_attributes(self) -> dict:
+        """Return shutter identification, firmware and feature attributes."""
+        return {
+            "name": self._device.name,
+            "model": self._device.model,
+            "product_type": self._device.product_type,
+            "product_identifier": self._device.product_identifier,
+            "product_model": self._device.product_model,
+            "serial_number": self._device.serial_number,
+            "firmware": self._device.firmware_version,
+            "is_lift_position_supported": self._device.is_lift_position_supported,
+            "is_tilt_supported": self._device.is_tilt_supported,
+        }
+
     @property
     def extra_state_attributes(self):
         """Return state attributes."""
         # Generic attributes
         attrs = super().state_attributes
         # Shutter Identification
-        attrs["name"] = self._device.name
-        attrs["model"] = self._device.model
-        attrs["product_type"] = self._device.product_type
-        attrs["product_identifier"] = self._device.product_identifier
-        attrs["product_model"] = self._device.product_model
-        attrs["serial_number"] = self._device.serial_number
-        attrs["firmware"] = self._device.firmware_version
+        attrs.update(
+            self._get_cached_attributes(
+                "identification",
+                self._build_identification_attributes,
+                (self.coordinator_context,),
+            )
+        )
 
         # Room
-        if self._data.wiserhub.rooms.get_by_id(self._device.room_id) is not None:
-            attrs["room"] = self._data.wiserhub.rooms.get_by_id(
-                self._device.room_id
-            ).name
+        if self._data.index.get_room(self._device.room_id) is not None:
+            attrs["room"] = self._data.index.get_room(self._device.room_id).name
         else:
             attrs["room"] = "Unassigned"
 
         # Settings
         attrs["shutter_id"] = self._device_id
-        # features supported
-        attrs["is_lift_position_supported"] = self._device.is_lift_position_supported
-        attrs["is_tilt_supported"] = self._device.is_tilt_supported
 
         attrs["away_mode_action"] = self._device.away_mode_action
         attrs["mode"] = self._device.mode
@@ -223,28 +271,34 @@ class WiserShutter(CoordinatorEntity, CoverEntity, WiserScheduleEntity):
         position = kwargs[ATTR_POSITION]
         _LOGGER.debug(f"Setting cover position for {self.name} to {position}")
         await self._device.open(position)
-        await self.async_force_update()
+        self._data.async_track_convergence(
+            "shutter", self._device_id, _is_lift_converged
+        )
 
     @hub_error_handler
     async def async_close_cover(self, **kwargs):
         """Close shutter."""
         _LOGGER.debug(f"Closing {self.name}")
         await self._device.close()
-        await self.async_force_update()
+        self._data.async_track_convergence(
+            "shutter", self._device_id, _is_lift_converged
+        )
 
     @hub_error_handler
     async def async_open_cover(self, **kwargs):
         """Open shutter."""
         _LOGGER.debug(f"Opening {self.name}")
         await self._device.open()
-        await self.async_force_update()
+        self._data.async_track_convergence(
+            "shutter", self._device_id, _is_lift_converged
+        )
 
     @hub_error_handler
     async def async_stop_cover(self, **kwargs):
         """Stop shutter."""
         _LOGGER.debug(f"Stopping {self.name}")
         await self._device.stop()
-        await self.async_force_update()
+        self._data.async_track_convergence("shutter", self._device_id, _is_stopped)
 
     @hub_error_handler
     async def async_set_cover_tilt_position(self, **kwargs: Any) -> None:
@@ -252,24 +306,30 @@ class WiserShutter(CoordinatorEntity, CoverEntity, WiserScheduleEntity):
         position = kwargs[ATTR_TILT_POSITION]
         _LOGGER.debug(f"Setting cover tilt position for {self.name} to {position}")
         await self._device.open_tilt(position)
-        await self.async_force_update()
+        self._data.async_track_convergence(
+            "shutter", self._device_id, _is_tilt_converged
+        )
 
     @hub_error_handler
     async def async_close_cover_tilt(self, **kwargs):
         """Close shutter tilt."""
         _LOGGER.debug(f"Closing tilt {self.name}")
         await self._device.close_tilt()
-        await self.async_force_update()
+        self._data.async_track_convergence(
+            "shutter", self._device_id, _is_tilt_converged
+        )
 
     @hub_error_handler
     async def async_open_cover_tilt(self, **kwargs: Any) -> None:
         """Open shutter tilt."""
         await self._device.open_tilt()
-        await self.async_force_update()
+        self._data.async_track_convergence(
+            "shutter", self._device_id, _is_tilt_converged
+        )
 
     @hub_error_handler
     async def async_stop_cover_tilt(self, **kwargs):
         """Stop shutter tilt."""
         _LOGGER.debug(f"Stopping tilt {self.name}")
         await self._device.stop_tilt()
-        await self.async_force_update()
+        self._data.async_track_convergence("shutter", self._device_id, _is_stopped)
@@ -1,6 +1,7 @@
 """Diagnostics support for Wiser"""
 from __future__ import annotations
 
+import copy
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
@@ -26,4 +27,12 @@ def _async_get_diagnostics(
 ) -> dict[str, Any]:
     data = hass.data[DOMAIN][entry.entry_id]["data"]
 
-    return anonymise_data(data.wiserhub._raw_hub_data)
+    diagnostics = anonymise_data(copy.deepcopy(data.wiserhub.raw_hub_data))
+    diagnostics["Connection"] = data.hub_session.stats
+    diagnostics["Command Queue"] = data.command_queue.stats
+    diagnostics["Poll Metrics"] = data.metrics.stats
+    diagnostics["Circuit Breaker"] = data.breaker.stats
+    diagnostics["Poll Scheduler"] = data.poll_scheduler.stats
+    diagnostics["Entities"] = data.entity_stats
+    diagnostics["History"] = data.history.stats
+    return diagnostics
@@ -3,8 +3,12 @@ from aioWiserHeatAPI.wiserhub import (
     WiserHubAuthenticationError,
     WiserHubRESTError,
 )
-from homeassistant.core import HomeAssistant
-from .const import DOMAIN, ENTITY_PREFIX
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
+from .const import DOMAIN, ENTITY_PREFIX, ENTITY_RESOLVER, HUB_REGISTRY
+from collections.abc import Callable
+import json
 import logging
 
 _LOGGER = logging.getLogger(__name__)
@@ -26,15 +30,236 @@ def hub_error_handler(func):
     return wrapper
 
 
+class WiserChangeSuppressedEntity:
+    """Entity mixin that only writes state when it has changed.
+
+    Coordinator updates call async_write_ha_state_if_changed which compares
+    the value, icon, availability and a fingerprint of the attributes with
+    the last written state.  Writes with nothing changed are skipped and
+    counted by platform on the coordinator.
+
+    Entities build their attributes in _get_extra_state_attributes.  The
+    attributes built for the comparison are used by the write that follows
+    so they are only built once per update.
+    """
+
+    _last_state_fingerprint = None
+    _compared_attributes = None
+
+    def _get_extra_state_attributes(self) -> dict | None:
+        """Return the state attributes of the entity."""
+        return None
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        """Return attributes built for the state comparison or build them."""
+        if self._compared_attributes is not None:
+            return self._compared_attributes
+        return self._get_extra_state_attributes()
+
+    def _get_state_fingerprint(self, attributes: dict | None) -> tuple:
+        """Return fingerprint of everything written to the state machine."""
+        return (
+            self.state,
+            self.available,
+            self.name,
+            self.icon,
+            json.dumps(attributes, sort_keys=True, default=str),
+        )
+
+    @callback
+    def async_write_ha_state_if_changed(self) -> None:
+        """Write state if it has changed since it was last written."""
+        attributes = self._get_extra_state_attributes()
+        fingerprint = self._get_state_fingerprint(attributes)
+        if fingerprint == self._last_state_fingerprint:
+            suppressed_writes = self.coordinator.suppressed_writes
+            suppressed_writes[self.platform.domain] = (
+                suppressed_writes.get(self.platform.domain, 0) + 1
+            )
+            return
+        self._last_state_fingerprint = fingerprint
+        self._compared_attributes = attributes
+        try:
+            self.async_write_ha_state()
+        finally:
+            self._compared_attributes = None
+
+
+class WiserCachedAttributesEntity:
+    """Entity mixin that caches groups of attributes that rarely change.
+
+    Attributes such as capabilities, identification and firmware only
+    change when the hub records they are read from change.  These groups
+    are built once and then only rebuilt when the record of their room or
+    device, or one of their hub sections, changes.  Groups that can change
+    without a record change, like those updated by commands or based on the
+    time, should be built each time.
+    """
+
+    _attribute_cache = None
+
+    def _get_cached_attributes(
+        self,
+        group: str,
+        build: Callable[[], dict],
+        records: tuple = (),
+        sections: tuple[str, ...] = (),
+    ) -> dict:
+        """Return attribute group, rebuilding it if its sources have changed.
+
+        records are the room or device contexts whose hub records the group
+        is read from, or None for the system record.
+        """
+        if self._attribute_cache is None:
+            self._attribute_cache = {}
+        versions = (
+            self.coordinator.get_record_versions(records),
+            self.coordinator.sections.get_versions(sections),
+        )
+        cached = self._attribute_cache.get(group)
+        if cached is None or cached[0] != versions:
+            self.coordinator.attribute_cache_builds += 1
+            cached = self._attribute_cache[group] = (versions, build())
+        else:
+            self.coordinator.attribute_cache_hits += 1
+        return cached[1]
+
+
+class WiserHubIndex:
+    """Id lookups for api objects.
+
+    The api finds devices and rooms by searching lists, so dict indexes are
+    built each time the api objects are rebuilt.
+    """
+
+    def __init__(self, data) -> None:
+        self._data = data
+        self.devices = {}
+        self.node_devices = {}
+        self.rooms = {}
+        self.device_rooms = {}
+
+    def update(self) -> None:
+        """Rebuild indexes from current api objects."""
+        wiserhub = self._data.wiserhub
+        self.devices = {
+            device.id: device
+            for device in (wiserhub.devices.all if wiserhub.devices else [])
+        }
+        self.rooms = {
+            room.id: room for room in (wiserhub.rooms.all if wiserhub.rooms else [])
+        }
+
+        # Keep first match as api lookups do
+        self.node_devices = {}
+        for device in self.devices.values():
+            self.node_devices.setdefault(device.node_id, device)
+        self.device_rooms = {}
+        for room in self.rooms.values():
+            for device in room.devices:
+                self.device_rooms.setdefault(device.id, room)
+
+    def get_device(self, device_id: int):
+        """Return device by id."""
+        return self.devices.get(device_id)
+
+    def get_device_by_node_id(self, node_id: int):
+        """Return device by zigbee node id."""
+        return self.node_devices.get(node_id)
+
+    def get_room(self, room_id: int):
+        """Return room by id."""
+        return self.rooms.get(room_id)
+
+    def get_room_by_device_id(self, device_id: int):
+        """Return room a device is assigned to."""
+        return self.device_rooms.get(device_id)
+
+
+class WiserNameIndex:
+    """Display names and identifiers of hub devices and rooms.
+
+    Names are built once each time the rooms, devices or device room
+    assignments change rather than on every lookup by an entity.
+    """
+
+    def __init__(self, data) -> None:
+        self._data = data
+        self._signature = None
+        self._names = {}
+        self._identifiers = {}
+        self.builds = 0
+
+    def _get_topology_signature(self) -> tuple:
+        """Return summary of hub data used to build names."""
+        index = self._data.index
+        return (
+            self._data.wiserhub.system.name,
+            tuple(
+                (room.id, room.name, tuple(device.id for device in room.devices))
+                for room in index.rooms.values()
+            ),
+            tuple(
+                (device.id, device.product_type, device.name, device.serial_number)
+                for device in index.devices.values()
+            ),
+        )
+
+    def update(self) -> bool:
+        """Rebuild names if hub topology changed and return True if rebuilt."""
+        signature = self._get_topology_signature()
+        if signature == self._signature:
+            return False
+
+        names = {("device", 0): _build_device_name(self._data, 0)}
+        for device in self._data.index.devices.values():
+            names[("device", device.id)] = _build_device_name(self._data, device.id)
+        for room in self._data.index.rooms.values():
+            names[("room", room.id)] = _build_device_name(self._data, room.id, "room")
+
+        system_name = self._data.wiserhub.system.name
+        self._names = names
+        self._identifiers = {
+            key: f"{system_name} {name}" for key, name in names.items()
+        }
+        self._signature = signature
+        self.builds += 1
+        _LOGGER.debug(f"Built names for {len(names)} {system_name} devices and rooms")
+        return True
+
+    def get_name(self, device_id, device_type: str = "device") -> str:
+        """Return display name of device or room."""
+        if self._signature is None:
+            self.update()
+        if (device_type, device_id) in self._names:
+            return self._names[(device_type, device_id)]
+        return _build_device_name(self._data, device_id, device_type)
+
+    def get_identifier(self, device_id, device_type: str = "device") -> str:
+        """Return device registry identifier of device or room."""
+        if self._signature is None:
+            self.update()
+        if (device_type, device_id) in self._identifiers:
+            return self._identifiers[(device_type, device_id)]
+        return (
+            f"{self._data.wiserhub.system.name} {self.get_name(device_id, device_type)}"
+        )
+
+
 def get_device_name(data, device_id, device_type="device"):
+    return data.names.get_name(device_id, device_type)
+
+
+def _build_device_name(data, device_id, device_type="device"):
     if device_type == "device":
-        device = data.wiserhub.devices.get_by_id(device_id)
+        device = data.index.get_device(device_id)
 
         if device_id == 0:
             return f"{ENTITY_PREFIX} HeatHub ({data.wiserhub.system.name})"
 
         if device.product_type == "iTRV":
-            device_room = data.wiserhub.rooms.get_by_device_id(device_id)
+            device_room = data.index.get_room_by_device_id(device_id)
             # If device not allocated to a room return type and id only
             if device_room:
                 # To enable creating seperate devices for multiple TRVs in a room - issue #194
@@ -47,7 +272,7 @@ def get_device_name(data, device_id, device_type="device"):
             return f"{ENTITY_PREFIX} {device.product_type} {device.id}"
 
         if device.product_type == "RoomStat":
-            device_room = data.wiserhub.rooms.get_by_device_id(device_id)
+            device_room = data.index.get_room_by_device_id(device_id)
             # If device not allocated to a room return type and id only
             if device_room:
                 return f"{ENTITY_PREFIX} {device.product_type} {device_room.name}"
@@ -57,7 +282,7 @@ def get_device_name(data, device_id, device_type="device"):
             return f"{ENTITY_PREFIX} {device.name}"
 
         if device.product_type == "HeatingActuator":
-            device_room = data.wiserhub.rooms.get_by_device_id(device_id)
+            device_room = data.index.get_room_by_device_id(device_id)
             # If device not allocated to a room return type and id only
             if device_room:
                 # To enable creating seperate devices for multiple Heating Actuators in a room
@@ -66,7 +291,7 @@ def get_device_name(data, device_id, device_type="device"):
                     # 1 is lowest device id, 2 next lowest etc
                     ha_index = device_room.heating_actuator_ids.index(device.id) + 1
                     return f"{ENTITY_PREFIX} {device.product_type} {device_room.name}-{ha_index}"
-                device_room = data.wiserhub.rooms.get_by_device_id(device_id)
+                device_room = data.index.get_room_by_device_id(device_id)
                 return f"{ENTITY_PREFIX} {device.product_type} {device_room.name}"
             return f"{ENTITY_PREFIX} {device.product_type} {device.id}"
 
@@ -80,7 +305,7 @@ def get_device_name(data, device_id, device_type="device"):
             return f"{ENTITY_PREFIX} {device.name}"
 
         if device.product_type in ["Shutter", "OnOffLight", "DimmableLight"]:
-            device_room = data.wiserhub.rooms.get_by_device_id(device_id)
+            device_room = data.index.get_room_by_device_id(device_id)
             # If device not allocated to a room return type and id only
             if device_room:
                 return f"{ENTITY_PREFIX} {device.product_type} {device_room.name} {device.name}"
@@ -89,7 +314,7 @@ def get_device_name(data, device_id, device_type="device"):
         return f"{ENTITY_PREFIX} {device.serial_number}"
 
     elif device_type == "room":
-        room = data.wiserhub.rooms.get_by_id(device_id)
+        room = data.index.get_room(device_id)
         return f"{ENTITY_PREFIX} {room.name}"
 
     else:
@@ -97,9 +322,7 @@ def get_device_name(data, device_id, device_type="device"):
 
 
 def get_identifier(data, device_id, device_type="device"):
-    return (
-        f"{data.wiserhub.system.name} {get_device_name(data, device_id, device_type)}"
-    )
+    return data.names.get_identifier(device_id, device_type)
 
 
 def get_unique_id(data, device_type, entity_type, device_id):
@@ -107,7 +330,7 @@ def get_unique_id(data, device_type, entity_type, device_id):
 
 
 def get_room_name(data, room_id):
-    return f"{ENTITY_PREFIX} {data.wiserhub.rooms.get_by_id(room_id).name}"
+    return data.names.get_name(room_id, "room")
 
 
 def get_instance_count(hass: HomeAssistant) -> int:
@@ -119,23 +342,111 @@ def get_instance_count(hass: HomeAssistant) -> int:
     return len(entries)
 
 
-def is_wiser_config_id(hass: HomeAssistant, config_id):
-    entry = [
-        entry
-        for entry in hass.config_entries.async_entries(DOMAIN)
-        if entry.entry_id == config_id
-    ]
-    if entry:
-        return True
-    return False
+class WiserHubRegistry:
+    """Coordinators of loaded hubs by config entry id, hub name and title.
 
+    Kept up to date on setup, options update and unload so services and
+    websocket commands can find a hub without searching all config entries.
+    """
 
-def get_config_entry_id_by_name(hass: HomeAssistant, name) -> str or None:
-    entry = [
-        entry
-        for entry in hass.config_entries.async_entries(DOMAIN)
-        if entry.title == name
-    ]
-    if entry:
-        return entry[0].entry_id
-    return None
+    def __init__(self) -> None:
+        self._coordinators = {}
+        self._entry_ids = {}
+
+    @callback
+    def async_add(self, config_entry: ConfigEntry, coordinator) -> None:
+        """Add or update hub for config entry."""
+        self.async_remove(config_entry.entry_id)
+        self._coordinators[config_entry.entry_id] = coordinator
+        self._entry_ids[config_entry.entry_id] = config_entry.entry_id
+        self._entry_ids.setdefault(
+            coordinator.wiserhub.system.name, config_entry.entry_id
+        )
+        self._entry_ids.setdefault(config_entry.title, config_entry.entry_id)
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Remove hub for config entry."""
+        self._coordinators.pop(entry_id, None)
+        self._entry_ids = {
+            key: value for key, value in self._entry_ids.items() if value != entry_id
+        }
+
+    def get(self, hub: str | None = None):
+        """Return coordinator by config entry id, hub name or title.
+
+        If hub is not given the first loaded hub is returned.
+        """
+        if not hub:
+            return next(iter(self._coordinators.values()), None)
+        return self._coordinators.get(self._entry_ids.get(hub))
+
+    @property
+    def count(self) -> int:
+        """Return number of loaded hubs."""
+        return len(self._coordinators)
+
+    @property
+    def hub_names(self) -> list[str]:
+        """Return names of loaded hubs."""
+        return [
+            coordinator.wiserhub.system.name
+            for coordinator in self._coordinators.values()
+        ]
+
+
+@callback
+def get_hub_registry(hass: HomeAssistant) -> WiserHubRegistry:
+    """Return registry of loaded hubs."""
+    return hass.data.setdefault(HUB_REGISTRY, WiserHubRegistry())
+
+
+class WiserEntityResolver:
+    """Entities by entity id for service calls and websocket commands.
+
+    Entities are cached when first found.  The cache is cleared when the
+    entity registry changes or a hub is unloaded.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._entities = {}
+        self._option_maps = {}
+
+    def get_entity(self, entity_id: str):
+        """Return entity object for entity id."""
+        if (entity := self._entities.get(entity_id)) is not None:
+            return entity
+
+        domain = entity_id.split(".", 1)[0]
+        entity_comp = self._hass.data.get("entity_components", {}).get(domain)
+        entity = entity_comp.get_entity(entity_id) if entity_comp else None
+        if entity is not None:
+            self._entities[entity_id] = entity
+        return entity
+
+    def get_option(self, entity, option: str) -> str | None:
+        """Return entity option matching option ignoring case."""
+        options = entity.options
+        option_map = self._option_maps.get(entity.entity_id)
+        # Rebuild map if entity has new options list
+        if option_map is None or option_map[0] is not options:
+            option_map = (options, {value.lower(): value for value in options})
+            self._option_maps[entity.entity_id] = option_map
+        return option_map[1].get(option.lower())
+
+    @callback
+    def async_clear(self, event: Event | None = None) -> None:
+        """Clear cached entities."""
+        self._entities = {}
+        self._option_maps = {}
+
+
+@callback
+def get_entity_resolver(hass: HomeAssistant) -> WiserEntityResolver:
+    """Return entity resolver, creating it on first use."""
+    if ENTITY_RESOLVER not in hass.data:
+        resolver = WiserEntityResolver(hass)
+        hass.bus.async_listen(EVENT_ENTITY_REGISTRY_UPDATED, resolver.async_clear)
+        hass.data[ENTITY_RESOLVER] = resolver
+    return hass.data[ENTITY_RESOLVER]
@@ -0,0 +1,188 @@
+from array import array
+import math
+import time
+
+from aioWiserHeatAPI.wiserhub import TEMP_OFF
+
+ROOM_FIELDS = [
+    "current_temperature",
+    "target_temperature",
+    "percentage_demand",
+    "humidity",
+]
+DEVICE_FIELDS = ["signal_strength"]
+
+
+class WiserTimeSeries:
+    """Fixed size ring buffer of samples of a set of values.
+
+    Times are held in an unsigned 32 bit array and each value in a 32 bit
+    float array, so a sample costs 4 bytes plus 4 bytes per value.  Missing
+    values are held as NaN.
+    """
+
+    def __init__(self, fields: list[str], capacity: int) -> None:
+        self.fields = fields
+        self.capacity = capacity
+        self._times = array("I", [0]) * capacity
+        self._values = {field: array("f", [math.nan]) * capacity for field in fields}
+        self._next = 0
+        self.count = 0
+
+    @property
+    def last_time(self) -> int | None:
+        """Return time of most recent sample."""
+        return self._times[self._next - 1] if self.count else None
+
+    def add(self, timestamp: int, values: dict, replace_last: bool = False) -> None:
+        """Add sample, or replace most recent sample, overwriting the oldest if full."""
+        if replace_last and self.count:
+            index = self._next - 1
+        else:
+            index = self._next
+            self._next = (self._next + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+        self._times[index] = timestamp
+        for field in self.fields:
+            value = values.get(field)
+            self._values[field][index] = math.nan if value is None else value
+
+    def _indexes(self, start: int) -> list[int]:
+        """Return buffer indexes of samples from start in time order."""
+        first = (self._next - self.count) % self.capacity
+        indexes = [(first + offset) % self.capacity for offset in range(self.count)]
+        return [index for index in indexes if self._times[index] >= start]
+
+    def get(self, start: int, points: int) -> dict:
+        """Return samples from start averaged into at most points buckets."""
+        indexes = self._indexes(start)
+        bucket_size = max(math.ceil(len(indexes) / points), 1) if points else 1
+        buckets = [
+            indexes[offset : offset + bucket_size]
+            for offset in range(0, len(indexes), bucket_size)
+        ]
+
+        series = {"timestamps": [self._times[bucket[-1]] for bucket in buckets]}
+        for field in self.fields:
+            values = self._values[field]
+            series[field] = []
+            for bucket in buckets:
+                bucket_values = [
+                    values[index] for index in bucket if not math.isnan(values[index])
+                ]
+                series[field].append(
+                    round(sum(bucket_values) / len(bucket_values), 1)
+                    if bucket_values
+                    else None
+                )
+        return series
+
+    @property
+    def nbytes(self) -> int:
+        """Return memory used by sample arrays in bytes."""
+        return sum(
+            buffer.itemsize * len(buffer)
+            for buffer in [self._times, *self._values.values()]
+        )
+
+
+class WiserHistory:
+    """Recent values of rooms and devices at poll resolution.
+
+    Rooms keep current and target temperature, percentage demand and
+    humidity and devices keep signal strength, so cards can show recent
+    history without querying the recorder.  Buffers are sized for the
+    window at one sample per sample interval.  Later polls in the same
+    interval, such as refreshes after commands, replace its sample.
+
+    Memory is allocated when a room or device is first seen.  At the
+    default 24 hour window and 30s sample interval a room uses 2880
+    samples of 20 bytes, about 56KB, and a device 8 bytes a sample, about
+    23KB.
+    """
+
+    def __init__(self, window: float, sample_interval: int) -> None:
+        self.sample_interval = sample_interval
+        self.window = window
+        self.series: dict[tuple, WiserTimeSeries] = {}
+
+    @property
+    def capacity(self) -> int:
+        """Return number of samples held for the window."""
+        return math.ceil(self.window * 3600 / self.sample_interval)
+
+    def set_window(self, window: float) -> None:
+        """Set history window in hours, clearing history if it has changed."""
+        if window != self.window:
+            self.window = window
+            self.series = {}
+
+    def _add(self, key: tuple, fields: list[str], timestamp: int, values: dict):
+        """Add sample to series for key."""
+        if key not in self.series:
+            self.series[key] = WiserTimeSeries(fields, self.capacity)
+        series = self.series[key]
+        last_time = series.last_time
+        series.add(
+            timestamp,
+            values,
+            last_time is not None
+            and last_time // self.sample_interval == timestamp // self.sample_interval,
+        )
+
+    def update(self, data) -> None:
+        """Add current values of rooms and devices from coordinator data."""
+        if not self.capacity:
+            return
+        timestamp = int(time.time())
+        for room in data.wiserhub.rooms.all:
+            if not room.devices:
+                continue
+            roomstat = (
+                data.index.get_device(room.roomstat_id) if room.roomstat_id else None
+            )
+            self._add(
+                ("room", room.id),
+                ROOM_FIELDS,
+                timestamp,
+                {
+                    "current_temperature": room.current_temperature,
+                    "target_temperature": (
+                        None
+                        if room.current_target_temperature == TEMP_OFF
+                        else room.current_target_temperature
+                    ),
+                    "percentage_demand": room.percentage_demand,
+                    "humidity": roomstat.current_humidity if roomstat else None,
+                },
+            )
+
+        for device in data.wiserhub.devices.all:
+            self._add(
+                ("device", device.id),
+                DEVICE_FIELDS,
+                timestamp,
+                {"signal_strength": device.signal.controller_signal_strength},
+            )
+
+    def get(
+        self, series_type: str, series_id: int, hours: float, points: int
+    ) -> dict | None:
+        """Return downsampled history of a room or device for last hours."""
+        series = self.series.get((series_type, series_id))
+        if series is None:
+            return None
+        return series.get(int(time.time() - hours * 3600), points)
+
+    @property
+    def stats(self) -> dict:
+        """Return number of series, samples and memory used."""
+        return {
+            "window": self.window,
+            "sample_interval": self.sample_interval,
+            "capacity": self.capacity,
+            "series": len(self.series),
+            "samples": sum(series.count for series in self.series.values()),
+            "bytes": sum(series.nbytes for series in self.series.values()),
+        }
@@ -11,7 +11,13 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DATA, DOMAIN, MANUFACTURER_SCHNEIDER
-from .helpers import get_device_name, get_identifier, get_unique_id, hub_error_handler
+from .helpers import (
+    get_device_name,
+    get_identifier,
+    get_unique_id,
+    hub_error_handler,
+    WiserCachedAttributesEntity,
+)
 from .schedules import WiserScheduleEntity
 
 MANUFACTURER = MANUFACTURER_SCHNEIDER
@@ -34,15 +40,29 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
         async_add_entities(wiser_lights, True)
 
 
-class WiserLight(CoordinatorEntity, LightEntity, WiserScheduleEntity):
+class WiserLight(
+    CoordinatorEntity, LightEntity, WiserScheduleEntity, WiserCachedAttributesEntity
+):
     """WiserLight ClientEntity Object."""
 
+    # Identification does not change so is not stored in the recorder
+    _unrecorded_attributes = frozenset(
+        {
+            "model",
+            "product_type",
+            "product_identifier",
+            "product_model",
+            "serial_number",
+            "firmware",
+        }
+    )
+
     def __init__(self, coordinator, light_id) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, ("device", light_id))
         self._data = coordinator
         self._device_id = light_id
-        self._device = self._data.wiserhub.devices.lights.get_by_id(self._device_id)
+        self._device = self._data.index.get_device(self._device_id)
         self._schedule = self._device.schedule
         _LOGGER.debug(f"{self._data.wiserhub.system.name} {self.name} initialise")
 
@@ -50,12 +70,31 @@ class WiserLight(CoordinatorEntity, LightEntity, WiserScheduleEntity):
         _LOGGER.debug(f"Hub update initiated by {self.name}")
         if delay:
             await asyncio.sleep(delay)
-        await self._data.async_refresh()
+        await self._data.async_request_hub_refresh()
+
+    @callback
+    def _async_set_optimistic_value(self, attribute: str, value) -> None:
+        """Show expected value of a light attribute until read from the hub."""
+        self._data.optimistic.async_set(
+            self.coordinator_context,
+            self.unique_id,
+            attribute,
+            value,
+            lambda: getattr(
+                self._data.index.get_device(self._device_id),
+                attribute,
+            ),
+        )
+
+    @staticmethod
+    def _is_converged(light) -> bool:
+        """Return True if light has reached its target state."""
+        return light.current_state == light.target_state
 
     @callback
     def _handle_coordinator_update(self) -> None:
         _LOGGER.debug(f"{self.name} updating")
-        self._device = self._data.wiserhub.devices.lights.get_by_id(self._device_id)
+        self._device = self._data.index.get_device(self._device_id)
         self._schedule = self._device.schedule
         self.async_write_ha_state()
 
@@ -66,7 +105,9 @@ class WiserLight(CoordinatorEntity, LightEntity, WiserScheduleEntity):
     @property
     def is_on(self):
         """Return the boolean response if the node is on."""
-        return self._device.is_on
+        return self._data.optimistic.get(
+            self.coordinator_context, self.unique_id, "is_on", self._device.is_on
+        )
 
     @property
     def name(self):
@@ -92,31 +133,41 @@ class WiserLight(CoordinatorEntity, LightEntity, WiserScheduleEntity):
             "name": get_device_name(self._data, self._device_id),
             "identifiers": {(DOMAIN, get_identifier(self._data, self._device_id))},
             "manufacturer": MANUFACTURER,
-            "model": self._data.wiserhub.devices.get_by_id(self._device_id).model,
+            "model": self._data.index.get_device(self._device_id).model,
             "sw_version": self._device.firmware_version,
             "via_device": (DOMAIN, self._data.wiserhub.system.name),
         }
 
+    def _build_identification_attributes(self) -> dict:
+        """Return light identification and firmware attributes."""
+        return {
+            "name": self._device.name,
+            "model": self._device.model,
+            "product_type": self._device.product_type,
+            "product_identifier": self._device.product_identifier,
+            "product_model": self._device.product_model,
+            "serial_number": self._device.serial_number,
+            "firmware": self._device.firmware_version,
+        }
+
     @property
     def extra_state_attributes(self):
         """Return state attributes."""
         attrs = {}
         # Room
-        if self._data.wiserhub.rooms.get_by_id(self._device.room_id) is not None:
-            attrs["room"] = self._data.wiserhub.rooms.get_by_id(
-                self._device.room_id
-            ).name
+        if self._data.index.get_room(self._device.room_id) is not None:
+            attrs["room"] = self._data.index.get_room(self._device.room_id).name
         else:
             attrs["room"] = "Unassigned"
 
         # Identification
-        attrs["name"] = self._device.name
-        attrs["model"] = self._device.model
-        attrs["product_type"] = self._device.product_type
-        attrs["product_identifier"] = self._device.product_identifier
-        attrs["product_model"] = self._device.product_model
-        attrs["serial_number"] = self._device.serial_number
-        attrs["firmware"] = self._device.firmware_version
+        attrs.update(
+            self._get_cached_attributes(
+                "identification",
+                self._build_identification_attributes,
+                (self.coordinator_context,),
+            )
+        )
 
         # Settings
         attrs["is_dimmable"] = self._device.is_dimmable
@@ -149,11 +200,17 @@ class WiserLight(CoordinatorEntity, LightEntity, WiserScheduleEntity):
             _LOGGER.debug(
                 f"Setting brightness of {self.name} to {round((brightness / 255) * 100)}%"
             )
-            await self._device.set_current_percentage(round((brightness / 255) * 100))
+            percentage = round((brightness / 255) * 100)
+            await self._device.set_current_percentage(percentage)
+            self._async_set_optimistic_value("current_percentage", percentage)
+            if percentage:
+                self._async_set_optimistic_value("is_on", True)
         else:
             _LOGGER.debug(f"Turning on {self.name}")
             await self._device.turn_on()
-        await self.async_force_update(2)
+            self._async_set_optimistic_value("is_on", True)
+        self.async_write_ha_state()
+        self._data.async_track_convergence("light", self._device_id, self._is_converged)
         return True
 
     @hub_error_handler
@@ -161,7 +218,9 @@ class WiserLight(CoordinatorEntity, LightEntity, WiserScheduleEntity):
         """Turn light off."""
         _LOGGER.debug(f"Turning off {self.name}")
         await self._device.turn_off()
-        await self.async_force_update(2)
+        self._async_set_optimistic_value("is_on", False)
+        self.async_write_ha_state()
+        self._data.async_track_convergence("light", self._device_id, self._is_converged)
         return True
 
 
@@ -172,10 +231,24 @@ class WiserDimmableLight(WiserLight):
     def supported_color_modes(self):
         return {ColorMode.BRIGHTNESS}
 
+    @staticmethod
+    def _is_converged(light) -> bool:
+        """Return True if light has reached its target state and brightness."""
+        return (
+            light.current_state == light.target_state
+            and light.current_percentage == light.target_percentage
+        )
+
     @property
     def brightness(self):
         """Return the brightness of this light between 0..100."""
-        return round((self._device.current_percentage / 100) * 255)
+        current_percentage = self._data.optimistic.get(
+            self.coordinator_context,
+            self.unique_id,
+            "current_percentage",
+            self._device.current_percentage,
+        )
+        return round((current_percentage / 100) * 255)
 
     @property
     def extra_state_attributes(self):
@@ -0,0 +1,133 @@
+from collections import deque
+import math
+import time
+
+
+class WiserRingBuffer:
+    """Recent values of a measurement with rolling percentiles."""
+
+    def __init__(self, size: int) -> None:
+        self._values = deque(maxlen=size)
+
+    def add(self, value: float) -> None:
+        """Add value, replacing the oldest value if buffer is full."""
+        self._values.append(value)
+
+    @property
+    def last(self) -> float | None:
+        """Return most recent value."""
+        return self._values[-1] if self._values else None
+
+    def percentile(self, percent: float) -> float | None:
+        """Return nearest rank percentile of buffered values."""
+        if not self._values:
+            return None
+        values = sorted(self._values)
+        return values[max(math.ceil(percent / 100 * len(values)) - 1, 0)]
+
+    @property
+    def as_dict(self) -> dict:
+        """Return last value and percentiles as a dict."""
+        return {
+            "last": self.last,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "samples": len(self._values),
+        }
+
+
+class WiserPollMetrics:
+    """Phase timings and payload sizes of hub polls.
+
+    Times are in ms and sizes in bytes.  Requests made while a poll is
+    running are added to the poll totals so hub response time can be
+    compared with the time spent decoding, building api objects and
+    updating entities.
+    """
+
+    PHASES = ["http", "decode", "build", "fan_out", "total"]
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self.phases = {phase: WiserRingBuffer(size) for phase in self.PHASES}
+        self.payload = WiserRingBuffer(size)
+        self.lag = WiserRingBuffer(size)
+        self.endpoints = {}
+        self.endpoint_payloads = {}
+        self._poll = None
+
+    def start_poll(self) -> None:
+        """Start totals for a poll."""
+        self._poll = {"start": time.monotonic(), "http": 0, "decode": 0, "bytes": 0}
+
+    def add_request(
+        self,
+        endpoint: str,
+        http_time: float,
+        decode_time: float,
+        size: int,
+        is_poll: bool,
+    ) -> None:
+        """Add timings and payload size of a hub request."""
+        self.endpoints.setdefault(endpoint, WiserRingBuffer(self._size)).add(
+            round(http_time * 1000, 1)
+        )
+        self.endpoint_payloads.setdefault(endpoint, WiserRingBuffer(self._size)).add(
+            size
+        )
+        if is_poll and self._poll:
+            self._poll["http"] += http_time
+            self._poll["decode"] += decode_time
+            self._poll["bytes"] += size
+
+    def add_build(self, build_time: float) -> None:
+        """Add time taken to build api objects in this poll."""
+        if self._poll:
+            self._poll["build"] = build_time
+
+    def end_read(self) -> None:
+        """Mark poll as read and built so it ends with the entity fan out."""
+        if self._poll:
+            self._poll["read"] = True
+
+    @property
+    def awaiting_fan_out(self) -> bool:
+        """Return True if a successful poll is waiting for entity fan out."""
+        return self._poll is not None and self._poll.get("read", False)
+
+    def end_poll(self) -> None:
+        """Add poll totals to the phase buffers.
+
+        Called before the entity fan out so metric sensors show this poll.
+        The total is the time until the data is ready for entities and the
+        fan out time is added afterwards by add_fan_out.
+        """
+        if not self._poll:
+            return
+        poll = self._poll
+        self._poll = None
+        for phase in ["http", "decode", "build"]:
+            self.phases[phase].add(round(poll.get(phase, 0) * 1000, 1))
+        self.phases["total"].add(round((time.monotonic() - poll["start"]) * 1000, 1))
+        self.payload.add(poll["bytes"])
+
+    def add_fan_out(self, fan_out_time: float) -> None:
+        """Add time taken to update entities with a poll."""
+        self.phases["fan_out"].add(round(fan_out_time * 1000, 1))
+
+    @property
+    def stats(self) -> dict:
+        """Return percentiles of each phase, payload and endpoint."""
+        return {
+            "phases": {name: buffer.as_dict for name, buffer in self.phases.items()},
+            "payload": self.payload.as_dict,
+            "scheduling_lag": self.lag.as_dict,
+            "endpoints": {
+                endpoint: {
+                    "http": buffer.as_dict,
+                    "payload": self.endpoint_payloads[endpoint].as_dict,
+                }
+                for endpoint, buffer in self.endpoints.items()
+            },
+        }
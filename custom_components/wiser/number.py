@@ -64,7 +64,7 @@ class WiserAwayModeTempNumber(CoordinatorEntity, NumberEntity):
         _LOGGER.debug(f"Hub update initiated by {self.name}")
         if delay:
             asyncio.sleep(delay)
-        await self._data.async_refresh()
+        await self._data.async_request_hub_refresh()
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -125,14 +125,33 @@ class WiserAwayModeTempNumber(CoordinatorEntity, NumberEntity):
     @property
     def native_value(self):
         """Return device value"""
-        return self._value
+        return self._data.optimistic.get(
+            None, self.unique_id, "away_mode_target_temperature", self._value
+        )
 
     @hub_error_handler
     async def async_set_native_value(self, value: float) -> None:
-        """Set new value."""
-        _LOGGER.debug(f"Setting {self._name} to {value}C")
-        await self._data.wiserhub.system.set_away_mode_target_temperature(value)
-        await self.async_force_update()
+        """Set new value.
+
+        Writes are coalesced so only the last of a burst of changes is sent
+        to the hub.
+        """
+
+        async def async_write_value(value):
+            _LOGGER.debug(f"Setting {self._name} to {value}C")
+            await self._data.wiserhub.system.set_away_mode_target_temperature(value)
+
+        if await self._data.optimistic.async_write(
+            self,
+            None,
+            "away_mode_target_temperature",
+            value,
+            lambda: self._data.wiserhub.system.away_mode_target_temperature,
+            self._data.writes.async_write(
+                (None, "away_mode_target_temperature"), value, async_write_value
+            ),
+        ):
+            await self.async_force_update()
 
 
 class WiserFloorTempSensorNumber(CoordinatorEntity, NumberEntity):
@@ -141,7 +160,7 @@ class WiserFloorTempSensorNumber(CoordinatorEntity, NumberEntity):
         super().__init__(coordinator)
         self._data = coordinator
         self._actuator = actuator
-        self._name = type
+        self._name = device_type
         self._value = getattr(self._actuator.floor_temperature_sensor, self._name)
 
         # Support prior to 2022.7.0 Versions without deprecation warning
@@ -157,7 +176,7 @@ class WiserFloorTempSensorNumber(CoordinatorEntity, NumberEntity):
         _LOGGER.debug(f"Hub update initiated by {self.name}")
         if delay:
             asyncio.sleep(delay)
-        await self._data.async_refresh()
+        await self._data.async_request_hub_refresh()
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -217,11 +236,33 @@ class WiserFloorTempSensorNumber(CoordinatorEntity, NumberEntity):
     @property
     def native_value(self):
         """Return device value"""
-        return self._value
+        return self._data.optimistic.get(
+            ("device", self._actuator.id), self.unique_id, self._name, self._value
+        )
 
     @hub_error_handler
     async def async_set_native_value(self, value: float) -> None:
-        """Set new value."""
-        _LOGGER.debug(f"Setting {self._name} to {value}C")
-        await self._actuator.floor_temperature_sensor.set_temperature_offset(value)
-        await self.async_force_update()
+        """Set new value.
+
+        Writes are coalesced so only the last of a burst of changes is sent
+        to the hub.
+        """
+
+        async def async_write_value(value):
+            _LOGGER.debug(f"Setting {self._name} to {value}C")
+            await self._actuator.floor_temperature_sensor.set_temperature_offset(value)
+
+        if await self._data.optimistic.async_write(
+            self,
+            ("device", self._actuator.id),
+            self._name,
+            value,
+            lambda: getattr(
+                self._data.index.get_device(self._actuator.id).floor_temperature_sensor,
+                self._name,
+            ),
+            self._data.writes.async_write(
+                (("device", self._actuator.id), self._name), value, async_write_value
+            ),
+        ):
+            await self.async_force_update()
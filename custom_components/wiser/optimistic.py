@@ -0,0 +1,147 @@
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.core import callback
+
+from .const import OPTIMISTIC_STATE_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WiserOptimisticState:
+    """Expected results of commands shown before they are read from the hub.
+
+    A value is set when a command succeeds and is returned in place of the
+    api value until a hub read started after the command confirms it.  If
+    the hub does not report the expected value within the timeout the value
+    is dropped, so the entity rolls back to the value read from the hub.
+    Values are held for each entity, as entities of the same room or device
+    can show the same api attribute.
+    """
+
+    def __init__(self) -> None:
+        self._values = {}
+        self.applied = 0
+        self.confirmed = 0
+        self.rolled_back = 0
+
+    @callback
+    def async_set(
+        self,
+        context: tuple | None,
+        unique_id: str,
+        attribute: str,
+        value: Any,
+        get_hub_value: Callable[[], Any],
+    ) -> None:
+        """Set expected value for an entity attribute after a command.
+
+        context is the room or device of the entity, or None for the hub.
+        get_hub_value is called after each hub read to get the value reported
+        by the hub for comparison.
+        """
+        self._values[(context, unique_id, attribute)] = (
+            value,
+            get_hub_value,
+            datetime.now(),
+        )
+        self.applied += 1
+
+    @callback
+    def async_clear(
+        self, context: tuple | None, unique_id: str, attribute: str, value: Any
+    ) -> None:
+        """Clear expected value for an entity attribute after a failed command.
+
+        The value is kept if a newer command has since replaced it.
+        """
+        key = (context, unique_id, attribute)
+        if key in self._values and self._values[key][0] == value:
+            del self._values[key]
+
+    async def async_write(
+        self,
+        entity,
+        context: tuple | None,
+        attribute: str,
+        value: Any,
+        get_hub_value: Callable[[], Any],
+        write: Awaitable[bool],
+    ) -> bool:
+        """Show expected value for an entity attribute while it is written.
+
+        write is the hub write, which returns False if it was not sent.  If
+        it raises or is cancelled the expected value is cleared so the entity
+        shows the hub value again.
+        """
+        self.async_set(context, entity.unique_id, attribute, value, get_hub_value)
+        entity.async_write_ha_state()
+        failed = True
+        try:
+            sent = await write
+            failed = False
+        finally:
+            if failed:
+                self.async_clear(context, entity.unique_id, attribute, value)
+                entity.async_write_ha_state()
+        return sent
+
+    def get(
+        self, context: tuple | None, unique_id: str, attribute: str, hub_value: Any
+    ) -> Any:
+        """Return expected value if set or the hub value."""
+        if (context, unique_id, attribute) in self._values:
+            return self._values[(context, unique_id, attribute)][0]
+        return hub_value
+
+    def reconcile(self, read_time: datetime, contexts: set | None = None) -> set:
+        """Compare expected values with a hub read started at read_time.
+
+        If contexts is given only values for those contexts are compared.
+        Returns contexts of values that were confirmed or rolled back so
+        their entities can be updated.
+        """
+        reconciled = set()
+        for key, (value, get_hub_value, set_time) in list(self._values.items()):
+            if set_time > read_time or (
+                contexts is not None and key[0] not in contexts
+            ):
+                continue
+
+            try:
+                hub_value = get_hub_value()
+            except (AttributeError, KeyError, TypeError):
+                # Object no longer on hub
+                hub_value = None
+
+            if hub_value == value:
+                self.confirmed += 1
+            elif datetime.now() - set_time < timedelta(
+                seconds=OPTIMISTIC_STATE_TIMEOUT
+            ):
+                continue
+            else:
+                self.rolled_back += 1
+                _LOGGER.warning(
+                    f"Hub did not confirm {key[2]} of {value} for {key[1]}. "
+                    f"Reverting to hub value of {hub_value}"
+                )
+            del self._values[key]
+            reconciled.add(key[0])
+        return reconciled
+
+    def clear(self) -> None:
+        """Clear all expected values."""
+        self._values = {}
+
+    @property
+    def stats(self) -> dict:
+        """Return optimistic state statistics."""
+        return {
+            "applied": self.applied,
+            "confirmed": self.confirmed,
+            "rolled_back": self.rolled_back,
+            "pending": len(self._values),
+        }
@@ -0,0 +1,136 @@
+from datetime import date, datetime, timedelta
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    RUNTIME_DAYS,
+    RUNTIME_MAX_GAP,
+    RUNTIME_STORE,
+    RUNTIME_STORE_SAVE_DELAY,
+    RUNTIME_STORE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400
+
+
+class WiserRuntimeAccumulator:
+    """Heating on time of a room, heating channel or hot water by day.
+
+    On time is added between polls while heating is on, split at midnight
+    so each local day has its own total.  Time across a gap in polling
+    longer than the maximum gap is not counted as the state is not known.
+    """
+
+    def __init__(self, days: dict | None = None) -> None:
+        # Seconds on for each day keyed by date ordinal
+        self.days = days or {}
+        self.is_on = False
+        self._last_update: datetime | None = None
+
+    def update(self, is_on: bool, now: datetime) -> None:
+        """Add on time since last update and set current state."""
+        if (
+            self.is_on
+            and self._last_update
+            and (now - self._last_update).total_seconds() <= RUNTIME_MAX_GAP
+        ):
+            self._add(self._last_update, now)
+        self.is_on = is_on
+        self._last_update = now
+
+        # Remove days older than those kept
+        oldest = now.date().toordinal() - RUNTIME_DAYS + 1
+        for day in [day for day in self.days if day < oldest]:
+            del self.days[day]
+
+    def _add(self, start: datetime, end: datetime) -> None:
+        """Add on time between start and end to each day."""
+        while start < end:
+            next_day = dt_util.start_of_local_day(start.date() + timedelta(days=1))
+            period_end = min(end, next_day)
+            day = start.date().toordinal()
+            self.days[day] = (
+                self.days.get(day, 0) + (period_end - start).total_seconds()
+            )
+            start = period_end
+
+    def on_time(self, day: date) -> float:
+        """Return seconds on for day."""
+        return self.days.get(day.toordinal(), 0)
+
+    def stats(self, now: datetime) -> dict:
+        """Return on time in hours and duty cycle % for today, yesterday and 7 days."""
+        today = now.date()
+        today_seconds = self.on_time(today)
+        yesterday_seconds = self.on_time(today - timedelta(days=1))
+        week_seconds = sum(
+            self.on_time(today - timedelta(days=day)) for day in range(7)
+        )
+        elapsed_today = max(
+            (now - dt_util.start_of_local_day(today)).total_seconds(), 1
+        )
+        return {
+            "today": round(today_seconds / 3600, 2),
+            "yesterday": round(yesterday_seconds / 3600, 2),
+            "last_7_days": round(week_seconds / 3600, 2),
+            "duty_cycle_today": round(today_seconds / elapsed_today * 100, 1),
+            "duty_cycle_yesterday": round(yesterday_seconds / SECONDS_PER_DAY * 100, 1),
+            "duty_cycle_7_days": round(
+                week_seconds / (6 * SECONDS_PER_DAY + elapsed_today) * 100, 1
+            ),
+        }
+
+
+class WiserRuntimeTracker:
+    """Heating runtime of the rooms, heating channels and hot water of a hub.
+
+    Accumulators are updated from the heating states of each poll and their
+    daily totals are stored, so runtime sensors survive restarts without
+    querying the recorder.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self.accumulators: dict[str, WiserRuntimeAccumulator] = {}
+        self._store = Store(hass, RUNTIME_STORE_VERSION, f"{RUNTIME_STORE}_{entry_id}")
+
+    async def async_load(self) -> None:
+        """Load stored daily totals."""
+        stored_data = await self._store.async_load()
+        if not stored_data:
+            return
+        for key, days in stored_data.items():
+            self.accumulators[key] = WiserRuntimeAccumulator(
+                {int(day): seconds for day, seconds in days.items()}
+            )
+        _LOGGER.debug(f"Loaded stored heating runtime for {len(stored_data)} items")
+
+    def get(self, key: str) -> WiserRuntimeAccumulator:
+        """Return accumulator for key."""
+        if key not in self.accumulators:
+            self.accumulators[key] = WiserRuntimeAccumulator()
+        return self.accumulators[key]
+
+    @callback
+    def async_update(self, states: dict[str, bool]) -> None:
+        """Update accumulators with current heating states."""
+        now = dt_util.now()
+        for key, is_on in states.items():
+            self.get(key).update(is_on, now)
+        self._store.async_delay_save(self._get_stored_data, RUNTIME_STORE_SAVE_DELAY)
+
+    def _get_stored_data(self) -> dict:
+        """Return daily totals to store."""
+        return {
+            key: {str(day): round(seconds) for day, seconds in accumulator.days.items()}
+            for key, accumulator in self.accumulators.items()
+        }
+
+    async def async_save(self) -> None:
+        """Store daily totals now."""
+        if self.accumulators:
+            await self._store.async_save(self._get_stored_data())
@@ -0,0 +1,70 @@
+import asyncio
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import POLL_CONCURRENCY_LIMIT, POLL_SCHEDULER
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WiserPollScheduler:
+    """Spread polls of all hubs evenly across their polling interval.
+
+    Each hub is given a phase within its interval by its position in the
+    list of hubs and polls are scheduled on that phase, so hubs set up at
+    the same time do not all poll and update their entities at once.  The
+    number of hubs reading at the same time is also limited.
+    """
+
+    def __init__(self, max_concurrent_reads: int) -> None:
+        self._coordinators = []
+        self.max_concurrent_reads = max_concurrent_reads
+        self.read_semaphore = asyncio.Semaphore(max_concurrent_reads)
+
+    @callback
+    def async_add(self, coordinator) -> None:
+        """Add hub to be scheduled."""
+        if coordinator not in self._coordinators:
+            self._coordinators.append(coordinator)
+
+    @callback
+    def async_remove(self, coordinator) -> None:
+        """Remove hub from schedule."""
+        if coordinator in self._coordinators:
+            self._coordinators.remove(coordinator)
+
+    def get_phase(self, coordinator) -> float:
+        """Return hub phase as a fraction of its polling interval."""
+        if coordinator not in self._coordinators:
+            return 0
+        return self._coordinators.index(coordinator) / len(self._coordinators)
+
+    def next_poll_time(self, coordinator, now: float, interval: float) -> float:
+        """Return loop time of the phase slot nearest to one interval from now."""
+        phase = self.get_phase(coordinator) * interval
+        poll_time = round((now + interval - phase) / interval) * interval + phase
+        if poll_time < now + interval / 2:
+            poll_time += interval
+        return poll_time
+
+    @property
+    def stats(self) -> dict:
+        """Return phase of each hub and read limit."""
+        return {
+            "phases": {
+                coordinator.wiserhub.system.name
+                if coordinator.wiserhub.system
+                else coordinator.name: round(self.get_phase(coordinator), 2)
+                for coordinator in self._coordinators
+            },
+            "max_concurrent_reads": self.max_concurrent_reads,
+        }
+
+
+@callback
+def get_poll_scheduler(hass: HomeAssistant) -> WiserPollScheduler:
+    """Return poll scheduler shared by all hubs."""
+    if POLL_SCHEDULER not in hass.data:
+        hass.data[POLL_SCHEDULER] = WiserPollScheduler(POLL_CONCURRENCY_LIMIT)
+    return hass.data[POLL_SCHEDULER]
@@ -27,16 +27,14 @@ class WiserScheduleEntity:
         """Get scheudle type for entity"""
         schedule_type = WiserScheduleTypeEnum.heating
         if hasattr(self, "_device_id"):
-            if self.data.wiserhub.devices.get_by_id(self._device_id).product_type in [
+            if self.data.index.get_device(self._device_id).product_type in [
                 "SmartPlug"
             ]:
                 schedule_type = WiserScheduleTypeEnum.onoff
             else:
                 if expand_level:
                     if (
-                        self.data.wiserhub.devices.get_by_id(
-                            self._device_id
-                        ).product_type
+                        self.data.index.get_device(self._device_id).product_type
                         == "Shutter"
                     ):
                         schedule_type = WiserScheduleTypeEnum.shutters
@@ -48,14 +46,11 @@ class WiserScheduleEntity:
 
     @callback
     async def get_schedule(self, filename: str) -> None:
+        if not self.schedule:
+            raise HomeAssistantError(f"No schedule exists for {self.name}")
         try:
-            if self.schedule:
-                _LOGGER.debug(
-                    f"Saving {self.schedule.name} schedule to file {filename}"
-                )
-                await self.schedule.save_schedule_to_yaml_file(filename)
-            else:
-                _LOGGER.error(f"No schedule exists for {self.name}")
+            _LOGGER.debug(f"Saving {self.schedule.name} schedule to file {filename}")
+            await self.schedule.save_schedule_to_yaml_file(filename)
         except Exception as ex:
             raise HomeAssistantError(
                 f"Error saving {self.schedule.name} schedule to file {filename}. {ex}"
@@ -69,7 +64,7 @@ class WiserScheduleEntity:
                     f"Setting {self.schedule.name} schedule from file {filename}"
                 )
                 await self.schedule.set_schedule_from_yaml_file(filename)
-                await self.data.async_refresh()
+                await self.data.async_request_hub_refresh()
         except WiserScheduleError as ex:
             raise HomeAssistantError(ex)
         except Exception as ex:
@@ -85,7 +80,7 @@ class WiserScheduleEntity:
                     f"Setting {self.schedule.name} schedule from schedule data.\n{schedule}"
                 )
                 await self.schedule.set_schedule_from_yaml_data(schedule)
-                await self.data.async_refresh()
+                await self.data.async_request_hub_refresh()
         except WiserScheduleError as ex:
             raise HomeAssistantError(ex)
         except Exception as ex:
@@ -106,10 +101,10 @@ class WiserScheduleEntity:
                             entity_name = self.room.name
                             to_id = to_entity.room.id
                         else:
-                            to_entity_name = to_entity.data.wiserhub.devices.get_by_id(
+                            to_entity_name = to_entity.data.index.get_device(
                                 to_entity.device.id
                             ).name
-                            entity_name = self.data.wiserhub.devices.get_by_id(
+                            entity_name = self.data.index.get_device(
                                 self.device.id
                             ).name
                             to_id = to_entity.device.device_type_id
@@ -118,24 +113,24 @@ class WiserScheduleEntity:
                             f"Assigning {entity_name} schedule to {to_entity_name}"
                         )
                         await self.schedule.assign_schedule(to_id)
-                        await self.data.async_refresh()
+                        await self.data.async_request_hub_refresh()
                     except Exception as ex:  # pylint: disable=broad-exception-caught
-                        _LOGGER.error(
+                        raise HomeAssistantError(
                             f"Unknown error assigning {entity_name} schedule to {to_entity_name}. {ex}"
                         )
                 else:
-                    _LOGGER.error(
+                    raise HomeAssistantError(
                         "Error assigning schedule.  You must assign schedules of the same type"
                     )
             else:
-                _LOGGER.error(
+                raise HomeAssistantError(
                     "Error assigning schedule. You cannot assign schedules across different Wiser Hubs"
                 )
         else:
             schedule_entity_name = (
                 self.room.name if hasattr(self, "room") else self.device.name
             )
-            _LOGGER.error(
+            raise HomeAssistantError(
                 f"Error assigning schedule. {schedule_entity_name} has no schedule assigned"
             )
 
@@ -173,13 +168,15 @@ class WiserScheduleEntity:
 
             if schedule:
                 await schedule.assign_schedule(to_id)
-                await self.data.async_refresh()
+                await self.data.async_request_hub_refresh()
             else:
-                _LOGGER.error(
+                raise HomeAssistantError(
                     f"Error assigning schedule to {self.name}. {schedule_type.value} schedule with {schedule_identifier} does not exist"  # noqa: E501
                 )
+        except HomeAssistantError:
+            raise
         except Exception as ex:  # pylint: disable=broad-exception-caught
-            _LOGGER.error(
+            raise HomeAssistantError(
                 f"Error assigning schedule with id {schedule_id} to {self.name}. {ex}"
             )
 
@@ -207,10 +204,10 @@ class WiserScheduleEntity:
                 name,
                 to_id,
             )
-            await self.data.async_refresh()
+            await self.data.async_request_hub_refresh()
 
         except Exception as ex:  # pylint: disable=broad-exception-caught
-            _LOGGER.error(f"Error assigning schedule to {name}. {ex}")
+            raise HomeAssistantError(f"Error assigning schedule to {name}. {ex}")
 
     @callback
     async def copy_schedule(self, to_entity) -> None:
@@ -231,15 +228,15 @@ class WiserScheduleEntity:
                                 await self.schedule.copy_schedule(
                                     to_entity.schedule.id,
                                 )
-                                await self.data.async_refresh()
+                                await self.data.async_request_hub_refresh()
                             except (
                                 Exception  # pylint: disable=broad-exception-caught
                             ) as ex:
-                                _LOGGER.error(
+                                raise HomeAssistantError(
                                     f"Unknown error copying schedule from {self.name} to {to_entity.name}: {ex}"
                                 )
                         else:
-                            _LOGGER.error(
+                            raise HomeAssistantError(
                                 "Error copying schedule.  You cannot copy schedules of different types. "
                                 + f"{self.name} is type {self._schedule.schedule_type}"
                                 + f"{' - ' + self._schedule.schedule_level_type if hasattr(self._schedule,'schedule_level_type') else ''}"  # noqa: E501
@@ -247,17 +244,19 @@ class WiserScheduleEntity:
                                 + f"{' - ' + to_entity.schedule.schedule_level_type if hasattr(to_entity.schedule,'schedule_level_type') else ''}"  # noqa: E501
                             )
                     else:
-                        _LOGGER.error(
+                        raise HomeAssistantError(
                             f"Error copying schedule. {to_entity.name} has no assigned schedule to copy to"
                         )
                 else:
-                    _LOGGER.error(
+                    raise HomeAssistantError(
                         f"Cannot copy schedule to entity {to_entity.name}. Please see wiki for entities to choose"
                     )
             else:
-                _LOGGER.error("You cannot copy schedules across different Wiser Hubs")
+                raise HomeAssistantError(
+                    "You cannot copy schedules across different Wiser Hubs"
+                )
         else:
-            _LOGGER.error(
+            raise HomeAssistantError(
                 f"Error copying schedule. {self.name} has no schedule assigned to copy"
             )
 
@@ -266,4 +265,4 @@ class WiserScheduleEntity:
         """Advance to next schedule setting for room"""
         _LOGGER.debug(f"Advancing room schedule for  {self.room.name}")
         await self.room.schedule_advance()
-        await self._data.async_refresh()
+        await self._data.async_request_hub_refresh()
@@ -0,0 +1,269 @@
+from datetime import datetime, timedelta
+import hashlib
+import json
+import logging
+
+from aioWiserHeatAPI.const import (
+    WISERHUBDOMAIN,
+    WISERHUBNETWORK,
+    WISERHUBOPENTHERM,
+    WISERHUBSCHEDULES,
+    WISERHUBSTATUS,
+)
+from aioWiserHeatAPI.wiserhub import WiserAPI, WiserHubRESTError
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import HUB_DATA_HANDOFF, HUB_DATA_HANDOFF_MAX_AGE
+
+_LOGGER = logging.getLogger(__name__)
+
+HUB_SECTIONS = {
+    "domain": WISERHUBDOMAIN,
+    "network": WISERHUBNETWORK,
+    "schedules": WISERHUBSCHEDULES,
+    "status": WISERHUBSTATUS,
+    "opentherm": WISERHUBOPENTHERM,
+}
+
+# Api raw hub data keys for each section
+RAW_HUB_DATA_SECTIONS = {
+    "domain": "Domain",
+    "network": "Network",
+    "schedules": "Schedule",
+    "status": "Status",
+    "opentherm": "OpenTherm",
+}
+
+# Keys that change on every read and are ignored when comparing sections
+VOLATILE_KEYS = [
+    "UnixTime",
+    "LocalDateAndTime",
+    "uptime",
+    "freeHeap",
+    "lowestFreeHeap",
+]
+
+
+def remove_volatile_keys(data):
+    """Return copy of data without volatile keys."""
+    if isinstance(data, dict):
+        return {
+            key: remove_volatile_keys(value)
+            for key, value in data.items()
+            if key not in VOLATILE_KEYS
+        }
+    if isinstance(data, list):
+        return [remove_volatile_keys(value) for value in data]
+    return data
+
+
+def get_section_data(raw_hub_data: dict) -> dict:
+    """Return api raw hub data keyed by section name."""
+    return {
+        name: raw_hub_data.get(key) or {}
+        for name, key in RAW_HUB_DATA_SECTIONS.items()
+    }
+
+
+@callback
+def async_set_handoff_data(
+    hass: HomeAssistant,
+    host: str,
+    section_data: dict,
+    read_time: datetime | None = None,
+) -> None:
+    """Hold hub data just read for a coordinator about to be set up."""
+    handoff_data = hass.data.setdefault(HUB_DATA_HANDOFF, {})
+    handoff_data[host] = (read_time or datetime.now(), section_data)
+
+
+@callback
+def async_pop_handoff_data(hass: HomeAssistant, host: str) -> dict | None:
+    """Return hub data held for host if recent enough to use as an update."""
+    read_time, section_data = hass.data.get(HUB_DATA_HANDOFF, {}).pop(
+        host, (None, None)
+    )
+    if read_time and datetime.now() - read_time < timedelta(
+        seconds=HUB_DATA_HANDOFF_MAX_AGE
+    ):
+        return section_data
+    return None
+
+
+class WiserHubSection:
+    """Fingerprint, cached data and counters for a hub endpoint section."""
+
+    def __init__(self, name: str, url: str, interval: int = 0) -> None:
+        self.name = name
+        self.url = url
+        self.interval = interval
+        self.data = None
+        self.fingerprint = None
+        self.version = 0
+        self.expires = None
+        self.reads = 0
+        self.unchanged = 0
+        self.cached = 0
+
+    @property
+    def is_due(self) -> bool:
+        """Return True if section should be read from the hub."""
+        return self.data is None or not self.expires or datetime.now() >= self.expires
+
+    def expire(self, expires: datetime | None = None) -> None:
+        """Set section to be read from the hub no later than expires."""
+        expires = expires or datetime.now()
+        if self.expires and expires < self.expires:
+            self.expires = expires
+
+    @property
+    def unchanged_rate(self) -> float:
+        """Return percentage of reads where section was unchanged."""
+        return round(self.unchanged / self.reads * 100, 1) if self.reads else 0
+
+    def update(self, data) -> bool:
+        """Update section fingerprint and return True if section changed."""
+        fingerprint = hashlib.sha1(
+            json.dumps(remove_volatile_keys(data), sort_keys=True).encode()
+        ).hexdigest()
+        self.data = data
+        self.expires = (
+            datetime.now() + timedelta(seconds=self.interval) if self.interval else None
+        )
+        self.reads += 1
+        if fingerprint == self.fingerprint:
+            self.unchanged += 1
+            return False
+        self.fingerprint = fingerprint
+        self.version += 1
+        return True
+
+
+class WiserSectionCache:
+    """Read hub endpoint sections ahead of the api object rebuild.
+
+    The api reads and rebuilds all of its objects in one step, so sections
+    are read here first and compared with the previous read.  The read data
+    is then passed to the api rebuild so each section is only read once.
+    Sections with an interval are only read from the hub when due and their
+    last read data is used in between.
+    """
+
+    def __init__(self, wiserhub: WiserAPI) -> None:
+        self._rest_controller = wiserhub._wiser_rest_controller
+        self._get_hub_data = self._rest_controller._get_hub_data
+        self._rest_controller._get_hub_data = self._async_get_hub_data
+        self._section_data = {}
+        self.sections = {
+            name: WiserHubSection(name, url) for name, url in HUB_SECTIONS.items()
+        }
+
+    async def _async_get_hub_data(
+        self, url: str, raise_for_endpoint_error: bool = True
+    ):
+        """Return section data already read or read from hub."""
+        if url in self._section_data:
+            return self._section_data.pop(url)
+        return await self._get_hub_data(url, raise_for_endpoint_error)
+
+    async def async_read_sections(self, force: bool = False) -> list[str]:
+        """Read due hub sections and return names of changed sections."""
+        self._section_data = {}
+        changed_sections = []
+        for section in self.sections.values():
+            if not force and not section.is_due:
+                section.cached += 1
+                self._section_data[section.url] = section.data
+                continue
+
+            if section.url == WISERHUBOPENTHERM:
+                if (
+                    self._section_data[WISERHUBDOMAIN]
+                    .get("System", {})
+                    .get("OpenThermConnectionStatus", "")
+                    != "Connected"
+                ):
+                    continue
+                data = await self._get_hub_data(section.url, False)
+            elif section.url == WISERHUBSTATUS:
+                try:
+                    data = await self._get_hub_data(section.url)
+                except WiserHubRESTError:
+                    data = {}
+            else:
+                data = await self._get_hub_data(section.url)
+
+            self._section_data[section.url] = data
+            if section.update(data):
+                changed_sections.append(section.name)
+
+        _LOGGER.debug(
+            f"Hub sections read. Changed sections are {', '.join(changed_sections) or 'none'}"
+        )
+        return changed_sections
+
+    def set_intervals(self, intervals: dict) -> None:
+        """Set refresh interval in seconds for each named section."""
+        for name, section in self.sections.items():
+            section.interval = intervals.get(name, 0)
+            if section.interval:
+                section.expire(datetime.now() + timedelta(seconds=section.interval))
+            else:
+                section.expires = None
+
+    def load(self, section_data: dict) -> None:
+        """Set stored section data to be used by the next api rebuild.
+
+        Sections missing from the stored data are given as empty so the api
+        rebuild does not read from the hub.
+        """
+        self._section_data = {
+            section.url: section_data.get(name, {})
+            for name, section in self.sections.items()
+        }
+
+    @property
+    def section_data(self) -> dict:
+        """Return last read data for each section."""
+        return {
+            section.name: section.data
+            for section in self.sections.values()
+            if section.data is not None
+        }
+
+    def update_sections(self, section_data: dict) -> None:
+        """Set fingerprints and cached data from section data read elsewhere."""
+        for name, data in section_data.items():
+            self.sections[name].update(data)
+
+    def get_versions(self, names: tuple[str, ...]) -> tuple[int, ...]:
+        """Return change versions of the named sections."""
+        return tuple(self.sections[name].version for name in names)
+
+    def clear(self) -> None:
+        """Clear any section data not used by the api."""
+        self._section_data = {}
+
+    def expire_section(self, name: str, expires: datetime | None = None) -> None:
+        """Set a section to be read from the hub no later than expires."""
+        self.sections[name].expire(expires)
+
+    def reset(self) -> None:
+        """Clear section data and fingerprints to force next read and rebuild."""
+        self.clear()
+        for section in self.sections.values():
+            section.data = None
+            section.fingerprint = None
+
+    @property
+    def unchanged_rates(self) -> dict:
+        """Return unchanged rate percentage for each section."""
+        return {
+            section.name: section.unchanged_rate for section in self.sections.values()
+        }
+
+    @property
+    def cached_reads(self) -> dict:
+        """Return number of reads served from cached data for each section."""
+        return {section.name: section.cached for section in self.sections.values()}
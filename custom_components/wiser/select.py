@@ -45,9 +45,9 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
 
 
 class WiserSelectEntity(CoordinatorEntity, SelectEntity):
-    def __init__(self, coordinator) -> None:
+    def __init__(self, coordinator, context=None) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context)
         self._data = coordinator
         _LOGGER.debug(f"{self._data.wiserhub.system.name} {self.name} initalise")
 
@@ -55,7 +55,7 @@ class WiserSelectEntity(CoordinatorEntity, SelectEntity):
         _LOGGER.debug(f"Hub update initiated by {self.name}")
         if delay:
             asyncio.sleep(delay)
-        await self._data.async_refresh()
+        await self._data.async_request_hub_refresh()
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -80,7 +80,6 @@ class WiserSelectEntity(CoordinatorEntity, SelectEntity):
         _LOGGER.debug(f"Setting {self.name} to {option}")
         if option in self._options:
             await self.async_set_mode(option)
-            await self.async_force_update()
         else:
             _LOGGER.error(
                 f"{option} is not a valid {self.name}.  Please choose from {self._options}"
@@ -89,6 +88,7 @@ class WiserSelectEntity(CoordinatorEntity, SelectEntity):
     async def async_set_mode(self, option: str) -> None:
         _LOGGER.debug(f"Setting {self.name} mode to {option}")
         await self._device.set_mode(option)
+        await self.async_force_update()
 
     @property
     def unique_id(self):
@@ -142,6 +142,7 @@ class WiserHotWaterModeSelect(WiserSelectEntity, WiserScheduleEntity):
         if self._hotwater.is_override:
             await self._hotwater.cancel_overrides()
         await self._hotwater.set_mode(option)
+        await self.async_force_update()
 
     @property
     def unique_id(self):
@@ -165,8 +166,8 @@ class WiserSmartPlugModeSelect(WiserSelectEntity, WiserScheduleEntity):
     def __init__(self, data, smartplug_id) -> None:
         """Initialize the sensor."""
         self._device_id = smartplug_id
-        super().__init__(data)
-        self._device = self._data.wiserhub.devices.smartplugs.get_by_id(self._device_id)
+        super().__init__(data, ("device", smartplug_id))
+        self._device = self._data.index.get_device(self._device_id)
         self._options = self._device.available_modes
         self._schedule = self._device.schedule
 
@@ -174,7 +175,7 @@ class WiserSmartPlugModeSelect(WiserSelectEntity, WiserScheduleEntity):
     def _handle_coordinator_update(self) -> None:
         """Fetch new state data for the sensor."""
         super()._handle_coordinator_update()
-        self._device = self._data.wiserhub.devices.smartplugs.get_by_id(self._device_id)
+        self._device = self._data.index.get_device(self._device_id)
         self._schedule = self._device.schedule
         self.async_write_ha_state()
 
@@ -183,8 +184,8 @@ class WiserLightModeSelect(WiserSelectEntity, WiserScheduleEntity):
     def __init__(self, data, light_id) -> None:
         """Initialize the sensor."""
         self._device_id = light_id
-        super().__init__(data)
-        self._device = self._data.wiserhub.devices.lights.get_by_id(self._device_id)
+        super().__init__(data, ("device", light_id))
+        self._device = self._data.index.get_device(self._device_id)
         self._options = self._device.available_modes
         self._schedule = self._device.schedule
 
@@ -192,7 +193,7 @@ class WiserLightModeSelect(WiserSelectEntity, WiserScheduleEntity):
     def _handle_coordinator_update(self) -> None:
         """Fetch new state data for the sensor."""
         super()._handle_coordinator_update()
-        self._device = self._data.wiserhub.devices.lights.get_by_id(self._device_id)
+        self._device = self._data.index.get_device(self._device_id)
         self._schedule = self._device.schedule
         self.async_write_ha_state()
 
@@ -201,8 +202,8 @@ class WiserShutterModeSelect(WiserSelectEntity, WiserScheduleEntity):
     def __init__(self, data, shutter_id) -> None:
         """Initialize the sensor."""
         self._device_id = shutter_id
-        super().__init__(data)
-        self._device = self._data.wiserhub.devices.shutters.get_by_id(self._device_id)
+        super().__init__(data, ("device", shutter_id))
+        self._device = self._data.index.get_device(self._device_id)
         self._options = self._device.available_modes
         self._schedule = self._device.schedule
 
@@ -210,6 +211,6 @@ class WiserShutterModeSelect(WiserSelectEntity, WiserScheduleEntity):
     def _handle_coordinator_update(self) -> None:
         """Fetch new state data for the sensor."""
         super()._handle_coordinator_update()
-        self._device = self._data.wiserhub.devices.shutters.get_by_id(self._device_id)
+        self._device = self._data.index.get_device(self._device_id)
         self._schedule = self._device.schedule
         self.async_write_ha_state()
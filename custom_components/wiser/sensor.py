@@ -7,6 +7,7 @@ Angelosantagata@gmail.com
 """
 from datetime import datetime
 import logging
+import time
 
 from aioWiserHeatAPI.const import TEXT_UNKNOWN
 
@@ -23,20 +24,36 @@ from homeassistant.const import (
     PERCENTAGE,
     UnitOfPower,
     UnitOfEnergy,
+    UnitOfTime,
+    UnitOfInformation,
+    EntityCategory,
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from aioWiserHeatAPI.wiserhub import TEMP_OFF
 
 from .const import (
+    CONF_BATTERY_SENSORS,
+    CONF_LTS_SENSORS,
+    CONF_POWER_SENSORS,
+    CONF_RUNTIME_SENSORS,
+    CONF_SIGNAL_SENSORS,
     DATA,
     DOMAIN,
     MANUFACTURER,
     SIGNAL_STRENGTH_ICONS,
     VERSION,
 )
-from .helpers import get_device_name, get_unique_id, get_identifier
+from .breaker import CIRCUIT_CLOSED, CIRCUIT_OPEN
+from .helpers import (
+    WiserCachedAttributesEntity,
+    WiserChangeSuppressedEntity,
+    get_device_name,
+    get_unique_id,
+    get_identifier,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -44,7 +61,10 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entities):
     """Initialize the entry."""
     data = hass.data[DOMAIN][config_entry.entry_id][DATA]  # Get Handler
+    setup_start = time.monotonic()
     wiser_sensors = []
+    enable_lts_sensors = data.entity_options[CONF_LTS_SENSORS]
+    enable_power_sensors = data.entity_options[CONF_POWER_SENSORS]
 
     # Add signal sensors for all devices
     _LOGGER.debug("Setting up Device sensors")
@@ -53,10 +73,11 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
     wiser_sensors.append(WiserDeviceSignalSensor(data, 0, "Controller"))
     if data.wiserhub.devices:
         for device in data.wiserhub.devices.all:
-            wiser_sensors.append(
-                WiserDeviceSignalSensor(data, device.id, device.product_type)
-            )
-            if hasattr(device, "battery"):
+            if data.entity_options[CONF_SIGNAL_SENSORS]:
+                wiser_sensors.append(
+                    WiserDeviceSignalSensor(data, device.id, device.product_type)
+                )
+            if data.entity_options[CONF_BATTERY_SENSORS] and hasattr(device, "battery"):
                 wiser_sensors.append(
                     WiserBatterySensor(data, device.id, sensor_type="Battery")
                 )
@@ -71,6 +92,29 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
         WiserSystemOperationModeSensor(data, sensor_type="Heating Operation Mode")
     )
 
+    # Add command queue diagnostic sensors
+    _LOGGER.debug("Setting up Command Queue sensors")
+    wiser_sensors.extend(
+        [
+            WiserCommandQueueSensor(data, sensor_type="Command Queue Depth"),
+            WiserCommandQueueSensor(data, sensor_type="Command Queue Wait Time"),
+        ]
+    )
+
+    # Add hub connection circuit breaker sensor
+    _LOGGER.debug("Setting up Hub Connection sensor")
+    wiser_sensors.append(WiserCircuitBreakerSensor(data, sensor_type="Hub Connection"))
+
+    # Add poll metrics diagnostic sensors
+    _LOGGER.debug("Setting up Poll Metrics sensors")
+    wiser_sensors.extend(
+        [
+            WiserPollMetricsSensor(data, sensor_type="Poll Time"),
+            WiserPollMetricsSensor(data, sensor_type="Hub Response Time"),
+            WiserPollMetricsSensor(data, sensor_type="Poll Payload Size"),
+        ]
+    )
+
     # Add heating circuit sensor
     if data.wiserhub.heating_channels:
         _LOGGER.debug("Setting up Heating Circuit sensors")
@@ -90,7 +134,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
         )
 
     # Add power sensors for smartplugs
-    if data.wiserhub.devices.smartplugs:
+    if enable_power_sensors and data.wiserhub.devices.smartplugs:
         _LOGGER.debug("Setting up Smart Plug power sensors")
         for smartplug in data.wiserhub.devices.smartplugs.all:
             wiser_sensors.extend(
@@ -101,7 +145,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
             )
 
     # Add power sensors for PTE (v2Hub)
-    if data.wiserhub.devices.power_tags:
+    if enable_power_sensors and data.wiserhub.devices.power_tags:
         for power_tag in data.wiserhub.devices.power_tags.all:
             wiser_sensors.extend(
                 [
@@ -130,36 +174,41 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
             )
 
     # Add LTS sensors - for room temp and target temp
-    _LOGGER.debug("Setting up LTS sensors")
-    for room in data.wiserhub.rooms.all:
-        if room.devices:
-            wiser_sensors.extend(
-                [
-                    WiserLTSTempSensor(data, room.id, sensor_type="current_temp"),
-                    WiserLTSTempSensor(
-                        data, room.id, sensor_type="current_target_temp"
-                    ),
-                    WiserLTSDemandSensor(data, room.id, "room"),
-                ]
-            )
+    if enable_lts_sensors:
+        _LOGGER.debug("Setting up LTS sensors")
+        for room in data.wiserhub.rooms.all:
+            if room.devices:
+                wiser_sensors.extend(
+                    [
+                        WiserLTSTempSensor(data, room.id, sensor_type="current_temp"),
+                        WiserLTSTempSensor(
+                            data, room.id, sensor_type="current_target_temp"
+                        ),
+                        WiserLTSDemandSensor(data, room.id, "room"),
+                    ]
+                )
 
-            if room.roomstat_id:
-                wiser_sensors.append(WiserLTSHumiditySensor(data, room.roomstat_id))
+                if room.roomstat_id:
+                    wiser_sensors.append(WiserLTSHumiditySensor(data, room.roomstat_id))
 
     # Add LTS sensors - for room Power and Energy for heating actuators
     if data.wiserhub.devices.heating_actuators:
         _LOGGER.debug("Setting up Heating Actuator LTS sensors")
         for heating_actuator in data.wiserhub.devices.heating_actuators.all:
-            wiser_sensors.extend(
-                [
-                    WiserLTSPowerSensor(data, heating_actuator.id, sensor_type="Power"),
-                    WiserLTSPowerSensor(
-                        data, heating_actuator.id, sensor_type="Energy"
-                    ),
-                ]
-            )
+            if enable_power_sensors:
+                wiser_sensors.extend(
+                    [
+                        WiserLTSPowerSensor(
+                            data, heating_actuator.id, sensor_type="Power"
+                        ),
+                        WiserLTSPowerSensor(
+                            data, heating_actuator.id, sensor_type="Energy"
+                        ),
+                    ]
+                )
             if (
-                heating_actuator.floor_temperature_sensor
+                enable_lts_sensors
+                and heating_actuator.floor_temperature_sensor
                 and heating_actuator.floor_temperature_sensor.sensor_type
                 != "Not_Fitted"
             ):
@@ -170,44 +219,66 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
                     )
                 )
 
-        # Add heating channels demand
-        for channel in data.wiserhub.heating_channels.all:
-            _LOGGER.debug("Setting up Heating Demand LTS sensors")
-            wiser_sensors.append(WiserLTSDemandSensor(data, channel.id, "heating"))
-
-        # Add hotwater demand
-        if data.wiserhub.hotwater:
-            _LOGGER.debug("Setting up HW sensorr")
-            wiser_sensors.append(WiserLTSDemandSensor(data, 0, "hotwater"))
+        if enable_lts_sensors:
+            # Add heating channels demand
+            for channel in data.wiserhub.heating_channels.all:
+                _LOGGER.debug("Setting up Heating Demand LTS sensors")
+                wiser_sensors.append(WiserLTSDemandSensor(data, channel.id, "heating"))
+
+            # Add hotwater demand
+            if data.wiserhub.hotwater:
+                _LOGGER.debug("Setting up HW sensorr")
+                wiser_sensors.append(WiserLTSDemandSensor(data, 0, "hotwater"))
+
+            # Add opentherm flow & return temps
+            if data.wiserhub.system.opentherm.connection_status == "Connected":
+                _LOGGER.debug("Setting up Opentherm sensors")
+                wiser_sensors.extend(
+                    [
+                        WiserLTSOpenthermSensor(
+                            data, 0, sensor_type="opentherm_flow_temp"
+                        ),
+                        WiserLTSOpenthermSensor(
+                            data, 0, sensor_type="opentherm_return_temp"
+                        ),
+                    ]
+                )
 
-        # Add opentherm flow & return temps
-        if data.wiserhub.system.opentherm.connection_status == "Connected":
-            _LOGGER.debug("Setting up Opentherm sensors")
-            wiser_sensors.extend(
-                [
-                    WiserLTSOpenthermSensor(data, 0, sensor_type="opentherm_flow_temp"),
-                    WiserLTSOpenthermSensor(
-                        data, 0, sensor_type="opentherm_return_temp"
-                    ),
-                ]
+    # Add heating runtime sensors
+    if data.entity_options[CONF_RUNTIME_SENSORS]:
+        _LOGGER.debug("Setting up Heating Runtime sensors")
+        for room in data.wiserhub.rooms.all:
+            if room.devices:
+                wiser_sensors.append(WiserHeatingRuntimeSensor(data, room.id, "room"))
+        for heating_channel in data.wiserhub.heating_channels.all:
+            wiser_sensors.append(
+                WiserHeatingRuntimeSensor(data, heating_channel.id, "heating_channel")
             )
+        if data.wiserhub.hotwater:
+            wiser_sensors.append(WiserHeatingRuntimeSensor(data, 0, "hotwater"))
 
     async_add_entities(wiser_sensors, True)
+    data.async_record_entity_setup("sensor", len(wiser_sensors), setup_start)
 
 
-class WiserSensor(CoordinatorEntity, SensorEntity):
+class WiserSensor(
+    WiserChangeSuppressedEntity,
+    WiserCachedAttributesEntity,
+    CoordinatorEntity,
+    SensorEntity,
+):
     """Definition of a Wiser sensor."""
 
-    def __init__(self, coordinator, device_id=0, sensor_type="") -> None:
+    def __init__(self, coordinator, device_id=0, sensor_type="", context=None) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context)
         self._data = coordinator
         self._device = None
         self._device_id = device_id
         self._device_name = None
         self._sensor_type = sensor_type
         self._state = None
-        self._room = self._data.wiserhub.rooms.get_by_device_id(self._device_id)
+        self._room = self._data.index.get_room_by_device_id(self._device_id)
         _LOGGER.debug(
             f"{self._data.wiserhub.system.name} {self.name} {'in room ' + self._room.name if self._room else ''} initalise"  # noqa: E501
         )
@@ -256,17 +327,17 @@ class WiserBatterySensor(WiserSensor):
 
     def __init__(self, data, device_id=0, sensor_type="") -> None:
         """Initialise the battery sensor."""
-        super().__init__(data, device_id, sensor_type)
-        self._device = self._data.wiserhub.devices.get_by_id(self._device_id)
+        super().__init__(data, device_id, sensor_type, ("device", device_id))
+        self._device = self._data.index.get_device(self._device_id)
         self._state = self._get_battery_state()
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Fetch new state data for the sensor."""
         super()._handle_coordinator_update()
-        self._device = self._data.wiserhub.devices.get_by_id(self._device_id)
+        self._device = self._data.index.get_device(self._device_id)
         self._state = self._get_battery_state()
-        self.async_write_ha_state()
+        self.async_write_ha_state_if_changed()
 
     def _get_battery_state(self) -> int | str:
         # TODO: Move this into api
@@ -291,8 +362,7 @@ class WiserBatterySensor(WiserSensor):
         """Return the unit of measurement of this entity."""
         return PERCENTAGE
 
-    @property
-    def extra_state_attributes(self):
+    def _get_extra_state_attributes(self):
         """Return the state attributes of the battery."""
         attrs = {}
         attrs["battery_voltage"] = self._device.battery.voltage
@@ -320,13 +390,28 @@ class WiserBatterySensor(WiserSensor):
 class WiserDeviceSignalSensor(WiserSensor):
     """Definition of Wiser Device Sensor."""
 
+    # Identification does not change so is not stored in the recorder
+    _unrecorded_attributes = frozenset(
+        {
+            "vendor",
+            "product_type",
+            "model_identifier",
+            "firmware",
+            "node_id",
+            "zigbee_channel",
+            "serial_number",
+        }
+    )
+
     def __init__(self, data, device_id=0, sensor_type="") -> None:
         """Initialise the device sensor."""
-        super().__init__(data, device_id, sensor_type)
+        super().__init__(
+            data, device_id, sensor_type, ("device", device_id) if device_id else None
+        )
         if self._device_id == 0:
             self._device = self._data.wiserhub.system
         else:
-            self._device = self._data.wiserhub.devices.get_by_id(self._device_id)
+            self._device = self._data.index.get_device(self._device_id)
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -335,9 +420,9 @@ class WiserDeviceSignalSensor(WiserSensor):
         if self._device_id == 0:
             self._device = self._data.wiserhub.system
         else:
-            self._device = self._data.wiserhub.devices.get_by_id(self._device_id)
+            self._device = self._data.index.get_device(self._device_id)
         self._state = self._device.signal.displayed_signal_strength
-        self.async_write_ha_state()
+        self.async_write_ha_state_if_changed()
 
     async def async_update(self) -> None:
         """Fetch new state data for the sensor."""
@@ -376,27 +461,38 @@ class WiserDeviceSignalSensor(WiserSensor):
             # Handle anything else as no signal
             return SIGNAL_STRENGTH_ICONS["NoSignal"]
 
-    @property
-    def extra_state_attributes(self):
-        """Return device state attributes."""
-        attrs = {}
+    def _build_identification_attributes(self) -> dict:
+        """Return device identification, firmware and Zigbee node attributes."""
+        attrs = {
+            "vendor": MANUFACTURER,
+            "product_type": self._device.product_type,
+            "model_identifier": self._device.model,
+            "firmware": self._device.firmware_version,
+            "node_id": self._device.node_id,
+            "zigbee_channel": self._data.wiserhub.system.zigbee.network_channel,
+        }
+        if self._device_id != 0:
+            attrs["serial_number"] = self._device.serial_number
+        return attrs
 
-        # Generic attributes
-        attrs["vendor"] = MANUFACTURER
-        attrs["product_type"] = self._device.product_type
-        attrs["model_identifier"] = self._device.model
-        attrs["firmware"] = self._device.firmware_version
+    def _get_extra_state_attributes(self):
+        """Return device state attributes."""
+        # Generic attributes and Zigbee identification
+        attrs = dict(
+            self._get_cached_attributes(
+                "identification",
+                self._build_identification_attributes,
+                (("device", self._device_id), None),
+            )
+        )
 
         # Zigbee Data
-        attrs["node_id"] = self._device.node_id
-        attrs["zigbee_channel"] = self._data.wiserhub.system.zigbee.network_channel
         attrs[
             "displayed_signal_strength"
         ] = self._device.signal.displayed_signal_strength
 
         # For non controller device
         if self._device_id != 0:
-            attrs["serial_number"] = self._device.serial_number
             attrs["hub_route"] = "direct"
 
             if self._device.signal.device_reception_rssi is not None:
@@ -425,11 +521,11 @@ class WiserDeviceSignalSensor(WiserSensor):
                 attrs["repeater"] = (
                     get_device_name(
                         self._data,
-                        self._data.wiserhub.devices.get_by_node_id(
+                        self._data.index.get_device_by_node_id(
                             self._device.parent_node_id
                         ).id,
                     )
-                    if self._data.wiserhub.devices.get_by_node_id(
+                    if self._data.index.get_device_by_node_id(
                         self._device.parent_node_id
                     )
                     else "Unknown"
@@ -466,15 +562,15 @@ class WiserDeviceSignalSensor(WiserSensor):
             "HeatingActuator",
             "UnderFloorHeating",
         ]:
-            attrs["temperature"] = self._data.wiserhub.devices.get_by_id(
+            attrs["temperature"] = self._data.index.get_device(
                 self._device_id
             ).current_temperature
 
         if self._sensor_type == "HeatingActuator":
-            attrs["target_temperature"] = self._data.wiserhub.devices.get_by_id(
+            attrs["target_temperature"] = self._data.index.get_device(
                 self._device_id
             ).current_target_temperature
-            attrs["output_type"] = self._data.wiserhub.devices.get_by_id(
+            attrs["output_type"] = self._data.index.get_device(
                 self._device_id
             ).output_type
 
@@ -506,7 +602,7 @@ class WiserSystemHotWaterPreset(WiserSensor):
             state = "Away Mode"
 
         self._state = f"{mode}{' - ' + state if state else ''}"
-        self.async_write_ha_state()
+        self.async_write_ha_state_if_changed()
 
     async def async_update(self) -> None:
         """Fetch new state data for the sensor."""
@@ -533,7 +629,7 @@ class WiserSystemCircuitState(WiserSensor):
         else:
             self._device = self._data.wiserhub.hotwater
             self._state = self._device.current_state
-        self.async_write_ha_state()
+        self.async_write_ha_state_if_changed()
 
     @property
     def icon(self):
@@ -548,8 +644,7 @@ class WiserSystemCircuitState(WiserSensor):
             return "mdi:fire-off"
         return "mdi:fire"
 
-    @property
-    def extra_state_attributes(self):
+    def _get_extra_state_attributes(self):
         """Return additional info."""
         attrs = {}
         if self._sensor_type == "Heating":
@@ -599,7 +694,7 @@ class WiserSystemCloudSensor(WiserSensor):
         """Fetch new state data for the sensor."""
         super()._handle_coordinator_update()
         self._state = self._data.wiserhub.system.cloud.connection_status
-        self.async_write_ha_state()
+        self.async_write_ha_state_if_changed()
 
     @property
     def icon(self):
@@ -617,7 +712,7 @@ class WiserSystemOperationModeSensor(WiserSensor):
         """Fetch new state data for the sensor."""
         super()._handle_coordinator_update()
         self._state = self.mode
-        self.async_write_ha_state()
+        self.async_write_ha_state_if_changed()
 
     @property
     def mode(self):
@@ -631,8 +726,7 @@ class WiserSystemOperationModeSensor(WiserSensor):
         """Return icon."""
         return "mdi:check" if self.mode == "Normal" else "mdi:alert"
 
-    @property
-    def extra_state_attributes(self):
+    def _get_extra_state_attributes(self):
         """Return the device state attributes."""
         attrs = {}
         attrs["last_updated"] = self._data.last_update_time
@@ -640,21 +734,154 @@ class WiserSystemOperationModeSensor(WiserSensor):
             (datetime.now() - self._data.last_update_time).total_seconds() / 60
         )
         attrs["last_update_status"] = self._data.last_update_status
+        attrs["stale_data"] = self._data.stale
+        attrs["refresh_requests"] = self._data.refresh_requests
+        attrs["refresh_hub_reads"] = self._data.refresh_reads
+        attrs["effective_scan_interval"] = self._data.effective_scan_interval
+        attrs["skipped_hub_rebuilds"] = self._data.skipped_rebuilds
+        attrs["unchanged_section_rates"] = self._data.sections.unchanged_rates
+        attrs["cached_section_reads"] = self._data.sections.cached_reads
+        attrs["optimistic_state"] = self._data.optimistic.stats
+        attrs["convergence"] = self._data.convergence.stats
+        attrs["coalesced_writes"] = self._data.writes.stats
+        attrs["name_index_builds"] = self._data.names.builds
+        attrs["suppressed_state_writes"] = self._data.suppressed_writes
         return attrs
 
 
+class WiserCommandQueueSensor(WiserSensor):
+    """Sensor for hub command queue depth and wait time."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Fetch new state data for the sensor."""
+        super()._handle_coordinator_update()
+        if self._sensor_type == "Command Queue Depth":
+            # Peak depth since previous update as queue is usually empty by now
+            self._state = self._data.command_queue.last_peak_depth
+        else:
+            self._state = self._data.command_queue.average_wait()
+        self.async_write_ha_state_if_changed()
+
+    @property
+    def state_class(self):
+        """Return the state class of the sensor."""
+        return SensorStateClass.MEASUREMENT
+
+    @property
+    def native_unit_of_measurement(self):
+        """Return the native uom"""
+        if self._sensor_type == "Command Queue Wait Time":
+            return UnitOfTime.MILLISECONDS
+        return None
+
+    @property
+    def icon(self):
+        """Return icon."""
+        if self._sensor_type == "Command Queue Depth":
+            return "mdi:tray-full"
+        return "mdi:timer-sand"
+
+    def _get_extra_state_attributes(self):
+        """Return the device state attributes."""
+        return self._data.command_queue.stats
+
+
+class WiserCircuitBreakerSensor(WiserSensor):
+    """Sensor for the hub connection circuit breaker state."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Fetch new state data for the sensor."""
+        super()._handle_coordinator_update()
+        self._state = self._data.breaker.state
+        self.async_write_ha_state_if_changed()
+
+    @property
+    def icon(self):
+        """Return icon."""
+        if self._state == CIRCUIT_CLOSED:
+            return "mdi:lan-connect"
+        if self._state == CIRCUIT_OPEN:
+            return "mdi:lan-disconnect"
+        return "mdi:lan-pending"
+
+    def _get_extra_state_attributes(self):
+        """Return the device state attributes."""
+        return self._data.breaker.stats
+
+
+class WiserPollMetricsSensor(WiserSensor):
+    """Sensor for hub poll timings and payload size."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Fetch new state data for the sensor."""
+        super()._handle_coordinator_update()
+        metrics = self._data.metrics
+        if self._sensor_type == "Poll Time":
+            self._state = metrics.phases["total"].last
+        elif self._sensor_type == "Hub Response Time":
+            self._state = metrics.phases["http"].last
+        else:
+            self._state = metrics.payload.last
+        self.async_write_ha_state_if_changed()
+
+    @property
+    def state_class(self):
+        """Return the state class of the sensor."""
+        return SensorStateClass.MEASUREMENT
+
+    @property
+    def native_unit_of_measurement(self):
+        """Return the native uom"""
+        if self._sensor_type == "Poll Payload Size":
+            return UnitOfInformation.BYTES
+        return UnitOfTime.MILLISECONDS
+
+    @property
+    def icon(self):
+        """Return icon."""
+        if self._sensor_type == "Poll Payload Size":
+            return "mdi:database-arrow-down"
+        return "mdi:timer-outline"
+
+    def _get_extra_state_attributes(self):
+        """Return the device state attributes."""
+        metrics = self._data.metrics
+        if self._sensor_type == "Poll Time":
+            attrs = {name: buffer.as_dict for name, buffer in metrics.phases.items()}
+            attrs["scheduling_lag"] = metrics.lag.as_dict
+            return attrs
+        if self._sensor_type == "Hub Response Time":
+            return {
+                endpoint: buffer.as_dict
+                for endpoint, buffer in metrics.endpoints.items()
+            }
+        return {"poll": metrics.payload.as_dict} | {
+            endpoint: buffer.as_dict
+            for endpoint, buffer in metrics.endpoint_payloads.items()
+        }
+
+
 class WiserCurrentVoltageSensor(WiserSensor):
     """Sensor for voltage of equipment devices"""
 
     def __init__(self, data, device_id, sensor_type="") -> None:
-        super().__init__(data, device_id, sensor_type)
-        self._device = data.wiserhub.devices.get_by_id(device_id)
+        super().__init__(data, device_id, sensor_type, ("device", device_id))
+        self._device = data.index.get_device(device_id)
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Fetch new state data for the sensor."""
-        self._device = self._data.wiserhub.devices.get_by_id(self._device_id)
-        self.async_write_ha_state()
+        self._device = self._data.index.get_device(self._device_id)
+        self.async_write_ha_state_if_changed()
 
     @property
     def device_class(self):
@@ -708,15 +935,15 @@ class WiserSmartplugPower(WiserSensor):
 
     def __init__(self, data, device_id, sensor_type="") -> None:
         """Initialise the operation mode sensor."""
-        super().__init__(data, device_id, sensor_type)
-        self._device = data.wiserhub.devices.smartplugs.get_by_id(device_id)
+        super().__init__(data, device_id, sensor_type, ("device", device_id))
+        self._device = data.index.get_device(device_id)
         self._last_delivered_power = 0
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Fetch new state data for the sensor."""
         super()._handle_coordinator_update()
-        self._device = self._data.wiserhub.devices.smartplugs.get_by_id(self._device_id)
+        self._device = self._data.index.get_device(self._device_id)
         if self._sensor_type == "Power":
             self._state = self._device.instantaneous_power
         else:
@@ -731,7 +958,7 @@ class WiserSmartplugPower(WiserSensor):
 
             else:
                 self._state = self._last_delivered_power
-        self.async_write_ha_state()
+        self.async_write_ha_state_if_changed()
 
     @property
     def name(self):
@@ -790,26 +1017,27 @@ class WiserLTSTempSensor(WiserSensor):
             super().__init__(
                 data,
                 device_id,
-                f"LTS Temperature {data.wiserhub.rooms.get_by_id(device_id).name}",
+                f"LTS Temperature {data.index.get_room(device_id).name}",
+                ("room", device_id),
             )
         elif sensor_type == "floor_current_temp":
             sensor_name = (
-                data.wiserhub.rooms.get_by_id(
-                    data.wiserhub.devices.get_by_id(device_id).room_id
-                ).name
-                if data.wiserhub.devices.get_by_id(device_id).room_id
-                else data.wiserhub.devices.get_by_id(device_id).name
+                data.index.get_room(data.index.get_device(device_id).room_id).name
+                if data.index.get_device(device_id).room_id
+                else data.index.get_device(device_id).name
             )
             super().__init__(
                 data,
                 device_id,
                 f"LTS Floor Temperature {sensor_name}",
+                ("device", device_id),
             )
         else:
             super().__init__(
                 data,
                 device_id,
-                f"LTS Target Temperature {data.wiserhub.rooms.get_by_id(device_id).name}",
+                f"LTS Target Temperature {data.index.get_room(device_id).name}",
+                ("room", device_id),
             )
 
     @callback
@@ -817,27 +1045,23 @@ class WiserLTSTempSensor(WiserSensor):
         """Fetch new state data for the sensor."""
         super()._handle_coordinator_update()
         if self._lts_sensor_type == "current_temp":
-            self._state = self._data.wiserhub.rooms.get_by_id(
-                self._device_id
-            ).current_temperature
+            self._state = self._data.index.get_room(self._device_id).current_temperature
         elif self._lts_sensor_type == "floor_current_temp":
-            self._state = self._data.wiserhub.devices.get_by_id(
+            self._state = self._data.index.get_device(
                 self._device_id
             ).floor_temperature_sensor.measured_temperature
         else:
             if (
-                self._data.wiserhub.rooms.get_by_id(self._device_id).mode == "Off"
-                or self._data.wiserhub.rooms.get_by_id(
-                    self._device_id
-                ).current_target_temperature
+                self._data.index.get_room(self._device_id).mode == "Off"
+                or self._data.index.get_room(self._device_id).current_target_temperature
                 == TEMP_OFF
             ):
                 self._state = "Off"
             else:
-                self._state = self._data.wiserhub.rooms.get_by_id(
+                self._state = self._data.index.get_room(
                     self._device_id
                 ).current_target_temperature
-        self.async_write_ha_state()
+        self.async_write_ha_state_if_changed()
 
     @property
     def device_info(self):
@@ -891,6 +1115,22 @@ class WiserLTSTempSensor(WiserSensor):
 class WiserLTSOpenthermSensor(WiserSensor):
     """Sensor for long term stats for room temp and target temp"""
 
+    # Boiler parameters do not change so are not stored in the recorder
+    _unrecorded_attributes = frozenset(
+        {
+            "boiler_ch_max_setpoint_read_write",
+            "boiler_ch_max_setpoint_transfer_enable",
+            "boiler_ch_setpoint",
+            "boiler_ch_setpoint_lower_bound",
+            "boiler_ch_setpoint_upper_bound",
+            "boiler_hw_setpoint_read_write",
+            "boiler_hw_setpoint_transfer_enable",
+            "boiler_hw_setpoint",
+            "boiler_hw_setpoint_lower_bound",
+            "boiler_hw_setpoint_upper_bound",
+        }
+    )
+
     def __init__(self, data, device_id, sensor_type="") -> None:
         """Initialise the operation mode sensor."""
         self._lts_sensor_type = sensor_type
@@ -907,7 +1147,7 @@ class WiserLTSOpenthermSensor(WiserSensor):
             self._state = self._data.wiserhub.system.opentherm.operational_data.ch_flow_temperature
         elif self._lts_sensor_type == "opentherm_return_temp":
             self._state = self._data.wiserhub.system.opentherm.operational_data.ch_return_temperature
-        self.async_write_ha_state()
+        self.async_write_ha_state_if_changed()
 
     @property
     def device_info(self):
@@ -923,8 +1163,23 @@ class WiserLTSOpenthermSensor(WiserSensor):
             "via_device": (DOMAIN, self._data.wiserhub.system.name),
         }
 
-    @property
-    def extra_state_attributes(self):
+    def _build_boiler_parameter_attributes(self) -> dict:
+        """Return opentherm boiler parameter attributes."""
+        boiler_params = self._data.wiserhub.system.opentherm.boiler_parameters
+        return {
+            "boiler_ch_max_setpoint_read_write": boiler_params.ch_max_setpoint_read_write,
+            "boiler_ch_max_setpoint_transfer_enable": boiler_params.ch_max_setpoint_transfer_enable,
+            "boiler_ch_setpoint": boiler_params.ch_setpoint,
+            "boiler_ch_setpoint_lower_bound": boiler_params.ch_setpoint_lower_bound,
+            "boiler_ch_setpoint_upper_bound": boiler_params.ch_setpoint_upper_bound,
+            "boiler_hw_setpoint_read_write": boiler_params.hw_setpoint_read_write,
+            "boiler_hw_setpoint_transfer_enable": boiler_params.hw_setpoint_transfer_enable,
+            "boiler_hw_setpoint": boiler_params.hw_setpoint,
+            "boiler_hw_setpoint_lower_bound": boiler_params.hw_setpoint_lower_bound,
+            "boiler_hw_setpoint_upper_bound": boiler_params.hw_setpoint_upper_bound,
+        }
+
+    def _get_extra_state_attributes(self):
         """Return additional info."""
         attrs = {}
         if self._lts_sensor_type == "opentherm_flow_temp":
@@ -958,33 +1213,14 @@ class WiserLTSOpenthermSensor(WiserSensor):
             attrs["hw_flow_rate"] = operational_data.hw_flow_rate
             attrs["slave_status"] = operational_data.slave_status
 
-            boiler_params = opentherm.boiler_parameters
-            attrs[
-                "boiler_ch_max_setpoint_read_write"
-            ] = boiler_params.ch_max_setpoint_read_write
-            attrs[
-                "boiler_ch_max_setpoint_transfer_enable"
-            ] = boiler_params.ch_max_setpoint_transfer_enable
-            attrs["boiler_ch_setpoint"] = boiler_params.ch_setpoint
-            attrs[
-                "boiler_ch_setpoint_lower_bound"
-            ] = boiler_params.ch_setpoint_lower_bound
-            attrs[
-                "boiler_ch_setpoint_upper_bound"
-            ] = boiler_params.ch_setpoint_upper_bound
-            attrs[
-                "boiler_hw_setpoint_read_write"
-            ] = boiler_params.hw_setpoint_read_write
-            attrs[
-                "boiler_hw_setpoint_transfer_enable"
-            ] = boiler_params.hw_setpoint_transfer_enable
-            attrs["boiler_hw_setpoint"] = boiler_params.hw_setpoint
-            attrs[
-                "boiler_hw_setpoint_lower_bound"
-            ] = boiler_params.hw_setpoint_lower_bound
-            attrs[
-                "boiler_hw_setpoint_upper_bound"
-            ] = boiler_params.hw_setpoint_upper_bound
+            # Boiler parameters are only changed by the boiler
+            attrs.update(
+                self._get_cached_attributes(
+                    "boiler_parameters",
+                    self._build_boiler_parameter_attributes,
+                    sections=("opentherm",),
+                )
+            )
         return attrs
 
     @property
@@ -1020,17 +1256,16 @@ class WiserLTSHumiditySensor(WiserSensor):
         super().__init__(
             data,
             device_id,
-            f"LTS Humidity {data.wiserhub.rooms.get_by_id(data.wiserhub.devices.get_by_id(device_id).room_id).name}",
+            f"LTS Humidity {data.index.get_room(data.index.get_device(device_id).room_id).name}",
+            ("device", device_id),
         )
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Fetch new state data for the sensor."""
         super()._handle_coordinator_update()
-        self._state = self._data.wiserhub.devices.get_by_id(
-            self._device_id
-        ).current_humidity
-        self.async_write_ha_state()
+        self._state = self._data.index.get_device(self._device_id).current_humidity
+        self.async_write_ha_state_if_changed()
 
     @property
     def device_info(self):
@@ -1038,7 +1273,7 @@ class WiserLTSHumiditySensor(WiserSensor):
         return {
             "name": get_device_name(
                 self._data,
-                self._data.wiserhub.devices.get_by_id(self._device_id).room_id,
+                self._data.index.get_device(self._device_id).room_id,
                 "room",
             ),
             "identifiers": {
@@ -1046,7 +1281,7 @@ class WiserLTSHumiditySensor(WiserSensor):
                     DOMAIN,
                     get_identifier(
                         self._data,
-                        self._data.wiserhub.devices.get_by_id(self._device_id).room_id,
+                        self._data.index.get_device(self._device_id).room_id,
                         "room",
                     ),
                 )
@@ -1094,7 +1329,8 @@ class WiserLTSDemandSensor(WiserSensor):
             super().__init__(
                 data,
                 device_id,
-                f"LTS Heating Demand {data.wiserhub.rooms.get_by_id(device_id).name}",
+                f"LTS Heating Demand {data.index.get_room(device_id).name}",
+                ("room", device_id),
             )
 
     @callback
@@ -1109,10 +1345,8 @@ class WiserLTSDemandSensor(WiserSensor):
             self._state = 100 if self._data.wiserhub.hotwater.is_heating else 0
         else:
             # Assume room demand
-            self._state = self._data.wiserhub.rooms.get_by_id(
-                self._device_id
-            ).percentage_demand
-        self.async_write_ha_state()
+            self._state = self._data.index.get_room(self._device_id).percentage_demand
+        self.async_write_ha_state_if_changed()
 
     @property
     def device_info(self):
@@ -1162,27 +1396,29 @@ class WiserLTSPowerSensor(WiserSensor):
         """Initialise the operation mode sensor."""
         self._device_id = device_id
         self._lts_sensor_type = sensor_type
-        self._device = data.wiserhub.devices.get_by_id(device_id)
+        self._device = data.index.get_device(device_id)
         self._sensor_name = name
         if self._device.room_id == 0:
             device_name = self._device.product_type + " " + str(self._device.id)
         else:
-            device_name = data.wiserhub.rooms.get_by_id(self._device.room_id).name
+            device_name = data.index.get_room(self._device.room_id).name
 
         if name:
-            super().__init__(data, device_id, f"{name.title()} ")
+            super().__init__(data, device_id, f"{name.title()} ", ("device", device_id))
         else:
             if sensor_type == "Power":
                 super().__init__(
                     data,
                     device_id,
                     f"LTS Power {device_name}",
+                    ("device", device_id),
                 )
             else:
                 super().__init__(
                     data,
                     device_id,
                     f"LTS Energy {device_name}",
+                    ("device", device_id),
                 )
 
     @callback
@@ -1190,22 +1426,20 @@ class WiserLTSPowerSensor(WiserSensor):
         """Fetch new state data for the sensor."""
         super()._handle_coordinator_update()
         if self._lts_sensor_type == "Power":
-            self._state = self._data.wiserhub.devices.get_by_id(
+            self._state = self._data.index.get_device(
                 self._device_id
             ).instantaneous_power
         elif self._lts_sensor_type == "Energy":
             self._state = round(
-                self._data.wiserhub.devices.get_by_id(self._device_id).delivered_power
-                / 1000,
+                self._data.index.get_device(self._device_id).delivered_power / 1000,
                 2,
             )
         elif self._lts_sensor_type == "EnergyReceived":
             self._state = round(
-                self._data.wiserhub.devices.get_by_id(self._device_id).received_power
-                / 1000,
+                self._data.index.get_device(self._device_id).received_power / 1000,
                 2,
             )
-        self.async_write_ha_state()
+        self.async_write_ha_state_if_changed()
 
     @property
     def name(self):
@@ -1280,3 +1514,78 @@ class WiserLTSPowerSensor(WiserSensor):
             return UnitOfPower.WATT
         else:
             return UnitOfEnergy.KILO_WATT_HOUR
+
+
+class WiserHeatingRuntimeSensor(WiserSensor):
+    """Sensor for heating on time today of a room, heating channel or hot water.
+
+    Yesterday, last 7 days and duty cycle are shown as attributes.
+    """
+
+    def __init__(self, data, device_id, runtime_type) -> None:
+        """Initialise the heating runtime sensor."""
+        self._runtime_type = runtime_type
+        if runtime_type == "heating_channel":
+            super().__init__(data, device_id, f"Heating Time Channel {device_id}")
+        elif runtime_type == "hotwater":
+            super().__init__(data, device_id, "Hot Water Heating Time")
+        else:
+            super().__init__(
+                data,
+                device_id,
+                f"Heating Time {data.index.get_room(device_id).name}",
+            )
+        self._runtime_key = (
+            runtime_type
+            if runtime_type == "hotwater"
+            else f"{runtime_type}_{device_id}"
+        )
+        self._stats = {}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Fetch new state data for the sensor."""
+        super()._handle_coordinator_update()
+        accumulator = self._data.runtime.get(self._runtime_key)
+        self._stats = accumulator.stats(dt_util.now())
+        self._stats["is_heating"] = accumulator.is_on
+        self._state = self._stats["today"]
+        self.async_write_ha_state_if_changed()
+
+    @property
+    def device_info(self):
+        """Return device specific attributes."""
+        if self._runtime_type != "room":
+            return super().device_info
+        return {
+            "name": get_device_name(self._data, self._device_id, "room"),
+            "identifiers": {
+                (DOMAIN, get_identifier(self._data, self._device_id, "room"))
+            },
+            "manufacturer": MANUFACTURER,
+            "model": "Room",
+            "via_device": (DOMAIN, self._data.wiserhub.system.name),
+        }
+
+    @property
+    def icon(self):
+        """Return icon for sensor"""
+        if self._runtime_type == "hotwater":
+            return "mdi:water-boiler"
+        return "mdi:radiator"
+
+    @property
+    def device_class(self):
+        return SensorDeviceClass.DURATION
+
+    @property
+    def state_class(self):
+        return SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_unit_of_measurement(self):
+        return UnitOfTime.HOURS
+
+    def _get_extra_state_attributes(self):
+        """Return yesterday, last 7 days and duty cycle."""
+        return {key: value for key, value in self._stats.items() if key != "today"}
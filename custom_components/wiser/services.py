@@ -1,4 +1,5 @@
 # Initialise global services
+import asyncio
 import os
 import aiofiles
 import voluptuous as vol
@@ -14,18 +15,17 @@ from .const import (
     ATTR_SCHEDULE_NAME,
     ATTR_TIME_PERIOD,
     ATTR_TO_ENTITY_ID,
-    DATA,
     DEFAULT_BOOST_TEMP_TIME,
     DOMAIN,
     WISER_SERVICES,
 )
-from .coordinator import WiserHubRESTError
-from .helpers import get_config_entry_id_by_name, get_instance_count, is_wiser_config_id
+from .coordinator import WiserHubRESTError, deferred_refreshes
+from .helpers import get_entity_resolver, get_hub_registry
 from homeassistant.const import (
     ATTR_ENTITY_ID,
     ATTR_MODE,
 )
-from homeassistant.core import HomeAssistant, callback, ServiceCall
+from homeassistant.core import HomeAssistant, callback, ServiceCall, SupportsResponse
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
 
@@ -97,115 +97,140 @@ async def async_setup_services(hass: HomeAssistant, data):
 
     def get_entity_from_entity_id(entity: str):
         """Get wiser entity from entity_id"""
-        domain = entity.split(".", 1)[0]
-        entity_comp = hass.data.get("entity_components", {}).get(domain)
-        if entity_comp:
-            return entity_comp.get_entity(entity)
-        return None
+        return get_entity_resolver(hass).get_entity(entity)
+
+    async def async_run_for_entities(entity_ids: list[str], command) -> dict:
+        """Run command for each entity concurrently and return their results.
+
+        Commands to each hub are limited to its service concurrency and the
+        hub refreshes requested by commands are merged into a single refresh
+        of each hub once all commands have run.
+        """
+
+        async def async_run_command(entity_id: str) -> dict:
+            entity = get_entity_from_entity_id(entity_id)
+            try:
+                if not entity:
+                    raise HomeAssistantError(
+                        f"Invalid entity. {entity_id} does not exist in this integration"
+                    )
+                async with entity.coordinator.async_service_slot():
+                    await command(entity)
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                _LOGGER.error(ex)
+                return {"success": False, "error": str(ex)}
+            return {"success": True}
+
+        entity_ids = list(dict.fromkeys(entity_ids))
+        deferred = set()
+        token = deferred_refreshes.set(deferred)
+        try:
+            results = await asyncio.gather(
+                *[async_run_command(entity_id) for entity_id in entity_ids]
+            )
+        finally:
+            deferred_refreshes.reset(token)
+
+        for coordinator in deferred:
+            await coordinator.async_request_hub_refresh()
+
+        failed = [result for result in results if not result["success"]]
+        _LOGGER.debug(
+            f"Service run for {len(entity_ids)} entities with {len(failed)} failures"
+        )
+        return {"results": dict(zip(entity_ids, results))}
+
+    def get_source_entity(entity_id: str, attribute: str):
+        """Return entity to copy or assign from if it supports attribute."""
+        entity = get_entity_from_entity_id(entity_id)
+        if not entity:
+            raise HomeAssistantError(
+                f"Invalid entity - {entity_id} does not exist in this integration"
+            )
+        if not hasattr(entity, attribute):
+            raise HomeAssistantError(
+                f"Cannot use schedule from entity {entity.name}.  Please see wiki for entities to choose"
+            )
+        return entity
 
     @callback
     async def get_schedule(service_call):
         """Handle the service call."""
-        entity_ids = service_call.data[ATTR_ENTITY_ID]
-        for entity_id in entity_ids:
+
+        async def async_get_schedule(entity):
+            if not hasattr(entity, "get_schedule"):
+                raise HomeAssistantError(
+                    f"Cannot save schedule from entity {entity.entity_id}.  Please see wiki for entities to choose"
+                )
             filename = (
                 service_call.data[ATTR_FILENAME]
                 if service_call.data[ATTR_FILENAME] != ""
                 else (
                     hass.config.config_dir
                     + "/schedules/schedule_"
-                    + entity_id.split(".", 1)[1]
+                    + entity.entity_id.split(".", 1)[1]
                     + ".yaml"
                 )
             )
-            entity = get_entity_from_entity_id(entity_id)
-            if entity:
-                if hasattr(entity, "get_schedule"):
-                    # Remove leading slash on config if exists
-                    filename = str(filename).replace("/config", "config")
-                    # Check if dir exists, if not create it.
-                    file_dir = os.path.dirname(filename)
-                    if file_dir and not os.path.exists(file_dir):
-                        await aiofiles.os.makedirs(file_dir, exist_ok=True)
-                    fn = getattr(entity, "get_schedule")
-                    await fn(filename)
-                else:
-                    _LOGGER.error(
-                        f"Cannot save schedule from entity {entity_id}.  Please see wiki for entities to choose"
-                    )
-            else:
-                _LOGGER.error(
-                    f"Invalid entity. {entity_id} does not exist in this integration"
-                )
+            # Remove leading slash on config if exists
+            filename = str(filename).replace("/config", "config")
+            # Check if dir exists, if not create it.
+            file_dir = os.path.dirname(filename)
+            if file_dir and not os.path.exists(file_dir):
+                await aiofiles.os.makedirs(file_dir, exist_ok=True)
+            await entity.get_schedule(filename)
+
+        return await async_run_for_entities(
+            service_call.data[ATTR_ENTITY_ID], async_get_schedule
+        )
 
     @callback
     async def set_schedule(service_call):
         """Handle the service call."""
-        entity_ids = service_call.data[ATTR_ENTITY_ID]
-        for entity_id in entity_ids:
-            filename = service_call.data[ATTR_FILENAME]
-            entity = get_entity_from_entity_id(entity_id)
-            if entity:
-                if hasattr(entity, "set_schedule"):
-                    fn = getattr(entity, "set_schedule")
-                    await fn(filename)
-                else:
-                    _LOGGER.error(
-                        f"Cannot set schedule for entity {entity_id}.  Please see wiki for entities to choose"
-                    )
-            else:
-                _LOGGER.error(
-                    f"Invalid entity. {entity_id} does not exist in this integration"
+        filename = service_call.data[ATTR_FILENAME]
+
+        async def async_set_schedule(entity):
+            if not hasattr(entity, "set_schedule"):
+                raise HomeAssistantError(
+                    f"Cannot set schedule for entity {entity.entity_id}.  Please see wiki for entities to choose"
                 )
+            await entity.set_schedule(filename)
+
+        return await async_run_for_entities(
+            service_call.data[ATTR_ENTITY_ID], async_set_schedule
+        )
 
     @callback
     async def set_schedule_from_data(service_call: ServiceCall):
         """Handle the service call."""
         schedule = service_call.data[ATTR_SCHEDULE]
         schedule.hass = hass
+        schedule_data = schedule.async_render(parse_result=False)
 
-        entity_ids = service_call.data[ATTR_ENTITY_ID]
-        for entity_id in entity_ids:
-            entity = get_entity_from_entity_id(entity_id)
-            if entity:
-                if hasattr(entity, "set_schedule_from_data"):
-                    fn = getattr(entity, "set_schedule_from_data")
-                    await fn(schedule.async_render(parse_result=False))
-                else:
-                    _LOGGER.error(
-                        f"Cannot set schedule for entity {entity_id}.  Please see wiki for entities to choose"
-                    )
-            else:
-                _LOGGER.error(
-                    f"Invalid entity. {entity_id} does not exist in this integration"
+        async def async_set_schedule_from_data(entity):
+            if not hasattr(entity, "set_schedule_from_data"):
+                raise HomeAssistantError(
+                    f"Cannot set schedule for entity {entity.entity_id}.  Please see wiki for entities to choose"
                 )
+            await entity.set_schedule_from_data(schedule_data)
+
+        return await async_run_for_entities(
+            service_call.data[ATTR_ENTITY_ID], async_set_schedule_from_data
+        )
 
     @callback
     async def copy_schedule(service_call):
         """Handle the service call"""
-        entity_id = service_call.data[ATTR_ENTITY_ID]
-        to_entity_ids = service_call.data[ATTR_TO_ENTITY_ID]
-        for to_entity_id in to_entity_ids:
-            from_entity = get_entity_from_entity_id(entity_id)
-            to_entity = get_entity_from_entity_id(to_entity_id)
-
-            if from_entity and to_entity:
-                # Check from entity is a schedule entity
-                if hasattr(from_entity, "copy_schedule"):
-                    fn = getattr(from_entity, "copy_schedule")
-                    await fn(to_entity)
-                else:
-                    _LOGGER.error(
-                        f"Cannot copy schedule from entity {from_entity.name}.  Please see wiki for entities to choose"
-                    )
-            else:
-                from_entity_id_text = entity_id if not from_entity else ""
-                to_entity_id_text = to_entity_id if not to_entity else ""
-                and_text = " and " if not from_entity and not to_entity else ""
-                _LOGGER.error(
-                    f"Invalid entity - {from_entity_id_text}{and_text}{to_entity_id_text} does not exist in this integration"  # noqa=E501
-                )
-            return False
+        from_entity = get_source_entity(
+            service_call.data[ATTR_ENTITY_ID], "copy_schedule"
+        )
+
+        async def async_copy_schedule(to_entity):
+            await from_entity.copy_schedule(to_entity)
+
+        return await async_run_for_entities(
+            service_call.data[ATTR_TO_ENTITY_ID], async_copy_schedule
+        )
 
     @callback
     async def assign_schedule(service_call):
@@ -213,108 +238,72 @@ async def async_setup_services(hass: HomeAssistant, data):
         entity_id = service_call.data.get(ATTR_ENTITY_ID)
         schedule_id = service_call.data.get(ATTR_SCHEDULE_ID)
         schedule_name = service_call.data.get(ATTR_SCHEDULE_NAME)
-        to_entity_ids = service_call.data[ATTR_TO_ENTITY_ID]
 
         if entity_id:
             # Assign schedule from this entity to another
-            for to_entity_id in to_entity_ids:
-                from_entity = get_entity_from_entity_id(entity_id)
-                to_entity = get_entity_from_entity_id(to_entity_id)
-
-                if from_entity and to_entity:
-                    if hasattr(from_entity, "assign_schedule_to_another_entity"):
-                        fn = getattr(from_entity, "assign_schedule_to_another_entity")
-                        await fn(to_entity)
-                    else:
-                        _LOGGER.error(
-                            f"Cannot assign schedule from entity {from_entity.name}. Please see wiki for entities to choose"  # noqa=E501
-                        )
-                else:
-                    from_entity_id_text = entity_id if not from_entity else ""
-                    to_entity_id_text = to_entity_id if not to_entity else ""
-                    and_text = " and " if not from_entity and not to_entity else ""
-                    _LOGGER.error(
-                        f"Invalid entity - {from_entity_id_text}{and_text}{to_entity_id_text} does not exist in this integration"  # noqa=E501
+            from_entity = get_source_entity(
+                entity_id, "assign_schedule_to_another_entity"
+            )
+
+            async def async_assign_schedule(to_entity):
+                await from_entity.assign_schedule_to_another_entity(to_entity)
+
+        elif schedule_id or schedule_name:
+            # Assign schedule with id or name to this entity
+            async def async_assign_schedule(to_entity):
+                if not hasattr(to_entity, "assign_schedule_by_id_or_name"):
+                    raise HomeAssistantError(
+                        f"Cannot assign schedule to entity {to_entity.name}. Please see wiki for entities to choose"
                     )
-        elif schedule_id:
-            # Assign scheduel with id to this entity
-            for to_entity_id in to_entity_ids:
-                to_entity = get_entity_from_entity_id(to_entity_id)
-                if to_entity:
-                    if hasattr(to_entity, "assign_schedule_by_id_or_name"):
-                        fn = getattr(to_entity, "assign_schedule_by_id_or_name")
-                        await fn(schedule_id, None)
-                    else:
-                        _LOGGER.error(
-                            f"Cannot assign schedule to entity {to_entity.name}. Please see wiki for entities to choose"
-                        )
-        elif schedule_name:
-            # Assign schedule with name to this entity
-            for to_entity_id in to_entity_ids:
-                to_entity = get_entity_from_entity_id(to_entity_id)
-                if to_entity:
-                    if hasattr(to_entity, "assign_schedule_by_id_or_name"):
-                        fn = getattr(to_entity, "assign_schedule_by_id_or_name")
-                        await fn(None, schedule_name)
-                    else:
-                        _LOGGER.error(
-                            f"Cannot assign schedule to entity {to_entity.name}. Please see wiki for entities to choose"
-                        )
+                await to_entity.assign_schedule_by_id_or_name(
+                    schedule_id, None if schedule_id else schedule_name
+                )
+
         else:
             # Create default schedule and assign to entity
-            for to_entity_id in to_entity_ids:
-                entity = get_entity_from_entity_id(to_entity_id)
-                if hasattr(entity, "create_schedule"):
-                    fn = getattr(entity, "create_schedule")
-                    await fn()
-                else:
-                    _LOGGER.error(
+            async def async_assign_schedule(to_entity):
+                if not hasattr(to_entity, "create_schedule"):
+                    raise HomeAssistantError(
                         f"Cannot assign schedule to entity {to_entity.name}.  Please see wiki for entities to choose"
                     )
+                await to_entity.create_schedule()
+
+        return await async_run_for_entities(
+            service_call.data[ATTR_TO_ENTITY_ID], async_assign_schedule
+        )
 
     @callback
     async def set_device_mode(service_call):
         """Handle the service call."""
-        entity_ids = service_call.data[ATTR_ENTITY_ID]
         mode = service_call.data[ATTR_MODE]
-        for entity_id in entity_ids:
-            entity = get_entity_from_entity_id(entity_id)
-            if entity:
-                if hasattr(entity, "async_set_mode"):
-                    if mode.lower() in [option.lower() for option in entity.options]:
-                        fn = getattr(entity, "async_set_mode")
-                        await fn(mode)
-                    else:
-                        _LOGGER.error(
-                            f"{mode} is not a valid mode for this device.  Options are {entity.options}"
-                        )
-                else:
-                    _LOGGER.error(
-                        f"Cannot set mode for entity {entity_id}.  Please see wiki for entities to choose"
-                    )
-            else:
-                _LOGGER.error(
-                    f"Invalid entity. {entity_id} does not exist in this integration"
+
+        async def async_set_device_mode(entity):
+            if not hasattr(entity, "async_set_mode"):
+                raise HomeAssistantError(
+                    f"Cannot set mode for entity {entity.entity_id}.  Please see wiki for entities to choose"
+                )
+            if not get_entity_resolver(hass).get_option(entity, mode):
+                raise HomeAssistantError(
+                    f"{mode} is not a valid mode for this device.  Options are {entity.options}"
                 )
+            await entity.async_set_mode(mode)
+
+        return await async_run_for_entities(
+            service_call.data[ATTR_ENTITY_ID], async_set_device_mode
+        )
+
+    def get_hub_instance(hub: str):
+        """Return coordinator for hub config entry id or name."""
+        registry = get_hub_registry(hass)
+        if registry.count > 1 and not hub:
+            raise HomeAssistantError("Please specify a hub config entry id or name")
+        return registry.get(hub) or data
 
     @callback
     async def async_boost_hotwater(service_call):
         time_period = service_call.data[ATTR_TIME_PERIOD]
         hub = service_call.data[ATTR_HUB]
-        instance = data
-
-        if get_instance_count(hass) > 1:
-            if not hub:
-                raise HomeAssistantError("Please specify a hub config entry id or name")
-            else:
-                # Find hub from config_entry_id or hub name
-                if is_wiser_config_id(hass, hub):
-                    instance = hass.data[DOMAIN][hub][DATA]
-                else:
-                    # Find hub by name
-                    config_entry_id = get_config_entry_id_by_name(hass, hub)
-                    if config_entry_id:
-                        instance = hass.data[DOMAIN][config_entry_id][DATA]
+        instance = get_hub_instance(hub)
 
         # If hub has hotwater functionality, call boost
         if instance.wiserhub.hotwater:
@@ -324,7 +313,7 @@ async def async_setup_services(hass: HomeAssistant, data):
             else:
                 _LOGGER.info("Cancelling Hot Water boost")
                 await instance.wiserhub.hotwater.cancel_overrides()
-            await data.async_refresh()
+            await instance.async_request_hub_refresh()
         else:
             raise HomeAssistantError("This hub does not have hotwater functionality")
 
@@ -334,20 +323,7 @@ async def async_setup_services(hass: HomeAssistant, data):
         param = service_call.data[ATTR_OPENTHERM_PARAM]
         value = service_call.data[ATTR_OPENTHERM_PARAM_VALUE]
         hub = service_call.data[ATTR_HUB]
-        instance = data
-
-        if get_instance_count(hass) > 1:
-            if not hub:
-                raise HomeAssistantError("Please specify a hub config entry id or name")
-            else:
-                # Find hub from config_entry_id or hub name
-                if is_wiser_config_id(hass, hub):
-                    instance = hass.data[DOMAIN][hub][DATA]
-                else:
-                    # Find hub by name
-                    config_entry_id = get_config_entry_id_by_name(hass, hub)
-                    if config_entry_id:
-                        instance = hass.data[DOMAIN][config_entry_id][DATA]
+        instance = get_hub_instance(hub)
 
         # If hub has opentherm
         if instance.wiserhub.system.opentherm:
@@ -360,13 +336,14 @@ async def async_setup_services(hass: HomeAssistant, data):
                 raise HomeAssistantError(
                     "Error setting parameter.  Invalid parameter/endpoint or maybe a parameter that cannot be set"
                 )
-            await data.async_refresh()
+            await instance.async_request_hub_refresh()
 
     hass.services.async_register(
         DOMAIN,
         WISER_SERVICES["SERVICE_GET_SCHEDULE"],
         get_schedule,
         schema=GET_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     hass.services.async_register(
@@ -374,6 +351,7 @@ async def async_setup_services(hass: HomeAssistant, data):
         WISER_SERVICES["SERVICE_SET_SCHEDULE"],
         set_schedule,
         schema=SET_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     hass.services.async_register(
@@ -381,6 +359,7 @@ async def async_setup_services(hass: HomeAssistant, data):
         WISER_SERVICES["SERVICE_SET_SCHEDULE_FROM_DATA"],
         set_schedule_from_data,
         schema=SET_SCHEDULE_FROM_DATA_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     hass.services.async_register(
@@ -388,6 +367,7 @@ async def async_setup_services(hass: HomeAssistant, data):
         WISER_SERVICES["SERVICE_COPY_SCHEDULE"],
         copy_schedule,
         schema=COPY_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     hass.services.async_register(
@@ -395,6 +375,7 @@ async def async_setup_services(hass: HomeAssistant, data):
         WISER_SERVICES["SERVICE_ASSIGN_SCHEDULE"],
         assign_schedule,
         schema=ASSIGN_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     hass.services.async_register(
@@ -402,6 +383,7 @@ async def async_setup_services(hass: HomeAssistant, data):
         WISER_SERVICES["SERVICE_SET_DEVICE_MODE"],
         set_device_mode,
         schema=SET_DEVICE_MODE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     if data.wiserhub.hotwater:
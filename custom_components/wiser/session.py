@@ -0,0 +1,245 @@
+import asyncio
+import json
+import logging
+import time
+from urllib.parse import urlparse
+
+import aiohttp
+from aioWiserHeatAPI import __VERSION__ as API_VERSION
+from aioWiserHeatAPI.const import REST_TIMEOUT
+from aioWiserHeatAPI.wiserhub import (
+    WiserAPI,
+    WiserHubConnectionError,
+    WiserHubRESTError,
+)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .breaker import WiserCircuitBreaker
+from .command_queue import PRIORITY_POLL, WiserCommandQueue, hub_request_priority
+from .const import HUB_CONNECT_TIMEOUT, HUB_CONNECTION_LIMIT
+from .metrics import WiserPollMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+# Api rest controller attributes replaced or used by the session and section
+# cache.  These are not public so are checked in case the api changes.
+REST_CONTROLLER_ATTRIBUTES = [
+    "_do_hub_action",
+    "_get_hub_data",
+    "_process_nok_response",
+    "_wiser_connection_info",
+    "remove_control_characters",
+]
+
+
+def check_rest_controller(rest_controller) -> None:
+    """Raise if api rest controller does not have the attributes used."""
+    missing = [
+        attribute
+        for attribute in REST_CONTROLLER_ATTRIBUTES
+        if not hasattr(rest_controller, attribute)
+    ]
+    if missing:
+        raise RuntimeError(
+            f"aioWiserHeatAPI v{API_VERSION} is not supported. "
+            f"Rest controller is missing {', '.join(missing)}"
+        )
+
+
+class WiserHubSession:
+    """Keep-alive http session for a Wiser hub.
+
+    The api creates a new session and connection for every request and does
+    not use a session passed to it, so the rest controller request method is
+    replaced with one that uses this session.  Polls, commands and websocket
+    actions all use the api rest controller and so reuse kept alive
+    connections.  Each request waits in the command queue for its turn to be
+    sent, which limits concurrent connections to the hub.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        wiserhub: WiserAPI,
+        command_queue: WiserCommandQueue,
+        metrics: WiserPollMetrics,
+        breaker: WiserCircuitBreaker,
+    ) -> None:
+        self._rest_controller = wiserhub._wiser_rest_controller
+        check_rest_controller(self._rest_controller)
+        self._rest_controller._do_hub_action = self._async_do_hub_action
+        self.command_queue = command_queue
+        self.metrics = metrics
+        self.breaker = breaker
+        self.requests = 0
+        self.failed_requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.disconnect_retries = 0
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_create)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuse)
+        self.session = async_create_clientsession(
+            hass,
+            auto_cleanup=False,
+            timeout=aiohttp.ClientTimeout(
+                total=REST_TIMEOUT, connect=HUB_CONNECT_TIMEOUT
+            ),
+            # Hub is only known to work with http 1.0
+            version=aiohttp.HttpVersion10,
+            trace_configs=[trace_config],
+        )
+
+    async def _on_connection_create(self, session, context, params) -> None:
+        self.connections_created += 1
+
+    async def _on_connection_reuse(self, session, context, params) -> None:
+        self.connections_reused += 1
+
+    async def _async_do_hub_action(
+        self,
+        action,
+        url: str,
+        data: dict = None,
+        raise_for_endpoint_error: bool = True,
+    ):
+        """Send request to hub using pooled session."""
+        connection_info = self._rest_controller._wiser_connection_info
+        url = url.format(connection_info.host, connection_info.port)
+
+        kwargs = {}
+        kwargs["headers"] = {
+            "SECRET": connection_info.secret,
+            "Content-Type": "application/json;charset=UTF-8",
+            # Hub will keep an http 1.0 connection alive if asked
+            "Connection": "keep-alive",
+        }
+        if data is not None:
+            kwargs["json"] = data
+
+        # Fail fast without waiting in the queue if hub is not responding
+        self.breaker.before_request()
+        try:
+            async with self.command_queue.async_slot():
+                result = await self._async_send(
+                    action, url, data, raise_for_endpoint_error, **kwargs
+                )
+        except WiserHubConnectionError:
+            self.breaker.record_failure()
+            raise
+        except WiserHubRESTError:
+            # Hub responded so connection is working
+            self.breaker.record_success()
+            raise
+        except asyncio.CancelledError:
+            self.breaker.abort_probe()
+            raise
+        except Exception:
+            # Any other error, such as an authentication or decode error,
+            # must still end a probe or the circuit stays half open
+            self.breaker.abort_probe()
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def _async_send(
+        self, action, url: str, data: dict, raise_for_endpoint_error: bool, **kwargs
+    ):
+        """Send request, retrying reads on a closed kept alive connection."""
+        connection_info = self._rest_controller._wiser_connection_info
+        self.requests += 1
+        try:
+            try:
+                return await self._async_request(
+                    action, url, data, raise_for_endpoint_error, **kwargs
+                )
+            except aiohttp.ServerDisconnectedError:
+                # Hub closed a kept alive connection.  Reads are safe to retry
+                if action.value != "get":
+                    raise
+                self.disconnect_retries += 1
+                return await self._async_request(
+                    action, url, data, raise_for_endpoint_error, **kwargs
+                )
+        except asyncio.TimeoutError as ex:
+            self.failed_requests += 1
+            raise WiserHubConnectionError(
+                f"Connection timeout trying to communicate with Wiser Hub "
+                f"{connection_info.host} for url {url}"
+            ) from ex
+        except (ConnectionResetError, aiohttp.ClientError) as ex:
+            self.failed_requests += 1
+            raise WiserHubConnectionError(
+                f"Connection error trying to communicate with Wiser Hub "
+                f"{connection_info.host} for url {url}.  Error is {ex}"
+            ) from ex
+
+    async def _async_request(
+        self, action, url: str, data: dict, raise_for_endpoint_error: bool, **kwargs
+    ):
+        start = time.monotonic()
+        async with getattr(self.session, action.value)(url, **kwargs) as response:
+            if not response.ok:
+                self._rest_controller._process_nok_response(
+                    response, url, data, raise_for_endpoint_error
+                )
+                return {}
+
+            content = await response.read()
+            http_time = time.monotonic() - start
+            if len(content) == 0:
+                self._add_metrics(action, url, http_time, 0, 0)
+                return {}
+            start = time.monotonic()
+            try:
+                result = json.loads(
+                    self._rest_controller.remove_control_characters(
+                        content.decode("utf-8", "ignore")
+                    )
+                )
+            except json.decoder.JSONDecodeError as ex:
+                raise WiserHubRESTError(
+                    f"JSON decoding error from {url}. Error is - {ex}. "
+                    f"Data is - {content}"
+                ) from ex
+            self._add_metrics(
+                action, url, http_time, time.monotonic() - start, len(content)
+            )
+            return result
+
+    def _add_metrics(
+        self, action, url: str, http_time: float, decode_time: float, size: int
+    ) -> None:
+        """Add request timings to metrics by endpoint path or as a command."""
+        self.metrics.add_request(
+            urlparse(url).path if action.value == "get" else "commands",
+            http_time,
+            decode_time,
+            size,
+            hub_request_priority.get() == PRIORITY_POLL,
+        )
+
+    @property
+    def stats(self) -> dict:
+        """Return connection statistics."""
+        connections = self.connections_created + self.connections_reused
+        return {
+            "requests": self.requests,
+            "failed_requests": self.failed_requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "connection_reuse_rate": round(
+                self.connections_reused / connections * 100, 1
+            )
+            if connections
+            else 0,
+            "disconnect_retries": self.disconnect_retries,
+            "connection_limit": HUB_CONNECTION_LIMIT,
+        }
+
+    async def async_close(self) -> None:
+        """Release session.  Connections are closed by Home Assistant."""
+        self.session.detach()
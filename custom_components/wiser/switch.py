@@ -6,6 +6,7 @@ Angelosantagata@gmail.com
 """
 import asyncio
 import logging
+import time
 import voluptuous as vol
 
 from homeassistant.components.switch import SwitchEntity
@@ -14,13 +15,20 @@ from homeassistant.helpers import config_validation as cv
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DATA, DOMAIN, MANUFACTURER
+from .const import (
+    CONF_AWAY_ACTION_SWITCHES,
+    CONF_DEVICE_SWITCHES,
+    DATA,
+    DOMAIN,
+    MANUFACTURER,
+)
 from .helpers import (
     get_device_name,
     get_identifier,
     get_room_name,
     get_unique_id,
     hub_error_handler,
+    WiserCachedAttributesEntity,
 )
 from custom_components.wiser.schedules import WiserScheduleEntity
 
@@ -115,6 +123,8 @@ WISER_SWITCHES = [
 async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entities):
     """Add the Wiser System Switch entities."""
     data = hass.data[DOMAIN][config_entry.entry_id][DATA]  # Get Handler
+    setup_start = time.monotonic()
+    enable_away_action_switches = data.entity_options[CONF_AWAY_ACTION_SWITCHES]
 
     # Add Defined Switches
     wiser_switches = []
@@ -137,7 +147,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
                 WiserSystemSwitch(data, switch["name"], switch["key"], switch["icon"])
             )
 
-        elif switch["type"] == "device":
+        elif switch["type"] == "device" and data.entity_options[CONF_DEVICE_SWITCHES]:
             for device in [
                 device
                 for device in data.wiserhub.devices.all
@@ -150,16 +160,22 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
                 )
 
     # Add Lights (if any)
-    for light in data.wiserhub.devices.lights.all:
-        wiser_switches.extend(
-            [WiserLightAwayActionSwitch(data, light.id, f"Wiser {light.name}")]
-        )
+    if enable_away_action_switches:
+        for light in data.wiserhub.devices.lights.all:
+            wiser_switches.extend(
+                [WiserLightAwayActionSwitch(data, light.id, f"Wiser {light.name}")]
+            )
 
     # Add Shutters (if any)
     for shutter in data.wiserhub.devices.shutters.all:
-        wiser_switches.extend(
-            [WiserShutterAwayActionSwitch(data, shutter.id, f"Wiser {shutter.name}")]
-        )
+        if enable_away_action_switches:
+            wiser_switches.extend(
+                [
+                    WiserShutterAwayActionSwitch(
+                        data, shutter.id, f"Wiser {shutter.name}"
+                    )
+                ]
+            )
         if data.hub_version == 2:
             wiser_switches.append(
                 WiserShutterSummerComfortSwitch(
@@ -169,12 +185,11 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
 
     # Add SmartPlugs (if any)
     for plug in data.wiserhub.devices.smartplugs.all:
-        wiser_switches.extend(
-            [
-                WiserSmartPlugSwitch(data, plug.id, f"Wiser {plug.name}"),
-                WiserSmartPlugAwayActionSwitch(data, plug.id, f"Wiser {plug.name}"),
-            ]
-        )
+        wiser_switches.append(WiserSmartPlugSwitch(data, plug.id, f"Wiser {plug.name}"))
+        if enable_away_action_switches:
+            wiser_switches.append(
+                WiserSmartPlugAwayActionSwitch(data, plug.id, f"Wiser {plug.name}")
+            )
 
     # Add Room passive mode switches
     if data.enable_automations_passive_mode:
@@ -187,6 +202,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
                 )
 
     async_add_entities(wiser_switches)
+    data.async_record_entity_setup("switch", len(wiser_switches), setup_start)
 
     return True
 
@@ -194,9 +210,9 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
 class WiserSwitch(CoordinatorEntity, SwitchEntity):
     """Switch to set the status of the Wiser Operation Mode (Away/Normal)."""
 
-    def __init__(self, coordinator, name, key, device_type, icon) -> None:
+    def __init__(self, coordinator, name, key, device_type, icon, context=None) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context)
         self._data = coordinator
         self._key = key
         self._icon = icon
@@ -210,7 +226,7 @@ class WiserSwitch(CoordinatorEntity, SwitchEntity):
         _LOGGER.debug(f"Hub update initiated by {self.name}")
         if delay:
             await asyncio.sleep(delay)
-        await self._data.async_refresh()
+        await self._data.async_request_hub_refresh()
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -234,7 +250,25 @@ class WiserSwitch(CoordinatorEntity, SwitchEntity):
     @property
     def is_on(self):
         """Return true if device is on."""
-        return self._is_on
+        return self._data.optimistic.get(
+            self.coordinator_context, self.unique_id, self._key or "is_on", self._is_on
+        )
+
+    def _get_hub_is_on(self) -> bool | None:
+        """Return switch state from latest hub data."""
+        return None
+
+    @callback
+    def _async_set_optimistic_state(self, is_on: bool) -> None:
+        """Show expected switch state until read from the hub."""
+        self._data.optimistic.async_set(
+            self.coordinator_context,
+            self.unique_id,
+            self._key or "is_on",
+            is_on,
+            self._get_hub_is_on,
+        )
+        self.async_write_ha_state()
 
     @hub_error_handler
     async def async_turn_on(self, **kwargs):
@@ -267,12 +301,17 @@ class WiserSystemSwitch(WiserSwitch):
             )
         self.async_write_ha_state()
 
+    def _get_hub_is_on(self) -> bool | None:
+        """Return switch state from latest hub data."""
+        return getattr(self._data.wiserhub.system, self._key)
+
     @hub_error_handler
     async def async_turn_on(self, **kwargs):
         """Turn the device on."""
 
         fn = getattr(self._data.wiserhub.system, "set_" + self._key)
         await fn(True)
+        self._async_set_optimistic_state(True)
         await self.async_force_update()
         return True
 
@@ -281,6 +320,7 @@ class WiserSystemSwitch(WiserSwitch):
         """Turn the device off."""
         fn = getattr(self._data.wiserhub.system, "set_" + self._key)
         await fn(False)
+        self._async_set_optimistic_state(False)
         await self.async_force_update()
         return True
 
@@ -313,15 +353,15 @@ class WiserRoomSwitch(WiserSwitch):
     def __init__(self, data, name, key, icon, room_id) -> None:
         """Initialize the sensor."""
         self._room_id = room_id
-        super().__init__(data, name, key, "room", icon)
-        self._room = self._data.wiserhub.rooms.get_by_id(self._room_id)
+        super().__init__(data, name, key, "room", icon, ("room", room_id))
+        self._room = self._data.index.get_room(self._room_id)
         self._is_on = getattr(self._room, self._key)
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Async Update to HA."""
         super()._handle_coordinator_update()
-        self._room = self._data.wiserhub.rooms.get_by_id(self._room_id)
+        self._room = self._data.index.get_room(self._room_id)
         self._is_on = getattr(self._room, self._key)
         self.async_write_ha_state()
 
@@ -330,11 +370,16 @@ class WiserRoomSwitch(WiserSwitch):
         """Return the name of the Device."""
         return f"{get_room_name(self._data, self._room_id)} {self._name}"
 
+    def _get_hub_is_on(self) -> bool | None:
+        """Return switch state from latest hub data."""
+        return getattr(self._data.index.get_room(self._room_id), self._key)
+
     @hub_error_handler
     async def async_turn_on(self, **kwargs):
         """Turn the device on."""
         fn = getattr(self._room, "set_" + self._key)
         await fn(True)
+        self._async_set_optimistic_state(True)
         await self.async_force_update()
         return True
 
@@ -343,6 +388,7 @@ class WiserRoomSwitch(WiserSwitch):
         """Turn the device off."""
         fn = getattr(self._room, "set_" + self._key)
         await fn(False)
+        self._async_set_optimistic_state(False)
         await self.async_force_update()
         return True
 
@@ -372,15 +418,15 @@ class WiserDeviceSwitch(WiserSwitch):
     def __init__(self, data, name, key, icon, device_id) -> None:
         """Initialize the sensor."""
         self._device_id = device_id
-        super().__init__(data, name, key, "device-switch", icon)
-        self._device = self._data.wiserhub.devices.get_by_id(self._device_id)
+        super().__init__(data, name, key, "device-switch", icon, ("device", device_id))
+        self._device = self._data.index.get_device(self._device_id)
         self._is_on = getattr(self._device, self._key)
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Async Update to HA."""
         super()._handle_coordinator_update()
-        self._device = self._data.wiserhub.devices.get_by_id(self._device_id)
+        self._device = self._data.index.get_device(self._device_id)
         self._is_on = getattr(self._device, self._key)
         self.async_write_ha_state()
 
@@ -389,11 +435,16 @@ class WiserDeviceSwitch(WiserSwitch):
         """Return the name of the Device."""
         return f"{get_device_name(self._data, self._device_id)} {self._name}"
 
+    def _get_hub_is_on(self) -> bool | None:
+        """Return switch state from latest hub data."""
+        return getattr(self._data.index.get_device(self._device_id), self._key)
+
     @hub_error_handler
     async def async_turn_on(self, **kwargs):
         """Turn the device on."""
         fn = getattr(self._device, "set_" + self._key)
         await fn(True)
+        self._async_set_optimistic_state(True)
         await self.async_force_update()
         return True
 
@@ -402,6 +453,7 @@ class WiserDeviceSwitch(WiserSwitch):
         """Turn the device off."""
         fn = getattr(self._device, "set_" + self._key)
         await fn(False)
+        self._async_set_optimistic_state(False)
         await self.async_force_update()
         return True
 
@@ -431,15 +483,19 @@ class WiserDeviceSwitch(WiserSwitch):
         return attrs
 
 
-class WiserSmartPlugSwitch(WiserSwitch, WiserScheduleEntity):
+class WiserSmartPlugSwitch(
+    WiserSwitch, WiserScheduleEntity, WiserCachedAttributesEntity
+):
     """Plug SwitchEntity Class."""
 
     def __init__(self, data, plugId, name) -> None:
         """Initialize the sensor."""
         self._name = name
         self._device_id = plugId
-        super().__init__(data, name, "", "smartplug", "mdi:power-socket-uk")
-        self._device = self._data.wiserhub.devices.get_by_id(self._device_id)
+        super().__init__(
+            data, name, "", "smartplug", "mdi:power-socket-uk", ("device", plugId)
+        )
+        self._device = self._data.index.get_device(self._device_id)
         self._schedule = self._device.schedule
         self._is_on = self._device.is_on
 
@@ -447,7 +503,7 @@ class WiserSmartPlugSwitch(WiserSwitch, WiserScheduleEntity):
     def _handle_coordinator_update(self) -> None:
         """Async Update to HA."""
         super()._handle_coordinator_update()
-        self._device = self._data.wiserhub.devices.get_by_id(self._device_id)
+        self._device = self._data.index.get_device(self._device_id)
         self._schedule = self._device.schedule
         self._is_on = self._device.is_on
         self.async_write_ha_state()
@@ -457,6 +513,10 @@ class WiserSmartPlugSwitch(WiserSwitch, WiserScheduleEntity):
         """Return the name of the Device."""
         return f"{get_device_name(self._data, self._device_id)} Switch"
 
+    def _get_hub_is_on(self) -> bool | None:
+        """Return switch state from latest hub data."""
+        return self._data.index.get_device(self._device_id).is_on
+
     @property
     def unique_id(self):
         """Return unique Id."""
@@ -476,6 +536,10 @@ class WiserSmartPlugSwitch(WiserSwitch, WiserScheduleEntity):
             "via_device": (DOMAIN, self._data.wiserhub.system.name),
         }
 
+    def _build_identification_attributes(self) -> dict:
+        """Return smart plug name attributes."""
+        return {"name": self._device.name}
+
     @property
     def extra_state_attributes(self):
         """Return set of device state attributes."""
@@ -483,13 +547,17 @@ class WiserSmartPlugSwitch(WiserSwitch, WiserScheduleEntity):
         attrs["control_source"] = self._device.control_source
         attrs["manual_state"] = self._device.manual_state
         attrs["mode"] = self._device.mode
-        attrs["name"] = self._device.name
         attrs["output_state"] = "On" if self._device.is_on else "Off"
+        attrs.update(
+            self._get_cached_attributes(
+                "identification",
+                self._build_identification_attributes,
+                (self.coordinator_context,),
+            )
+        )
         # Switches could be not allocated to room (issue:209)
-        if self._data.wiserhub.rooms.get_by_id(self._device.room_id) is not None:
-            attrs["room"] = self._data.wiserhub.rooms.get_by_id(
-                self._device.room_id
-            ).name
+        if self._data.index.get_room(self._device.room_id) is not None:
+            attrs["room"] = self._data.index.get_room(self._device.room_id).name
         else:
             attrs["room"] = "Unassigned"
         attrs["away_mode_action"] = self._device.away_mode_action
@@ -507,14 +575,20 @@ class WiserSmartPlugSwitch(WiserSwitch, WiserScheduleEntity):
     async def async_turn_on(self, **kwargs):
         """Turn the device on."""
         await self._device.turn_on()
-        await self.async_force_update(2)
+        self._async_set_optimistic_state(True)
+        self._data.async_track_convergence(
+            "smartplug", self._device_id, lambda plug: plug.is_on
+        )
         return True
 
     @hub_error_handler
     async def async_turn_off(self, **kwargs):
         """Turn the device off."""
         await self._device.turn_off()
-        await self.async_force_update(2)
+        self._async_set_optimistic_state(False)
+        self._data.async_track_convergence(
+            "smartplug", self._device_id, lambda plug: not plug.is_on
+        )
         return True
 
 
@@ -525,15 +599,17 @@ class WiserSmartPlugAwayActionSwitch(WiserSwitch):
         """Initialize the sensor."""
         self._name = name
         self._smart_plug_id = plugId
-        super().__init__(data, name, "", "smartplug", "mdi:power-socket-uk")
-        self._smartplug = self._data.wiserhub.devices.get_by_id(self._smart_plug_id)
+        super().__init__(
+            data, name, "", "smartplug", "mdi:power-socket-uk", ("device", plugId)
+        )
+        self._smartplug = self._data.index.get_device(self._smart_plug_id)
         self._is_on = True if self._smartplug.away_mode_action == "Off" else False
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Async Update to HA."""
         super()._handle_coordinator_update()
-        self._smartplug = self._data.wiserhub.devices.get_by_id(self._smart_plug_id)
+        self._smartplug = self._data.index.get_device(self._smart_plug_id)
         self._is_on = True if self._smartplug.away_mode_action == "Off" else False
         self.async_write_ha_state()
 
@@ -583,15 +659,22 @@ class WiserLightAwayActionSwitch(WiserSwitch):
         """Initialize the sensor."""
         self._name = name
         self._light_id = LightId
-        super().__init__(data, name, "", "light", "mdi:lightbulb-off-outline")
-        self._light = self._data.wiserhub.devices.get_by_id(self._light_id)
+        super().__init__(
+            data,
+            name,
+            "",
+            "light",
+            "mdi:lightbulb-off-outline",
+            ("device", LightId),
+        )
+        self._light = self._data.index.get_device(self._light_id)
         self._is_on = True if self._light.away_mode_action == "Off" else False
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Async Update to HA."""
         super()._handle_coordinator_update()
-        self._light = self._data.wiserhub.devices.get_by_id(self._light_id)
+        self._light = self._data.index.get_device(self._light_id)
         self._is_on = True if self._light.away_mode_action == "Off" else False
         self.async_write_ha_state()
 
@@ -641,15 +724,17 @@ class WiserShutterAwayActionSwitch(WiserSwitch):
         """Initialize the sensor."""
         self._name = name
         self._shutter_id = ShutterId
-        super().__init__(data, name, "", "shutter", "mdi:window-shutter")
-        self._shutter = self._data.wiserhub.devices.get_by_id(self._shutter_id)
+        super().__init__(
+            data, name, "", "shutter", "mdi:window-shutter", ("device", ShutterId)
+        )
+        self._shutter = self._data.index.get_device(self._shutter_id)
         self._is_on = True if self._shutter.away_mode_action == "Close" else False
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Async Update to HA."""
         super()._handle_coordinator_update()
-        self._shutter = self._data.wiserhub.devices.get_by_id(self._shutter_id)
+        self._shutter = self._data.index.get_device(self._shutter_id)
         self._is_on = True if self._shutter.away_mode_action == "Close" else False
         self.async_write_ha_state()
 
@@ -701,17 +786,13 @@ class WiserPassiveModeSwitch(WiserSwitch):
         self._room_id = room_id
         self._hass = hass
         super().__init__(data, name, "", "passive-mode", "mdi:thermostat-box")
-        self._is_on = self._data.wiserhub.rooms.get_by_id(
-            self._room_id
-        ).passive_mode_enabled
+        self._is_on = self._data.index.get_room(self._room_id).passive_mode_enabled
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Async Update to HA."""
         super()._handle_coordinator_update()
-        self._is_on = self._data.wiserhub.rooms.get_by_id(
-            self._room_id
-        ).passive_mode_enabled
+        self._is_on = self._data.index.get_room(self._room_id).passive_mode_enabled
         self.async_write_ha_state()
 
     @property
@@ -746,14 +827,14 @@ class WiserPassiveModeSwitch(WiserSwitch):
     @hub_error_handler
     async def async_turn_on(self, **kwargs):
         """Turn the device on."""
-        await self._data.wiserhub.rooms.get_by_id(self._room_id).set_passive_mode(True)
+        await self._data.index.get_room(self._room_id).set_passive_mode(True)
         await self.async_force_update()
         return True
 
     @hub_error_handler
     async def async_turn_off(self, **kwargs):
         """Turn the device off."""
-        room = self._data.wiserhub.rooms.get_by_id(self._room_id)
+        room = self._data.index.get_room(self._room_id)
         await room.set_passive_mode(False)
         await room.cancel_overrides()
         await self.async_force_update()
@@ -767,15 +848,15 @@ class WiserShutterSummerComfortSwitch(WiserSwitch):
         """Initialize the sensor."""
         self._name = name
         self._shutter_id = ShutterId
-        super().__init__(data, name, "", "shutter", "mdi:sofa")
-        self._shutter = self._data.wiserhub.devices.get_by_id(self._shutter_id)
+        super().__init__(data, name, "", "shutter", "mdi:sofa", ("device", ShutterId))
+        self._shutter = self._data.index.get_device(self._shutter_id)
         self._is_on = True if self._shutter.respect_summer_comfort == False else False
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Async Update to HA."""
         super()._handle_coordinator_update()
-        self._shutter = self._data.wiserhub.devices.get_by_id(self._shutter_id)
+        self._shutter = self._data.index.get_device(self._shutter_id)
         self._is_on = True if self._shutter.respect_summer_comfort == True else False
         self.async_write_ha_state()
 
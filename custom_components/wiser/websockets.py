@@ -8,7 +8,8 @@ from homeassistant.components.websocket_api import (
 )
 from aioWiserHeatAPI.schedule import WiserScheduleTypeEnum
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
-from .const import DATA, DOMAIN
+from .const import DEFAULT_HISTORY_POINTS, DOMAIN, HISTORY_MAX_POINTS
+from .helpers import get_entity_resolver, get_hub_registry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -50,30 +51,12 @@ async def handle_subscribe_updates(hass, connection, msg):
 
 
 async def async_register_websockets(hass, data):
-    def get_hub_name(config_entry_id):
-        try:
-            api = hass.data[DOMAIN][config_entry_id][DATA]
-            return api.wiserhub.system.name
-        except:
-            return None
-
     def get_api_for_hub(hub: str):
-        if hub:
-            for entry_id in hass.data[DOMAIN]:
-                if hass.data[DOMAIN][entry_id][DATA].wiserhub.system.name == hub:
-                    return hass.data[DOMAIN][entry_id][DATA]
-            return None
-        else:
-            for entry_id in hass.data[DOMAIN]:
-                return hass.data[DOMAIN][entry_id][DATA]
+        return get_hub_registry(hass).get(hub)
 
     def get_entity_from_entity_id(entity: str):
         """Get wiser entity from entity_id"""
-        domain = entity.split(".", 1)[0]
-        entity_comp = hass.data.get("entity_components", {}).get(domain)
-        if entity_comp:
-            return entity_comp.get_entity(entity)
-        return None
+        return get_entity_resolver(hass).get_entity(entity)
 
     # Get Hubs
     @websocket_api.websocket_command(
@@ -84,9 +67,7 @@ async def async_register_websockets(hass, data):
     @websocket_api.async_response
     async def websocket_get_hubs(hass, connection: ActiveConnection, msg: dict) -> None:
         """Publish schedules list data."""
-        output = []
-        for entry in hass.data[DOMAIN]:
-            output.append(get_hub_name(entry))
+        output = get_hub_registry(hass).hub_names
 
         # output = output.sort()
         connection.send_result(msg["id"], output)
@@ -300,7 +281,7 @@ async def async_register_websockets(hass, data):
                     await schedule.assign_schedule(int(msg["entity_id"]))
                 else:
                     await schedule.unassign_schedule(int(msg["entity_id"]))
-                await d.async_refresh()
+                await d.async_request_hub_refresh()
             connection.send_result(msg["id"], "success")
         else:
             connection.send_error(msg["id"], "wiser error", "hub not recognised")
@@ -325,7 +306,7 @@ async def async_register_websockets(hass, data):
         if d:
             schedule_type_enum = WiserScheduleTypeEnum[schedule_type]
             await d.wiserhub.schedules.create_schedule(schedule_type_enum, name)
-            await d.async_refresh()
+            await d.async_request_hub_refresh()
             connection.send_result(msg["id"], "success")
         else:
             connection.send_error(msg["id"], "wiser error", "hub not recognised")
@@ -353,7 +334,7 @@ async def async_register_websockets(hass, data):
             schedule = d.wiserhub.schedules.get_by_id(schedule_type_enum, schedule_id)
             if schedule:
                 await schedule.set_name(name)
-                await d.async_refresh()
+                await d.async_request_hub_refresh()
                 connection.send_result(msg["id"], "success")
             else:
                 connection.send_error(
@@ -386,7 +367,7 @@ async def async_register_websockets(hass, data):
             schedule = d.wiserhub.schedules.get_by_id(schedule_type_enum, schedule_id)
             if schedule:
                 await schedule.delete_schedule()
-                await d.async_refresh()
+                await d.async_request_hub_refresh()
                 connection.send_result(msg["id"], "success")
             else:
                 connection.send_error(
@@ -421,7 +402,7 @@ async def async_register_websockets(hass, data):
             schedule = d.wiserhub.schedules.get_by_id(schedule_type_enum, schedule_id)
             if schedule:
                 await schedule.set_schedule_from_ws_data(new_schedule)
-                await d.async_refresh()
+                await d.async_request_hub_refresh()
                 connection.send_result(msg["id"], "success")
             else:
                 connection.send_error(
@@ -455,7 +436,7 @@ async def async_register_websockets(hass, data):
             schedule = d.wiserhub.schedules.get_by_id(schedule_type_enum, schedule_id)
             if schedule:
                 await schedule.copy_schedule(to_schedule_id)
-                await d.async_refresh()
+                await d.async_request_hub_refresh()
                 connection.send_result(msg["id"], "success")
             else:
                 connection.send_error(
@@ -493,7 +474,7 @@ async def async_register_websockets(hass, data):
             )
 
             for device in d.wiserhub.devices.all:
-                room = d.wiserhub.rooms.get_by_device_id(device.id)
+                room = d.index.get_room_by_device_id(device.id)
                 nodes.append(
                     {
                         "id": device.node_id,
@@ -522,6 +503,53 @@ async def async_register_websockets(hass, data):
         else:
             connection.send_error(msg["id"], "wiser error", "hub not recognised")
 
+    # Get room or device history
+    @websocket_api.websocket_command(
+        {
+            vol.Required("type"): "{}/history".format(DOMAIN),
+            vol.Optional("hub"): str,
+            vol.Exclusive("room_id", "history_id"): vol.Coerce(int),
+            vol.Exclusive("device_id", "history_id"): vol.Coerce(int),
+            vol.Optional("hours"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional("points", default=DEFAULT_HISTORY_POINTS): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=HISTORY_MAX_POINTS)
+            ),
+        }
+    )
+    @websocket_api.async_response
+    async def websocket_get_history(
+        hass, connection: ActiveConnection, msg: dict
+    ) -> None:
+        """Publish recent history of a room or device."""
+        d = get_api_for_hub(msg.get("hub"))
+        if d:
+            if "room_id" in msg:
+                series_type, series_id = "room", msg["room_id"]
+            elif "device_id" in msg:
+                series_type, series_id = "device", msg["device_id"]
+            else:
+                connection.send_error(
+                    msg["id"], "wiser error", "room_id or device_id is required"
+                )
+                return
+
+            history = d.history.get(
+                series_type,
+                series_id,
+                msg.get("hours", d.history.window),
+                msg["points"],
+            )
+            if history is not None:
+                connection.send_result(msg["id"], history)
+            else:
+                connection.send_error(
+                    msg["id"],
+                    "wiser error",
+                    f"No history for {series_type} with id {series_id}",
+                )
+        else:
+            connection.send_error(msg["id"], "wiser error", "hub not recognised")
+
     hass.components.websocket_api.async_register_command(websocket_get_hubs)
     hass.components.websocket_api.async_register_command(websocket_get_suntimes)
     hass.components.websocket_api.async_register_command(websocket_get_schedules)
@@ -536,5 +564,6 @@ async def async_register_websockets(hass, data):
     hass.components.websocket_api.async_register_command(websocket_save_schedule)
     hass.components.websocket_api.async_register_command(websocket_copy_schedule)
     hass.components.websocket_api.async_register_command(websocket_get_zigbee_data)
+    hass.components.websocket_api.async_register_command(websocket_get_history)
 
     async_register_command(hass, handle_subscribe_updates)
@@ -0,0 +1,91 @@
+"""Helpers for Wiser integration tests."""
+import asyncio
+from contextlib import asynccontextmanager
+import copy
+import os
+import shutil
+import tempfile
+from types import SimpleNamespace
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.wiser.coordinator import WiserUpdateCoordinator
+
+DOMAIN_DATA = {
+    "System": {"UnixTime": 1700000000, "OverrideType": ""},
+    "Room": [{"id": 1, "Name": "Den"}, {"id": 2, "Name": "Hall"}],
+    "Device": [{"id": 10, "Rssi": -60}, {"id": 11, "Rssi": -70}],
+    "SmartValve": [{"id": 10}, {"id": 11}],
+    "HeatingChannel": [{"id": 1, "RoomIds": [1], "PercentageDemand": 0}],
+}
+
+
+def run(coro):
+    """Run coroutine in a new event loop."""
+    return asyncio.run(coro)
+
+
+def make_entry(options: dict | None = None) -> ConfigEntry:
+    """Return a config entry for a test hub."""
+    return ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain="wiser",
+        title="WiserHeat01",
+        data={"host": "1.2.3.4", "password": "secret", "name": "WiserHeat01"},
+        source="user",
+        options=options or {},
+        unique_id="wiser-WiserHeat01",
+    )
+
+
+@asynccontextmanager
+async def async_coordinator(options: dict | None = None):
+    """Yield hass and a coordinator for a test hub and shut both down after."""
+    config_dir = tempfile.mkdtemp()
+    os.makedirs(os.path.join(config_dir, ".storage"))
+    hass = HomeAssistant(config_dir)
+    coordinator = WiserUpdateCoordinator(hass, make_entry(options))
+    try:
+        yield hass, coordinator
+    finally:
+        try:
+            await coordinator.async_shutdown()
+        finally:
+            await coordinator.hub_session.async_close()
+            await hass.async_stop(force=True)
+            shutil.rmtree(config_dir)
+
+
+def make_hub(domain_data: dict | None = None) -> SimpleNamespace:
+    """Return a stand in api with two rooms of one device each."""
+    domain_data = copy.deepcopy(domain_data or DOMAIN_DATA)
+    rooms = [
+        SimpleNamespace(
+            id=room["id"],
+            devices=[SimpleNamespace(id=room["id"] + 9)],
+            is_boosted=False,
+            passive_mode_enabled=False,
+            passive_mode_lower_temp=14,
+            passive_mode_upper_temp=18,
+        )
+        for room in domain_data["Room"]
+    ]
+    return SimpleNamespace(
+        raw_hub_data={"Domain": domain_data, "Schedule": {}},
+        rooms=SimpleNamespace(all=rooms),
+        system=SimpleNamespace(name="WiserHeat01"),
+    )
+
+
+NETWORK_DATA = {
+    "Station": {"NetworkInterface": {"HostName": "WiserHeat01", "MacAddress": "aa"}}
+}
+
+
+async def async_build_hub(coordinator, domain_data: dict) -> None:
+    """Build coordinator api objects from domain data without a hub."""
+    await coordinator._async_build_objects(
+        {"domain": domain_data, "network": NETWORK_DATA, "schedules": {}, "status": {}}
+    )
@@ -0,0 +1,51 @@
+"""Tests for reading devices after commands."""
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from custom_components.wiser import convergence
+from custom_components.wiser.command_queue import PRIORITY_POLL, hub_request_priority
+
+from .common import async_coordinator, run
+
+
+def _run_convergence(device) -> tuple[list, list]:
+    """Run convergence for device and return read priorities and hub refreshes."""
+
+    async def async_test():
+        async with async_coordinator() as (hass, coordinator):
+            priorities = []
+            refreshes = []
+
+            async def async_get_hub_data(url):
+                priorities.append(hub_request_priority.get())
+                return {"id": 20, "OutputState": "On"}
+
+            async def async_request_hub_refresh():
+                refreshes.append(True)
+
+            coordinator.wiserhub = SimpleNamespace(
+                _wiser_rest_controller=SimpleNamespace(_get_hub_data=async_get_hub_data)
+            )
+            coordinator.index.devices = {20: device}
+            coordinator.async_request_hub_refresh = async_request_hub_refresh
+            with patch.object(convergence, "CONVERGENCE_INITIAL_DELAY", 0):
+                coordinator.convergence.async_start("smartplug", 20, lambda plug: True)
+                await coordinator.convergence._tasks[20]
+            return priorities, refreshes
+
+    return run(async_test())
+
+
+def test_device_read_at_poll_priority():
+    device = SimpleNamespace(
+        _endpoint="/SmartPlug/{}", _device_type_data={"id": 20, "OutputState": "Off"}
+    )
+    priorities, refreshes = _run_convergence(device)
+    assert priorities == [PRIORITY_POLL]
+    assert refreshes == []
+
+
+def test_hub_read_if_device_internals_missing():
+    priorities, refreshes = _run_convergence(SimpleNamespace())
+    assert priorities == []
+    assert refreshes == [True]
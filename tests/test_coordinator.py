@@ -0,0 +1,86 @@
+"""Tests for the Wiser update coordinator."""
+import copy
+from datetime import datetime
+
+from .common import DOMAIN_DATA, async_coordinator, make_hub, run
+
+CONTEXTS = [None, ("room", 1), ("room", 2), ("device", 10), ("device", 11)]
+
+
+def _updated_contexts(domain_data: dict) -> set:
+    """Return contexts of listeners updated when hub data changes to domain_data."""
+
+    async def async_test():
+        async with async_coordinator() as (hass, coordinator):
+            updated = []
+            for context in CONTEXTS:
+                coordinator.async_add_listener(
+                    lambda context=context: updated.append(context), context
+                )
+            for data in [DOMAIN_DATA, domain_data]:
+                updated.clear()
+                coordinator.wiserhub = make_hub(data)
+                coordinator._update_changed_ids(True)
+                coordinator.async_update_listeners()
+            return set(updated)
+
+    return run(async_test())
+
+
+def test_unchanged_data_updates_only_hub_entities():
+    domain_data = copy.deepcopy(DOMAIN_DATA)
+    domain_data["System"]["UnixTime"] += 30
+    assert _updated_contexts(domain_data) == {None}
+
+
+def test_device_change_updates_device_and_room():
+    domain_data = copy.deepcopy(DOMAIN_DATA)
+    domain_data["Device"][1]["Rssi"] = -80
+    assert _updated_contexts(domain_data) == {None, ("room", 2), ("device", 11)}
+
+
+def test_system_change_updates_all_entities():
+    domain_data = copy.deepcopy(DOMAIN_DATA)
+    domain_data["System"]["OverrideType"] = "Away"
+    assert _updated_contexts(domain_data) == set(CONTEXTS)
+
+
+def test_heating_channel_change_updates_its_rooms():
+    domain_data = copy.deepcopy(DOMAIN_DATA)
+    domain_data["HeatingChannel"][0]["PercentageDemand"] = 50
+    assert _updated_contexts(domain_data) == {None, ("room", 1), ("device", 10)}
+
+
+def test_metrics_listeners_see_current_poll():
+    async def async_test():
+        async with async_coordinator() as (hass, coordinator):
+            payloads = []
+            coordinator.async_add_listener(
+                lambda: payloads.append(coordinator.metrics.payload.last)
+            )
+            for size in [100, 200]:
+                coordinator.metrics.start_poll()
+                coordinator.metrics.add_request("domain", 0.1, 0.01, size, True)
+                coordinator.metrics.end_read()
+                coordinator.async_update_listeners()
+            assert payloads == [100, 200]
+            assert coordinator.metrics.phases["fan_out"].last is not None
+
+    run(async_test())
+
+
+def test_device_update_does_not_change_poll_changed_ids():
+    async def async_test():
+        async with async_coordinator() as (hass, coordinator):
+            updated = []
+            for context in CONTEXTS:
+                coordinator.async_add_listener(
+                    lambda context=context: updated.append(context), context
+                )
+            # Poll in progress has reset changed ids to update all entities
+            coordinator.changed_ids = None
+            coordinator.async_update_device_listeners(("device", 10), datetime.now())
+            assert set(updated) == {None, ("device", 10)}
+            assert coordinator.changed_ids is None
+
+    run(async_test())
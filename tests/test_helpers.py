@@ -0,0 +1,99 @@
+"""Tests for entity helpers."""
+import copy
+from types import SimpleNamespace
+
+from custom_components.wiser.helpers import (
+    WiserCachedAttributesEntity,
+    WiserChangeSuppressedEntity,
+)
+
+from .common import DOMAIN_DATA, async_coordinator, make_hub, run
+
+
+class CountingEntity(WiserChangeSuppressedEntity):
+    """Entity that counts attribute builds and state writes."""
+
+    state = "on"
+    available = True
+    name = "Test"
+    icon = None
+
+    def __init__(self) -> None:
+        self.coordinator = SimpleNamespace(suppressed_writes={})
+        self.platform = SimpleNamespace(domain="sensor")
+        self.value = 1
+        self.builds = 0
+        self.written = []
+
+    def _get_extra_state_attributes(self):
+        self.builds += 1
+        return {"value": self.value}
+
+    def async_write_ha_state(self):
+        self.written.append(self.extra_state_attributes)
+
+
+def test_attributes_built_once_per_update():
+    async def async_test():
+        entity = CountingEntity()
+        entity.async_write_ha_state_if_changed()
+        entity.async_write_ha_state_if_changed()
+        entity.value = 2
+        entity.async_write_ha_state_if_changed()
+
+        assert entity.builds == 3
+        assert entity.written == [{"value": 1}, {"value": 2}]
+        assert entity.coordinator.suppressed_writes == {"sensor": 1}
+        # Attributes are built when read outside of a compared write
+        assert entity.extra_state_attributes == {"value": 2}
+
+    run(async_test())
+
+
+class CachedEntity(WiserCachedAttributesEntity):
+    """Entity that counts builds of a cached attribute group."""
+
+    def __init__(self, coordinator, context) -> None:
+        self.coordinator = coordinator
+        self.coordinator_context = context
+        self.builds = 0
+
+    def _build_attributes(self) -> dict:
+        self.builds += 1
+        return {}
+
+    def get_attributes(self) -> dict:
+        return self._get_cached_attributes(
+            "identification", self._build_attributes, (self.coordinator_context,)
+        )
+
+
+def test_attributes_rebuilt_only_when_own_record_changes():
+    async def async_test():
+        async with async_coordinator() as (hass, coordinator):
+            entity = CachedEntity(coordinator, ("device", 10))
+            domain_data = copy.deepcopy(DOMAIN_DATA)
+
+            def poll():
+                coordinator.wiserhub = make_hub(domain_data)
+                coordinator._update_changed_ids(True)
+                entity.get_attributes()
+
+            poll()
+            # Other device and system changes do not rebuild the group
+            domain_data["Device"][1]["Rssi"] = -80
+            poll()
+            domain_data["System"]["OverrideType"] = "Away"
+            poll()
+            assert entity.builds == 1
+            # Own record change rebuilds it
+            domain_data["Device"][0]["Rssi"] = -80
+            poll()
+            assert entity.builds == 2
+            assert coordinator.entity_stats["attribute_cache"] == {
+                "hits": 2,
+                "builds": 2,
+                "hit_rate": 50.0,
+            }
+
+    run(async_test())
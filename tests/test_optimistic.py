@@ -0,0 +1,122 @@
+"""Tests for expected values shown after commands."""
+import asyncio
+from types import SimpleNamespace
+
+from aioWiserHeatAPI.wiserhub import WiserHubConnectionError
+
+from custom_components.wiser.coalesce import WiserWriteCoalescer
+from custom_components.wiser.optimistic import WiserOptimisticState
+from custom_components.wiser.switch import (
+    WiserSmartPlugAwayActionSwitch,
+    WiserSmartPlugSwitch,
+)
+
+from .common import async_build_hub, async_coordinator, run
+
+SMART_PLUG_DOMAIN_DATA = {
+    "System": {"UnixTime": 1700000000, "HardwareGeneration": 2},
+    "Device": [
+        {"id": 0, "ProductType": "Controller", "NodeId": 0},
+        {"id": 20, "ProductType": "SmartPlug", "NodeId": 4},
+    ],
+    "SmartPlug": [
+        {
+            "id": 20,
+            "Name": "Kettle",
+            "OutputState": "Off",
+            "AwayAction": "NoChange",
+            "ManualState": "Off",
+            "Mode": "Manual",
+        }
+    ],
+    "Room": [],
+    "HeatingChannel": [],
+}
+
+
+def test_entities_of_same_device_do_not_share_expected_values():
+    async def async_test():
+        async with async_coordinator() as (hass, coordinator):
+            await async_build_hub(coordinator, SMART_PLUG_DOMAIN_DATA)
+            plug = WiserSmartPlugSwitch(coordinator, 20, "Kettle")
+            away_action = WiserSmartPlugAwayActionSwitch(coordinator, 20, "Kettle")
+            for entity in [plug, away_action]:
+                entity.hass = hass
+                entity.async_write_ha_state = lambda: None
+            assert plug.coordinator_context == away_action.coordinator_context
+            assert not plug.is_on and not away_action.is_on
+
+            plug._async_set_optimistic_state(True)
+            assert plug.is_on
+            assert not away_action.is_on
+
+            away_action._async_set_optimistic_state(True)
+            plug._async_set_optimistic_state(False)
+            assert away_action.is_on
+            assert not plug.is_on
+
+    run(async_test())
+
+
+def make_entity() -> SimpleNamespace:
+    """Return stand-in entity that counts its state writes."""
+    entity = SimpleNamespace(unique_id="room-1", writes=0)
+
+    def async_write_ha_state():
+        entity.writes += 1
+
+    entity.async_write_ha_state = async_write_ha_state
+    return entity
+
+
+def test_expected_value_cleared_when_write_fails():
+    async def async_test():
+        optimistic = WiserOptimisticState()
+        entity = make_entity()
+
+        async def async_write():
+            assert optimistic.get(None, "room-1", "temp", 18) == 21
+            raise WiserHubConnectionError("No response")
+
+        try:
+            await optimistic.async_write(
+                entity, None, "temp", 21, lambda: 18, async_write()
+            )
+        except WiserHubConnectionError:
+            pass
+        else:
+            raise AssertionError("Write error not raised")
+        assert optimistic.get(None, "room-1", "temp", 18) == 18
+        assert entity.writes == 2
+
+    run(async_test())
+
+
+def test_expected_value_kept_for_newer_write():
+    async def async_test():
+        optimistic = WiserOptimisticState()
+        writes = WiserWriteCoalescer(0.01)
+        entity = make_entity()
+        sent = []
+
+        async def async_write_value(value):
+            sent.append(value)
+
+        results = await asyncio.gather(
+            *[
+                optimistic.async_write(
+                    entity,
+                    None,
+                    "temp",
+                    value,
+                    lambda: 18,
+                    writes.async_write(("temp",), value, async_write_value),
+                )
+                for value in (20, 21)
+            ]
+        )
+        assert results == [False, True]
+        assert sent == [21]
+        assert optimistic.get(None, "room-1", "temp", 18) == 21
+
+    run(async_test())
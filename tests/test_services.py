@@ -0,0 +1,39 @@
+"""Tests for bulk service concurrency."""
+import asyncio
+
+from custom_components.wiser.const import CONF_SERVICE_CONCURRENCY
+
+from .common import async_coordinator, run
+
+
+def test_service_limit_changed_after_commands_end():
+    """Test changed service limit waits for commands using the old limit."""
+
+    async def async_test():
+        async with async_coordinator({CONF_SERVICE_CONCURRENCY: 1}) as (
+            hass,
+            coordinator,
+        ):
+            semaphore = coordinator.service_semaphore
+            release = asyncio.Event()
+            running = []
+
+            async def async_command(name):
+                async with coordinator.async_service_slot():
+                    running.append(name)
+                    await release.wait()
+
+            tasks = [asyncio.create_task(async_command(name)) for name in ("a", "b")]
+            await asyncio.sleep(0)
+            coordinator._set_options({CONF_SERVICE_CONCURRENCY: 2})
+            await asyncio.sleep(0)
+            assert coordinator.service_semaphore is semaphore
+            assert running == ["a"]
+
+            release.set()
+            await asyncio.gather(*tasks)
+            assert running == ["a", "b"]
+            assert coordinator.service_semaphore is not semaphore
+            assert coordinator.service_semaphore_limit == 2
+
+    run(async_test())
@@ -0,0 +1,35 @@
+"""Tests for the hub session."""
+from aioWiserHeatAPI.wiserhub import WiserHubAuthenticationError
+
+from custom_components.wiser.breaker import CIRCUIT_HALF_OPEN, CIRCUIT_OPEN
+
+from .common import async_coordinator, run
+
+
+def test_auth_error_during_probe_allows_another_probe():
+    async def async_test():
+        async with async_coordinator() as (hass, coordinator):
+            session = coordinator.hub_session
+            breaker = coordinator.breaker
+            for _ in range(breaker.failure_threshold):
+                breaker.record_failure()
+            breaker._retry_at = 0
+
+            async def async_send(*args, **kwargs):
+                assert breaker.state == CIRCUIT_HALF_OPEN
+                raise WiserHubAuthenticationError("Authentication error")
+
+            session._async_send = async_send
+            try:
+                await session._async_do_hub_action(None, "http://{}:{}/data/v2/domain/")
+            except WiserHubAuthenticationError:
+                pass
+            else:
+                raise AssertionError("Authentication error not raised")
+            assert breaker.state == CIRCUIT_OPEN
+
+            # Next request is allowed through as a new probe
+            breaker.before_request()
+            assert breaker.state == CIRCUIT_HALF_OPEN
+
+    run(async_test())
@@ -0,0 +1,50 @@
+"""Tests for starting from stored hub data."""
+from datetime import datetime, timedelta
+
+from aioWiserHeatAPI.wiserhub import WiserHubConnectionError
+
+from custom_components.wiser.const import HUB_DATA_STORE_MAX_AGE
+
+from .common import NETWORK_DATA, async_coordinator, run
+from .test_optimistic import SMART_PLUG_DOMAIN_DATA
+
+
+async def async_load(hass, coordinator, age: float) -> bool:
+    """Load stored data of age seconds while the hub is offline."""
+
+    async def async_read_sections(force=False):
+        raise WiserHubConnectionError("Hub offline")
+
+    coordinator.sections.async_read_sections = async_read_sections
+    await coordinator._store.async_save(
+        {
+            "last_update_time": (datetime.now() - timedelta(seconds=age)).isoformat(),
+            "sections": {
+                "domain": SMART_PLUG_DOMAIN_DATA,
+                "network": NETWORK_DATA,
+                "schedules": {},
+                "status": {},
+            },
+        }
+    )
+    loaded = await coordinator.async_load_stored_hub_data()
+    await hass.async_block_till_done()
+    return loaded
+
+
+def test_old_stored_data_not_used():
+    async def async_test():
+        async with async_coordinator() as (hass, coordinator):
+            assert not await async_load(hass, coordinator, HUB_DATA_STORE_MAX_AGE + 60)
+
+    run(async_test())
+
+
+def test_entities_unavailable_if_stored_data_not_updated():
+    async def async_test():
+        async with async_coordinator() as (hass, coordinator):
+            assert await async_load(hass, coordinator, 60)
+            assert coordinator.stale
+            assert not coordinator.last_update_success
+
+    run(async_test())